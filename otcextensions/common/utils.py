@@ -66,35 +66,88 @@ def _calculate_data_hashes(data):
     return _md5.hexdigest()
 
 
-def _get_file_hashes(filename):
+def _calculate_multipart_etag(part_digests):
+    """ETag of a multipart object from the binary MD5 digests of its parts"""
+    _md5 = hashlib.md5(b''.join(part_digests), usedforsecurity=False)
+    return '%s-%d' % (_md5.hexdigest(), len(part_digests))
+
+
+def _get_file_hashes(filename, segment_size=None):
+    """Return the MD5 of the file as OBS reports it in the ETag
+
+    When segment_size is given and the file is split into more than one
+    segment, the multipart format (MD5 of the part MD5s and part count)
+    is returned. Both are computed in a single read.
+    """
     _md5 = None
     with open(filename, 'rb') as file_obj:
-        _md5 = _calculate_data_hashes(file_obj)
+        if not segment_size:
+            return _calculate_data_hashes(file_obj)
+        part_digests = []
+        while True:
+            _md5 = hashlib.md5(usedforsecurity=False)
+            remaining = segment_size
+            while remaining:
+                chunk = file_obj.read(min(1048576, remaining))
+                if not chunk:
+                    break
+                _md5.update(chunk)
+                remaining -= len(chunk)
+            if remaining == segment_size and part_digests:
+                break
+            part_digests.append(_md5.digest())
+            if remaining:
+                break
 
-    return _md5
+    if len(part_digests) == 1:
+        return _md5.hexdigest()
+    return _calculate_multipart_etag(part_digests)
 
 
 class FileSegment:
-    """File-like object to pass to requests."""
+    """File-like object to pass to requests.
+
+    The data is hashed while it is read for the first time, so the MD5 of
+    the segment is known after an upload without reading the file again.
+    The file is opened on first use and opened again when the segment is
+    used after close, so segments waiting for their upload hold no file
+    descriptor.
+    """
 
     def __init__(self, filename, offset, length):
         self.filename = filename
         self.offset = offset
         self.length = length
         self.pos = 0
-        self._file = open(filename, 'rb')
-        self.seek(0)
+        self._md5 = hashlib.md5(usedforsecurity=False)
+        self._hashed = 0
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.filename, 'rb')
+            self._file.seek(self.offset + self.pos)
+        return self._file
+
+    @property
+    def md5(self):
+        """Hex MD5 of the segment, None until it has been read completely"""
+        if self._hashed < self.length:
+            return None
+        return self._md5.hexdigest()
 
     def tell(self):
-        return self._file.tell() - self.offset
+        return self._open().tell() - self.offset
 
     def seek(self, offset, whence=0):
+        f = self._open()
         if whence == 0:
-            self._file.seek(self.offset + offset, whence)
+            f.seek(self.offset + offset, whence)
         elif whence == 1:
-            self._file.seek(offset, whence)
+            f.seek(offset, whence)
         elif whence == 2:
-            self._file.seek(self.offset + self.length - offset, 0)
+            f.seek(self.offset + self.length - offset, 0)
+        self.pos = self.tell()
 
     def read(self, size=-1):
         remaining = self.length - self.pos
@@ -102,13 +155,21 @@ class FileSegment:
             return b''
 
         to_read = remaining if size < 0 else min(size, remaining)
-        chunk = self._file.read(to_read)
+        chunk = self._open().read(to_read)
+        if self.pos == self._hashed:
+            self._md5.update(chunk)
+            self._hashed += len(chunk)
         self.pos += len(chunk)
 
         return chunk
 
     def reset(self):
-        self._file.seek(self.offset, 0)
+        self.seek(0)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
 
 def _get_file_segments(endpoint, filename, file_size, segment_size):
@@ -125,6 +186,74 @@ def _get_file_segments(endpoint, filename, file_size, segment_size):
     return segments
 
 
+class StreamReader:
+    """Fill fixed size buffers from a readable stream or bytes iterable."""
+
+    def __init__(self, source):
+        self._source = source
+        self._chunks = None
+        self._pending = b''
+        if not hasattr(source, 'read'):
+            self._chunks = iter(source)
+
+    def _next_chunk(self, size):
+        if self._pending:
+            chunk, self._pending = self._pending, b''
+            return chunk
+        if self._chunks is None:
+            return self._source.read(size)
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b''
+
+    def readinto(self, buffer):
+        """Fill buffer completely unless the source is exhausted
+
+        :returns: Number of bytes placed into the buffer.
+        """
+        view = memoryview(buffer)
+        filled = 0
+        while filled < len(view):
+            if hasattr(self._source, 'readinto'):
+                read = self._source.readinto(view[filled:])
+                if not read:
+                    break
+                filled += read
+                continue
+            chunk = self._next_chunk(len(view) - filled)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            taken = min(len(chunk), len(view) - filled)
+            view[filled:filled + taken] = chunk[:taken]
+            self._pending = chunk[taken:]
+            filled += taken
+        return filled
+
+
+def _get_file_ranges(file_size, segment_size):
+    """Split file_size bytes into (offset, length) ranges of segment_size"""
+    return [
+        (offset, min(segment_size, file_size - offset))
+        for offset in range(0, file_size, segment_size)
+    ]
+
+
+def _write_at(fd, data, offset):
+    """Write all of data into fd at offset without moving the file position
+
+    Concurrent writers may share the same fd as long as their ranges do not
+    overlap.
+    """
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
 def extract_region_from_url(url):
     parsed_url = urlsplit(url)
     hostname = parsed_url.hostname
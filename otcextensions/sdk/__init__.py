@@ -11,9 +11,11 @@
 # under the License.
 import importlib
 import os
+import threading
 
 import openstack
 from openstack import _log
+from openstack import service_description
 from openstack import utils
 
 from otcextensions.common import exc
@@ -30,6 +32,8 @@ __all__ = [
     'register_otc_extensions',
 ]
 
+_LAZY_LOCK = threading.RLock()
+
 _DOC_TEMPLATE = (
     ":class:`{class_name}` for {service_type} aka project")
 _PROXY_TEMPLATE = """Proxy for {service_type} aka project
@@ -245,6 +249,14 @@ OTC_SERVICES = {
 }
 
 
+def _get_descriptor_args(service):
+    service_type = service['service_type']
+    return {
+        'service_type': service.get('endpoint_service_type', service_type),
+        'aliases': [service_type]
+    }
+
+
 def _get_descriptor(service_name):
     """Find ServiceDescriptor class by the service name
     and instanciate it
@@ -255,10 +267,7 @@ def _get_descriptor(service_name):
 
         desc_class = _find_service_description_class(service_type)
         # _logger.debug('descriptor class %s' % desc_class)
-        descriptor_args = {
-            'service_type': service.get('endpoint_service_type', service_type),
-            'aliases': [service.get('service_type', service_type)]
-        }
+        descriptor_args = _get_descriptor_args(service)
 
         if not desc_class.supported_versions:
             doc = _DOC_TEMPLATE.format(
@@ -352,6 +361,10 @@ def extend_instance(obj, cls):
 
 
 def patch_openstack_resources():
+    openstack.proxy.Proxy._metric_name = proxy.Proxy._metric_name
+    openstack.proxy.Proxy._report_stats = proxy.Proxy._report_stats
+    openstack.proxy.Proxy._report_stats_instrumentation = \
+        proxy.Proxy._report_stats_instrumentation
     openstack.proxy.Proxy._report_stats_statsd = \
         proxy.Proxy._report_stats_statsd
     openstack.proxy.Proxy._report_stats_influxdb = \
@@ -415,19 +428,63 @@ def register_single_service(conn, service_name, project_id=None, service=None):
     setattr(conn, 'get_ak_sk', get_ak_sk)
 
 
-def load(conn, **kwargs):
+class _LazyServices:
+    """Mixin holding the lazily registered services of a connection"""
+
+
+def register_lazy_service(conn, service_name, service=None):
+    """Register single service to be loaded on the first access
+
+    The service module is imported and the endpoint resolved only when
+    the proxy attribute is accessed for the first time.
+    """
+    if not service:
+        service = OTC_SERVICES[service_name]
+    # a plain description knows the attribute names of the real one without
+    # importing the service
+    all_types = service_description.ServiceDescription(
+        **_get_descriptor_args(service)).all_types
+    attr_names = {name.replace('-', '_') for name in all_types}
+    registered = False
+
+    def getter(self, attr_name):
+        nonlocal registered
+        with _LAZY_LOCK:
+            if not registered:
+                # replaces the lazy attributes with the real descriptor
+                register_single_service(self, service_name, service=service)
+                registered = True
+        return getattr(self, attr_name)
+
+    for attr_name in attr_names:
+        setattr(conn.__class__, attr_name, property(
+            fget=lambda self, attr_name=attr_name: getter(self, attr_name)))
+
+
+def load(conn, lazy=False, **kwargs):
     """Register supported OTC services and make them known to the OpenStackSDK
 
     :param conn: An established OpenStack cloud connection
+    :param bool lazy: Defer the import and the endpoint resolution of every
+        service until its proxy is accessed. The connection is not
+        authorized upfront either.
 
     :returns: none
     """
-    conn.authorize()
-    project_id = conn._get_project_info().id
+    if lazy:
+        # Lazy attributes are bound to the class, keep them off other
+        # connections
+        extend_instance(conn, _LazyServices)
+        for (service_name, service) in OTC_SERVICES.items():
+            register_lazy_service(conn, service_name, service)
+        setattr(conn, 'get_ak_sk', get_ak_sk)
+    else:
+        conn.authorize()
+        project_id = conn._get_project_info().id
 
-    for (service_name, service) in OTC_SERVICES.items():
-        # _logger.debug('trying to register service %s' % service_name)
-        register_single_service(conn, service_name, project_id, service)
+        for (service_name, service) in OTC_SERVICES.items():
+            # _logger.debug('trying to register service %s' % service_name)
+            register_single_service(conn, service_name, project_id, service)
 
     patch_openstack_resources()
 
@@ -438,4 +495,12 @@ def load(conn, **kwargs):
     return None
 
 
+def load_lazy(conn, **kwargs):
+    """Register OTC services lazily, see :func:`load`
+
+    Usable as ``vendor_hook`` (``otcextensions.sdk:load_lazy``).
+    """
+    return load(conn, lazy=True, **kwargs)
+
+
 register_otc_extensions = load
@@ -10,9 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import datetime
-import functools
 import hashlib
 import hmac
+import threading
+import time
 
 import requests
 
@@ -20,11 +21,7 @@ from urllib.parse import quote
 from urllib.parse import urlparse
 from urllib.parse import urlsplit
 
-from http import client as http_client
-
-
-class HTTPHeaders(http_client.HTTPMessage):
-    pass
+from otcextensions.sdk import instrumentation
 
 
 def ensure_unicode(s, encoding=None, errors=None):
@@ -35,15 +32,24 @@ def ensure_unicode(s, encoding=None, errors=None):
 EMPTY_SHA256_HASH = (
     'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855')
 
+#: Payload signing modes, selected per request through the
+#: X-Amz-Content-SHA256 header. A caller may also put the hex SHA256 of the
+#: body there (pre-hashed mode). Without the header the cheapest valid mode
+#: is chosen, see ``AKRequestsAuth.payload``.
 UNSIGNED_PAYLOAD = 'UNSIGNED-PAYLOAD'
+STREAMING_PAYLOAD = 'STREAMING-AWS4-HMAC-SHA256-PAYLOAD'
 PAYLOAD_BUFFER = 1024 * 1024
+STREAMING_CHUNK_SIZE = 64 * 1024
+# Frame of a signed aws-chunked chunk without the hex size and the data:
+# ";chunk-signature=" + 64 hex + "\r\n" + data + "\r\n"
+_STREAMING_FRAME_SIZE = len(';chunk-signature=') + 64 + 4
 
-SIGNED_HEADERS_BLACKLIST = [
+SIGNED_HEADERS_BLACKLIST = frozenset([
     'expect',
     'user-agent',
     'x-amzn-trace-id',
     'X-Auth-Token',
-]
+])
 ISO8601 = '%Y-%m-%dT%H:%M:%SZ'
 SIGV4_TIMESTAMP = '%Y%m%dT%H%M%SZ'
 
@@ -81,6 +87,19 @@ class AKRequestsAuth(requests.auth.AuthBase):
         self.aws_region = region
         self.service = service
         self.aws_token = token
+        # Signing may happen concurrently from a thread pool, keep the
+        # timestamp of the request being signed per thread
+        self._local = threading.local()
+        # (date, region, service) -> (signing key, credential scope)
+        self._signing_key_cache = (None, None)
+
+    @property
+    def timestamp(self):
+        return getattr(self._local, 'timestamp', None)
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._local.timestamp = value
 
     def __call__(self, r):
         """
@@ -89,7 +108,10 @@ class AKRequestsAuth(requests.auth.AuthBase):
         Adapted from
             https://docs.aws.amazon.com/general/latest/gr/sigv4-signed-request-examples.html
         """
+        start = time.monotonic()
         self.add_auth(r)
+        instrumentation.observe('signing_duration_seconds',
+                                time.monotonic() - start, service=self.service)
         return r
 
     def add_auth(self, request):
@@ -111,11 +133,18 @@ class AKRequestsAuth(requests.auth.AuthBase):
         # This could be a retry.  Make sure the previous
         # authorization header is removed first.
         self._modify_request_before_signing(request)
-        canonical_request = self.canonical_request(request)
+        headers_to_sign = self.headers_to_sign(request)
+        canonical_request = self.canonical_request(request, headers_to_sign)
         string_to_sign = self.string_to_sign(request, canonical_request)
         signature = self.signature(string_to_sign, request)
 
-        self._inject_signature_to_request(request, signature)
+        self._inject_signature_to_request(
+            request, signature, headers_to_sign)
+        if request.headers['X-Amz-Content-SHA256'] == STREAMING_PAYLOAD:
+            request.body = self._streaming_body(
+                request.body,
+                int(request.headers['X-Amz-Decoded-Content-Length']),
+                signature)
 
     def _modify_request_before_signing(self, request):
         if 'Authorization' in request.headers:
@@ -126,10 +155,71 @@ class AKRequestsAuth(requests.auth.AuthBase):
                 del request.headers['X-Amz-Security-Token']
             request.headers['X-Amz-Security-Token'] = self.aws_token
 
-        # if not self._should_sha256_sign_payload(request):
-        if 'X-Amz-Content-SHA256' in request.headers:
-            del request.headers['X-Amz-Content-SHA256']
-        request.headers['X-Amz-Content-SHA256'] = UNSIGNED_PAYLOAD
+        # A mode or a precomputed hash given by the caller is respected
+        content_sha256 = request.headers.get('X-Amz-Content-SHA256')
+        if not content_sha256:
+            content_sha256 = self.payload(request)
+        if content_sha256 == STREAMING_PAYLOAD:
+            if not self._set_streaming_headers(request):
+                content_sha256 = UNSIGNED_PAYLOAD
+        request.headers['X-Amz-Content-SHA256'] = content_sha256
+
+    def _set_streaming_headers(self, request):
+        """Prepare the headers of an aws-chunked signed body
+
+        :returns: ``False`` when the body can not be sent this way
+        """
+        length = request.headers.get('Content-Length')
+        if length is None or not hasattr(request.body, 'read'):
+            return False
+        length = int(length)
+        encoding = request.headers.get('Content-Encoding')
+        request.headers['Content-Encoding'] = (
+            'aws-chunked,%s' % encoding if encoding else 'aws-chunked')
+        request.headers['X-Amz-Decoded-Content-Length'] = str(length)
+        request.headers['Content-Length'] = str(
+            self._streaming_length(length))
+        return True
+
+    @staticmethod
+    def _streaming_length(length):
+        """Size of an aws-chunked body carrying length bytes"""
+        full, last = divmod(length, STREAMING_CHUNK_SIZE)
+        total = full * (len('%x' % STREAMING_CHUNK_SIZE)
+                        + _STREAMING_FRAME_SIZE + STREAMING_CHUNK_SIZE)
+        if last:
+            total += len('%x' % last) + _STREAMING_FRAME_SIZE + last
+        # closing zero length chunk
+        return total + 1 + _STREAMING_FRAME_SIZE
+
+    def _streaming_body(self, body, length, seed_signature):
+        """Wrap body into aws-chunked frames signed while they are sent
+
+        Every chunk signature chains the previous one, starting from the
+        signature of the request itself, so the body is hashed exactly
+        once, on the fly.
+        """
+        k_signing, scope = self._signing_key()
+        prefix = '\n'.join(['AWS4-HMAC-SHA256-PAYLOAD', self.timestamp, scope])
+
+        def chunks():
+            signature = seed_signature
+            remaining = length
+            while True:
+                chunk = body.read(
+                    min(STREAMING_CHUNK_SIZE, remaining)) if remaining else b''
+                remaining -= len(chunk)
+                signature = self._sign(k_signing, '\n'.join([
+                    prefix, signature, EMPTY_SHA256_HASH,
+                    hashlib.sha256(chunk).hexdigest()]), hex=True)
+                yield b''.join([
+                    b'%x;chunk-signature=%s\r\n' % (
+                        len(chunk), signature.encode('utf-8')),
+                    chunk, b'\r\n'])
+                if not chunk:
+                    return
+
+        return chunks()
 
     def _set_necessary_date_headers(self, request):
         # The spec allows for either the Date _or_ the X-Amz-Date value to be
@@ -148,45 +238,40 @@ class AKRequestsAuth(requests.auth.AuthBase):
             del request.headers['X-Amz-Date']
         request.headers['X-Amz-Date'] = self.timestamp
 
-    def _inject_signature_to_request(self, request, signature):
+    def _inject_signature_to_request(self, request, signature,
+                                     headers_to_sign=None):
         hdrs = ['AWS4-HMAC-SHA256 Credential=%s' % self.scope(request)]
-        headers_to_sign = self.headers_to_sign(request)
+        if headers_to_sign is None:
+            headers_to_sign = self.headers_to_sign(request)
         hdrs.append('SignedHeaders=%s' % self.signed_headers(headers_to_sign))
         hdrs.append('Signature=%s' % signature)
         request.headers['Authorization'] = ', '.join(hdrs)
         return request
 
     def payload(self, request):
+        """Select the cheapest payload signing mode valid for the request
+
+        * TLS already protects the body, so it is not signed over https.
+        * Bodies in memory are hashed directly.
+        * Streamed bodies (files, file segments) are signed chunk by chunk
+          while being sent instead of being read twice.
+        """
         if not self._should_sha256_sign_payload(request):
             # When payload signing is disabled, we use this static string in
             # place of the payload checksum.
             return UNSIGNED_PAYLOAD
-        if request.body and hasattr(request.body, 'seek'):
-            position = request.body.tell()
-            read_chunksize = functools.partial(request.body.read,
-                                               PAYLOAD_BUFFER)
-            checksum = hashlib.sha256()
-            for chunk in iter(read_chunksize, b''):
-                checksum.update(chunk)
-            hex_checksum = checksum.hexdigest()
-            request.body.seek(position)
-            return hex_checksum
-        elif request.body:
-            # The request serialization has ensured that
-            # request.body is a bytes() type.
-            return hashlib.sha256(request.body).hexdigest()
-        else:
+        body = request.body
+        if not body:
             return EMPTY_SHA256_HASH
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            return hashlib.sha256(body).hexdigest()
+        return STREAMING_PAYLOAD
 
     def _should_sha256_sign_payload(self, request):
         # Payloads will always be signed over insecure connections.
-        if not request.url.startswith('https'):
-            return True
-
-        # Certain operations may have payload signing disabled by default.
-        # Since we don't have access to the operation model, we pass in this
-        # bit of metadata through the request context.
-        return True  # request.context.get('payload_signing_enabled', True)
+        return not request.url.startswith('https')
 
     def canonical_headers(self, headers_to_sign):
         """
@@ -195,13 +280,9 @@ class AKRequestsAuth(requests.auth.AuthBase):
         case, sorting them in alphabetical order and then joining
         them into a string, separated by newlines.
         """
-        headers = []
-        sorted_header_names = sorted(set(headers_to_sign))
-        for key in sorted_header_names:
-            value = ','.join(self._header_value(v) for v in
-                             sorted(headers_to_sign.get_all(key)))
-            headers.append('%s:%s' % (key, ensure_unicode(value)))
-        return '\n'.join(headers)
+        return '\n'.join(
+            '%s:%s' % (key, self._header_value(headers_to_sign[key]))
+            for key in sorted(headers_to_sign))
 
     def _header_value(self, value):
         # From the sigv4 docs:
@@ -217,11 +298,13 @@ class AKRequestsAuth(requests.auth.AuthBase):
         Create canonical URI--the part of the URI from domain to query
         string (use '/' if no path)
         """
-        parsedurl = urlparse(r.url)
+        return cls._canonical_path(urlparse(r.url).path)
 
+    @staticmethod
+    def _canonical_path(path):
         # safe chars adapted from boto's use of urllib.parse.quote
         # https://github.com/boto/boto/blob/d9e5cfe900e1a58717e393c76a6e3580305f217a/boto/auth.py#L393
-        return quote(parsedurl.path if parsedurl.path else '/', safe='/-_.~')
+        return quote(path if path else '/', safe='/-_.~')
 
     @classmethod
     def get_canonical_querystring(cls, r):
@@ -240,33 +323,25 @@ class AKRequestsAuth(requests.auth.AuthBase):
         will be your responsibility to urleconde your query params before
         this method is called.
         """
-        canonical_querystring = ''
-
-        parsedurl = urlparse(r.url)
-        querystring_sorted = '&'.join(sorted(parsedurl.query.split('&')))
-
-        for query_param in querystring_sorted.split('&'):
-            key_val_split = query_param.split('=', 1)
-
-            key = key_val_split[0]
-            if len(key_val_split) > 1:
-                val = key_val_split[1]
-            else:
-                val = ''
+        return cls._canonical_querystring(urlparse(r.url).query)
 
+    @staticmethod
+    def _canonical_querystring(query):
+        params = []
+        for query_param in sorted(query.split('&')):
+            key, _, val = query_param.partition('=')
             if key:
-                if canonical_querystring:
-                    canonical_querystring += "&"
-                canonical_querystring += u'='.join([key, val])
-
-        return canonical_querystring
+                params.append('%s=%s' % (key, val))
+        return '&'.join(params)
 
     def headers_to_sign(self, request):
         """
         Select the headers from the request that need to be included
         in the StringToSign.
+
+        :returns: dict of lower case header names to values
         """
-        header_map = HTTPHeaders()
+        header_map = {}
         for name, value in request.headers.items():
             lname = name.lower()
             if lname not in SIGNED_HEADERS_BLACKLIST:
@@ -275,12 +350,13 @@ class AKRequestsAuth(requests.auth.AuthBase):
             header_map['host'] = self._canonical_host(request.url)
         return header_map
 
-    def canonical_request(self, request):
+    def canonical_request(self, request, headers_to_sign=None):
+        url_parts = urlsplit(request.url)
         cr = [request.method.upper()]
-        path = self.get_canonical_path(request)
-        cr.append(path)
-        cr.append(self.get_canonical_querystring(request))
-        headers_to_sign = self.headers_to_sign(request)
+        cr.append(self._canonical_path(url_parts.path))
+        cr.append(self._canonical_querystring(url_parts.query))
+        if headers_to_sign is None:
+            headers_to_sign = self.headers_to_sign(request)
         cr.append(self.canonical_headers(headers_to_sign) + '\n')
         cr.append(self.signed_headers(headers_to_sign))
         if 'X-Amz-Content-SHA256' in request.headers:
@@ -318,9 +394,7 @@ class AKRequestsAuth(requests.auth.AuthBase):
         return '\n'.join(sts)
 
     def signed_headers(self, headers_to_sign):
-        hdrs = ['%s' % n.lower().strip() for n in set(headers_to_sign)]
-        hdrs = sorted(hdrs)
-        return ';'.join(hdrs)
+        return ';'.join(sorted(n.lower().strip() for n in headers_to_sign))
     # def _normalize_url_path(self, path):
     #     normalized_path = quote(normalize_url_path(path), safe='/~')
     #     return normalized_path
@@ -335,27 +409,32 @@ class AKRequestsAuth(requests.auth.AuthBase):
             sig = hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
         return sig
 
-    def signature(self, string_to_sign, request):
+    def _signing_key(self):
+        """Return the signing key and credential scope of the timestamp
+
+        The key only depends on the date, region and service, so it is
+        derived once and reused until one of them changes.
+        """
+        scope_key = (self.timestamp[0:8], self.aws_region, self.service)
+        cached_scope_key, cached = self._signing_key_cache
+        if cached_scope_key == scope_key:
+            return cached
+        date, region, service = scope_key
         key = self.aws_secret_access_key
-        k_date = self._sign(('AWS4' + key).encode('utf-8'),
-                            self.timestamp[0:8])
-        k_region = self._sign(k_date, self.aws_region)
-        k_service = self._sign(k_region, self.service)
+        k_date = self._sign(('AWS4' + key).encode('utf-8'), date)
+        k_region = self._sign(k_date, region)
+        k_service = self._sign(k_region, service)
         k_signing = self._sign(k_service, 'aws4_request')
+        cached = (k_signing, '/'.join(scope_key + ('aws4_request',)))
+        self._signing_key_cache = (scope_key, cached)
+        return cached
+
+    def signature(self, string_to_sign, request):
+        k_signing = self._signing_key()[0]
         return self._sign(k_signing, string_to_sign, hex=True)
 
     def credential_scope(self, request):
-        scope = []
-        scope.append(self.timestamp[0:8])
-        scope.append(self.aws_region)
-        scope.append(self.service)
-        scope.append('aws4_request')
-        return '/'.join(scope)
+        return self._signing_key()[1]
 
     def scope(self, request):
-        scope = [self.aws_access_key]
-        scope.append(self.timestamp[0:8])
-        scope.append(self.aws_region)
-        scope.append(self.service)
-        scope.append('aws4_request')
-        return '/'.join(scope)
+        return '%s/%s' % (self.aws_access_key, self._signing_key()[1])
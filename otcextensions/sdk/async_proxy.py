@@ -0,0 +1,331 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import datetime
+import json
+import time
+
+import requests
+from requests import structures
+from requests import utils as requests_utils
+
+from openstack import exceptions
+from openstack import utils
+
+from otcextensions.common import utils as otc_utils
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+#: Number of requests an AsyncProxy keeps in flight at most
+DEFAULT_CONCURRENCY = 100
+#: Number of pooled connections of an AsyncProxy
+DEFAULT_POOL_SIZE = 100
+
+
+class _Response:
+    """The parts of a requests response the resources consume"""
+
+    def __init__(self, status_code, headers, content, reason=None, url=None,
+                 request=None, elapsed=None):
+        self.status_code = status_code
+        self.headers = structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.reason = reason
+        self.url = url
+        self.request = request
+        self.elapsed = elapsed
+        self.links = {}
+        link_header = self.headers.get('link')
+        if link_header:
+            for link in requests_utils.parse_header_links(link_header):
+                self.links[link.get('rel') or link.get('url')] = link
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncProxy:
+    """asyncio variant of a service proxy
+
+    Wraps a synchronous proxy, which still provides the endpoint, the
+    authentication and the resource definitions, while the requests are
+    sent through an aiohttp client session with a pooled connector. At
+    most ``concurrency`` requests are in flight, further ones wait::
+
+        async with AsyncProxy(conn.dns) as dns:
+            zones = await asyncio.gather(
+                *(dns.get(zone.Zone, zone_id) for zone_id in zone_ids))
+
+    :param proxy: The synchronous proxy of the service.
+    :param int concurrency: Maximal number of requests in flight.
+    :param int pool_size: Maximal number of pooled connections.
+    :param session: An aiohttp compatible client session to use instead of
+        creating one, it is not closed by the proxy.
+    """
+
+    def __init__(self, proxy, concurrency=DEFAULT_CONCURRENCY,
+                 pool_size=DEFAULT_POOL_SIZE, session=None):
+        self.proxy = proxy
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+        self._auth_lock = None
+        self._auth_headers = None
+        self._endpoint = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        if self._session is None:
+            if aiohttp is None:
+                raise exceptions.SDKException(
+                    'aiohttp is required for the asyncio proxies')
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._auth_lock = asyncio.Lock()
+
+    async def close(self):
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _override_args(self, resource_type, endpoint_override=None,
+                       request_headers=None, headers=None,
+                       requests_auth=None):
+        additional_headers = otc_utils.merge_two_dicts(
+            getattr(self.proxy, 'additional_headers', None) or {},
+            headers or {})
+        prepare = getattr(resource_type, '_prepare_override_args', None)
+        if prepare is not None:
+            return prepare(endpoint_override=endpoint_override,
+                           request_headers=request_headers,
+                           additional_headers=additional_headers,
+                           requests_auth=requests_auth)
+        args = {'headers': otc_utils.merge_two_dicts(
+            additional_headers, request_headers or {})}
+        if endpoint_override:
+            args['endpoint_override'] = endpoint_override
+        if requests_auth:
+            args['requests_auth'] = requests_auth
+        return args
+
+    async def _get_endpoint(self):
+        async with self._auth_lock:
+            if self._endpoint is None:
+                # resolving it may authenticate, which blocks
+                self._endpoint = await asyncio.get_running_loop(
+                ).run_in_executor(None, self.proxy.get_endpoint)
+            return self._endpoint
+
+    def _fetch_auth_headers(self, refresh):
+        session = self.proxy.session
+        auth = getattr(self.proxy, 'auth', None)
+        if refresh:
+            session.invalidate(auth=auth)
+        return session.get_auth_headers(auth=auth) or {}
+
+    async def _get_auth_headers(self, stale=None):
+        """Return the auth headers, fetched once for all requests
+
+        Fetching them blocks, so it runs in the default executor. Passing
+        the headers a request was rejected with refreshes them, unless
+        another request already did.
+        """
+        async with self._auth_lock:
+            refresh = stale is not None and stale is self._auth_headers
+            if self._auth_headers is None or refresh:
+                self._auth_headers = await asyncio.get_running_loop(
+                ).run_in_executor(None, self._fetch_auth_headers, refresh)
+            return self._auth_headers
+
+    async def _request(self, method, uri, endpoint_override=None,
+                       headers=None, requests_auth=None, params=None,
+                       json_body=None):
+        if self._semaphore is None:
+            raise exceptions.SDKException(
+                'AsyncProxy is not open, use it as async context manager')
+        if uri.startswith(('http://', 'https://')):
+            url = uri
+        else:
+            url = utils.urljoin(
+                endpoint_override or await self._get_endpoint(), uri)
+
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode('utf-8')
+        auth_headers = None
+        for retry in (False, True):
+            request_headers = {'Accept': 'application/json'}
+            if requests_auth is None:
+                auth_headers = await self._get_auth_headers(auth_headers)
+                request_headers.update(auth_headers)
+            request_headers.update(headers or {})
+            if data is not None:
+                request_headers.setdefault(
+                    'Content-Type', 'application/json')
+            response = await self._send(
+                method, url, request_headers, params, data, requests_auth)
+            # The request is sent again once with refreshed headers when
+            # the token expired
+            if response.status_code != 401 or auth_headers is None \
+                    or retry:
+                return response
+
+    async def _send(self, method, url, request_headers, params, data,
+                    requests_auth):
+        # Prepared by requests so that AKRequestsAuth signs exactly what
+        # is sent
+        prepared = requests.Request(
+            method, url, headers=request_headers, params=params,
+            data=data).prepare()
+        if requests_auth is not None:
+            prepared = requests_auth(prepared)
+
+        async with self._semaphore:
+            start = time.monotonic()
+            try:
+                async with self._session.request(
+                        method, prepared.url, headers=dict(prepared.headers),
+                        data=prepared.body) as response:
+                    content = await response.read()
+            except Exception as e:
+                self._report_stats(None, prepared.url, method, e)
+                raise
+            result = _Response(
+                response.status, response.headers, content,
+                reason=response.reason, url=str(response.url),
+                request=prepared, elapsed=datetime.timedelta(
+                    seconds=time.monotonic() - start))
+        self._report_stats(result)
+        return result
+
+    def _report_stats(self, response, url=None, method=None, exc=None):
+        # recorded like the requests of the wrapped proxy: statsd,
+        # InfluxDB, Prometheus and the instrumentation registry
+        report = getattr(self.proxy, '_report_stats', None)
+        if report is not None:
+            report(response, url, method, exc)
+
+    async def get(self, resource_type, value=None, requires_id=True,
+                  endpoint_override=None, headers=None, requests_auth=None,
+                  **attrs):
+        """Get a resource
+
+        :param resource_type: The type of resource to get.
+        :param value: The ID of a resource or a resource instance.
+
+        :returns: The fetched resource.
+        """
+        res = self.proxy._get_resource(resource_type, value, **attrs)
+        request = res._prepare_request(requires_id=requires_id)
+        response = await self._request(
+            'GET', request.url, **self._override_args(
+                resource_type, endpoint_override, request.headers,
+                headers, requests_auth))
+        res._translate_response(
+            response, error_message="No {resource_type} found for {value}"
+            .format(resource_type=resource_type.__name__, value=value))
+        return res
+
+    async def create(self, resource_type, endpoint_override=None,
+                     headers=None, requests_auth=None, prepend_key=True,
+                     **attrs):
+        """Create a resource from attributes
+
+        :param resource_type: The type of resource to create.
+
+        :returns: The created resource.
+        """
+        res = resource_type.new(**attrs)
+        if not res.allow_create:
+            raise exceptions.MethodNotSupported(res, "create")
+        request = res._prepare_request(
+            requires_id=res.create_method == 'PUT', prepend_key=prepend_key)
+        response = await self._request(
+            res.create_method, request.url, json_body=request.body,
+            **self._override_args(
+                resource_type, endpoint_override, request.headers,
+                headers, requests_auth))
+        has_body = getattr(res, 'create_returns_body', None)
+        res._translate_response(
+            response, has_body=res.has_body if has_body is None
+            else has_body)
+        return res
+
+    async def list(self, resource_type, paginated=True,
+                   endpoint_override=None, headers=None, requests_auth=None,
+                   **params):
+        """List resources, an asynchronous generator
+
+        Pages are requested one after another, iterate several listings
+        concurrently to fan out.
+
+        :param resource_type: The type of resource to list.
+        :param bool paginated: Whether to follow the pagination links.
+        :param dict params: URI parameters and query filters.
+        """
+        if not resource_type.allow_list:
+            raise exceptions.MethodNotSupported(resource_type, "list")
+        resource_type._query_mapping._validate(
+            params, base_path=resource_type.base_path)
+        query_params = resource_type._query_mapping._transpose(
+            params, resource_type)
+        uri = resource_type.base_path % params
+        limit = query_params.get('limit')
+        args = self._override_args(
+            resource_type, endpoint_override, None, headers, requests_auth)
+
+        total_yielded = 0
+        while uri:
+            response = await self._request(
+                'GET', uri, params=query_params.copy(), **args)
+            exceptions.raise_from_response(response)
+            data = response.json()
+
+            # Discard any existing pagination keys
+            query_params.pop('marker', None)
+            query_params.pop('limit', None)
+
+            if resource_type.resources_key:
+                resources = data[resource_type.resources_key]
+            else:
+                resources = data
+            if not isinstance(resources, list):
+                resources = [resources]
+
+            marker = None
+            for raw_resource in resources:
+                value = resource_type.existing(**raw_resource)
+                marker = value.id
+                yield value
+                total_yielded += 1
+
+            if not (resources and paginated):
+                return
+            uri, next_params = resource_type._get_next_link(
+                uri, response, data, marker, limit, total_yielded)
+            query_params.update(next_params)
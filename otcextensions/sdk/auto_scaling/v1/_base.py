@@ -9,9 +9,12 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from openstack import exceptions
 from openstack import resource
 from openstack import utils
 
+from otcextensions.sdk import sdk_resource
+
 
 class Resource(resource.Resource):
 
@@ -23,6 +26,42 @@ class Resource(resource.Resource):
         limit='limit'
     )
 
+    @classmethod
+    def list(cls, session, paginated=True, base_path=None,
+             allow_unknown_params=False, prefetch=0, **params):
+        """This method is a generator which yields resource objects.
+
+        :param int prefetch: Number of pages fetched concurrently once the
+            first page tells the total number. By default pages are
+            fetched one after another.
+        """
+        if not (paginated and prefetch):
+            yield from super(Resource, cls).list(
+                session, paginated=paginated, base_path=base_path,
+                allow_unknown_params=allow_unknown_params, **params)
+            return
+
+        if not cls.allow_list:
+            raise exceptions.MethodNotSupported(cls, "list")
+        session = cls._get_session(session)
+        microversion = params.pop('microversion', None) or \
+            cls._get_microversion(session, action='list')
+
+        if base_path is None:
+            base_path = cls.base_path
+        api_filters = cls._query_mapping._validate(
+            params, base_path=base_path,
+            allow_unknown_params=allow_unknown_params)
+        query_params = cls._query_mapping._transpose(api_filters, cls)
+        uri_params = {
+            key: value for key, value in params.items()
+            if isinstance(getattr(cls, key, None), resource.URI)}
+
+        yield from sdk_resource.list_prefetched(
+            cls, session, base_path % params, query_params,
+            'start_number', 'total_number', prefetch,
+            microversion=microversion, uri_params=uri_params)
+
     @classmethod
     def _get_next_link(cls, uri, response, data, marker, limit, total_yielded):
         # AS service pagination. Returns query for the next page
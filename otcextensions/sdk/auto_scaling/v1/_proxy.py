@@ -37,6 +37,7 @@ class Proxy(proxy.Proxy):
             * ``scaling_configuration_id``: scaling configuration id
             * ``marker``:  pagination marker, known as ``start_number``
             * ``limit``: pagination limit
+            * ``prefetch``: number of pages fetched concurrently
 
         :returns: A generator of group
             (:class:`~otcextensions.sdk.auto_scaling.v1.group.Group`) instances
@@ -431,6 +432,7 @@ class Proxy(proxy.Proxy):
             * ``scaling_group_id``: scaling group id the policy applied to
             * ``marker``:  pagination marker
             * ``limit``: pagination limit
+            * ``prefetch``: number of pages fetched concurrently
 
         :returns: A generator of instances with type
             (:class:`~otcextensions.sdk.auto_scaling.v1.instance.Instance`)
@@ -587,6 +589,7 @@ class Proxy(proxy.Proxy):
             * ``end_time``: activity end time
             * ``marker``:  pagination marker, known as ``start_number``
             * ``limit``: pagination limit
+            * ``prefetch``: number of pages fetched concurrently
 
         :returns: A generator of group
             (:class:`~otcextensions.sdk.auto_scaling.v1.activity.Activity`)
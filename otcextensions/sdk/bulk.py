@@ -0,0 +1,117 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import collections
+import concurrent.futures
+
+#: Number of single resource calls of a bulk call in flight at once
+DEFAULT_BULK_WORKERS = 8
+
+
+def iter_many(call, items, workers=DEFAULT_BULK_WORKERS):
+    """Call ``call`` for every item concurrently
+
+    Items are consumed lazily, at most twice ``workers`` calls are queued
+    at once. An exception of a call is captured and reported with its
+    item instead of aborting the others.
+
+    :param call: Called with every item.
+    :param items: An iterable of items.
+    :param int workers: Number of calls run concurrently.
+
+    :returns: A generator of ``(item, result, error)`` tuples in the order
+        of the items, ``error`` is the exception raised by the call or
+        ``None``.
+    """
+    pending = collections.deque()
+
+    def _collect():
+        item, future = pending.popleft()
+        try:
+            return item, future.result(), None
+        except Exception as e:
+            return item, None, e
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        for item in items:
+            if len(pending) >= 2 * workers:
+                yield _collect()
+            pending.append((item, executor.submit(call, item)))
+        while pending:
+            yield _collect()
+
+
+def run_many(call, items, workers=DEFAULT_BULK_WORKERS):
+    """Call ``call`` for every item concurrently, see :func:`iter_many`
+
+    :returns: A list of ``(item, result, error)`` tuples in the order of
+        the items.
+    """
+    return list(iter_many(call, items, workers))
+
+
+class BulkProxyMixin:
+    """Bulk variants of the single resource calls of a proxy
+
+    Mixed in before :class:`openstack.proxy.Proxy`, every resource is
+    handled by the regular ``_get``, ``_delete`` or ``_update`` call, but
+    ``workers`` of them run concurrently, see :func:`run_many`.
+    """
+
+    def _get_many(self, resource_type, values,
+                  workers=DEFAULT_BULK_WORKERS, **attrs):
+        """Get many resources
+
+        :param resource_type: The type of resource to get.
+        :param values: An iterable of IDs or resource instances.
+        :param dict attrs: Attributes passed to every ``_get`` call, such
+            as the ID of a parent resource.
+
+        :returns: A list of ``(value, resource, error)`` tuples.
+        """
+        return run_many(
+            lambda value: self._get(resource_type, value, **attrs),
+            values, workers)
+
+    def _delete_many(self, resource_type, values, ignore_missing=True,
+                     workers=DEFAULT_BULK_WORKERS, **attrs):
+        """Delete many resources
+
+        :param resource_type: The type of resource to delete.
+        :param values: An iterable of IDs or resource instances.
+        :param bool ignore_missing: When set to ``False`` a missing
+            resource is reported with a
+            :class:`~openstack.exceptions.ResourceNotFound` error.
+        :param dict attrs: Attributes passed to every ``_delete`` call.
+
+        :returns: A list of ``(value, result, error)`` tuples.
+        """
+        return run_many(
+            lambda value: self._delete(
+                resource_type, value, ignore_missing=ignore_missing,
+                **attrs),
+            values, workers)
+
+    def _update_many(self, resource_type, updates,
+                     workers=DEFAULT_BULK_WORKERS, **attrs):
+        """Update many resources
+
+        :param resource_type: The type of resource to update.
+        :param updates: An iterable of ``(value, attrs)`` pairs of an ID or
+            resource instance and the attributes to update on it.
+        :param dict attrs: Attributes passed to every ``_update`` call.
+
+        :returns: A list of ``((value, attrs), resource, error)`` tuples.
+        """
+        return run_many(
+            lambda update: self._update(
+                resource_type, update[0], **dict(attrs, **update[1])),
+            updates, workers)
@@ -14,6 +14,8 @@ from urllib import parse
 from openstack import proxy
 from openstack import resource
 
+from otcextensions.sdk import bulk
+from otcextensions.sdk import job as sdk_job
 from otcextensions.sdk.cce.v3 import cluster as _cluster
 from otcextensions.sdk.cce.v3 import cluster_cert as _cluster_cert
 from otcextensions.sdk.cce.v3 import cluster_node as _cluster_node
@@ -21,7 +23,7 @@ from otcextensions.sdk.cce.v3 import job as _job
 from otcextensions.sdk.cce.v3 import node_pool as _node_pool
 
 
-class Proxy(proxy.Proxy):
+class Proxy(bulk.BulkProxyMixin, proxy.Proxy):
 
     skip_discovery = True
 
@@ -205,6 +207,29 @@ class Proxy(proxy.Proxy):
             cluster_id=cluster.id,
         )
 
+    def get_cluster_nodes(self, cluster, nodes,
+                          workers=bulk.DEFAULT_BULK_WORKERS):
+        """Get many nodes of a cluster concurrently
+
+        :param cluster: key id or an instance of
+            :class:`~otcextensions.sdk.cce.v3.cluster.Cluster`
+        :param nodes: An iterable of node ids or instances of
+            :class:`~otcextensions.sdk.cce.v3.cluster_node.ClusterNode`
+        :param int workers: Number of nodes fetched concurrently.
+
+        :returns: A list of ``(node, result, error)`` tuples in the order
+            of ``nodes``, where ``result`` is the fetched
+            :class:`~otcextensions.sdk.cce.v3.cluster_node.ClusterNode`
+            or ``None`` if fetching it raised ``error``.
+        """
+        cluster = self._get_resource(_cluster.Cluster, cluster)
+        return self._get_many(
+            _cluster_node.ClusterNode,
+            nodes,
+            workers=workers,
+            cluster_id=cluster.id,
+        )
+
     def find_cluster_node(self, cluster, node):
         """Find the cluster node by it's UUID or name.
 
@@ -245,6 +270,33 @@ class Proxy(proxy.Proxy):
             cluster_id=cluster.id,
         )
 
+    def delete_cluster_nodes(self, cluster, nodes, ignore_missing=True,
+                             workers=bulk.DEFAULT_BULK_WORKERS):
+        """Delete many nodes from the cluster concurrently.
+
+        :param cluster: The value can be the ID of a cluster
+             or a :class:`~otcextensions.sdk.cce.v3.cluster.Cluster`
+             instance.
+        :param nodes: An iterable of IDs of cluster nodes or
+             :class:`~otcextensions.sdk.cce.v3.cluster_node.ClusterNode`
+             instances.
+        :param bool ignore_missing: When set to ``False`` a nonexistent
+            node is reported with a
+            :class:`~openstack.exceptions.ResourceNotFound` error.
+        :param int workers: Number of nodes deleted concurrently.
+
+        :returns: A list of ``(node, result, error)`` tuples in the order
+            of ``nodes``.
+        """
+        cluster = self._get_resource(_cluster.Cluster, cluster)
+        return self._delete_many(
+            _cluster_node.ClusterNode,
+            nodes,
+            ignore_missing=ignore_missing,
+            workers=workers,
+            cluster_id=cluster.id,
+        )
+
     def create_cluster_node(self, cluster, **attrs):
         """Add a new node to the cluster.
 
@@ -376,10 +428,33 @@ class Proxy(proxy.Proxy):
                      failures=None, interval=5, wait=3600,
                      attribute='status.status'):
         failures = ['FAILED'] if failures is None else failures
-        job = self.get_job(job_id)
-        return resource.wait_for_status(
-            self, job, status, failures, interval, wait,
-            attribute='status.status')
+        return sdk_job.wait_for_job(
+            self, self._get_resource(_job.Job, job_id), status, failures,
+            interval=interval, wait=wait, attribute='status.status')
+
+    def wait_for_jobs(self, job_ids, status='success', failures=None,
+                      interval=sdk_job.DEFAULT_POLL_INTERVAL,
+                      max_interval=sdk_job.DEFAULT_MAX_POLL_INTERVAL,
+                      wait=3600, callback=None):
+        """Wait for many jobs, yielding each one as soon as it finished
+
+        Jobs are polled with an exponential backoff starting at
+        ``interval`` seconds, see :func:`otcextensions.sdk.job.wait_for_jobs`.
+
+        :param job_ids: IDs of the jobs or instances of
+            :class:`~otcextensions.sdk.cce.v3.job.Job`
+        :param callback: Called with every finished job.
+
+        :returns: A generator of the finished
+            :class:`~otcextensions.sdk.cce.v3.job.Job` instances, failed
+            ones included, in the order they finished.
+        """
+        failures = ['FAILED'] if failures is None else failures
+        return sdk_job.wait_for_jobs(
+            self, [self._get_resource(_job.Job, job_id)
+                   for job_id in job_ids],
+            status, failures, interval=interval, max_interval=max_interval,
+            wait=wait, attribute='status.status', callback=callback)
 
     # ======== Project cleanup ========
     def _get_cleanup_dependencies(self):
@@ -0,0 +1,176 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""Bulk encoding and decoding of DIS records
+
+The functions work on lists of payloads and on the raw record dicts of
+the API, so no :class:`~otcextensions.sdk.dis.v2.data.Data` resource is
+built per record. The writers consume records lazily in chunks of
+``chunk_size``, so archives of any size are streamed.
+"""
+import binascii
+import csv
+import itertools
+import json
+import re
+
+from openstack import exceptions
+
+try:
+    import pyarrow
+    from pyarrow import parquet
+except ImportError:
+    pyarrow = None
+
+#: Columns written of a record
+DEFAULT_COLUMNS = ('sequence_number', 'data', 'timestamp', 'timestamp_type')
+#: Number of records decoded and written at once
+DEFAULT_CHUNK_SIZE = 10000
+#: Formats of :func:`write`
+FILE_FORMATS = ('csv', 'jsonl', 'parquet')
+
+_BASE64 = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+
+def encode(payloads):
+    """Return the base64 text of every ``bytes`` or ``str`` payload"""
+    b2a = binascii.b2a_base64
+    return [b2a(payload.encode('utf-8') if isinstance(payload, str)
+                else payload, newline=False).decode('ascii')
+            for payload in payloads]
+
+
+def encode_text(values):
+    """Return the base64 text of every value not base64 encoded already
+
+    Values which are valid base64 are passed as they are, like
+    ``upload_data`` always did, but are recognized without attempting to
+    decode them. Unlike :func:`base64.b64decode` excess padding after a
+    complete group of four characters is not taken for base64.
+    """
+    b2a = binascii.b2a_base64
+    match = _BASE64.fullmatch
+    return [value if not len(value) % 4 and match(value)
+            else b2a(value.encode('utf-8'), newline=False).decode('ascii')
+            for value in values]
+
+
+def decode(records, text=False):
+    """Return the payloads of raw records
+
+    :param records: An iterable of raw record dicts.
+    :param bool text: Return UTF-8 decoded ``str`` instead of ``bytes``.
+    """
+    a2b = binascii.a2b_base64
+    if text:
+        return [a2b(record['data']).decode('utf-8', 'replace')
+                for record in records]
+    return [a2b(record['data']) for record in records]
+
+
+def _chunks(records, chunk_size):
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _rows(chunk, columns, decode_data):
+    rows = [tuple(map(record.get, columns)) for record in chunk]
+    if decode_data and 'data' in columns:
+        index = columns.index('data')
+        for row, payload in zip(rows, decode(chunk, text=True)):
+            yield row[:index] + (payload,) + row[index + 1:]
+    else:
+        yield from rows
+
+
+def to_columns(records, columns=DEFAULT_COLUMNS, decode_data=False):
+    """Return the records as a dict of column name to list of values
+
+    :param bool decode_data: Hold the decoded ``bytes`` instead of the
+        base64 text in the ``data`` column.
+    """
+    records = list(records)
+    result = {column: [record.get(column) for record in records]
+              for column in columns}
+    if decode_data and 'data' in result:
+        result['data'] = decode(records)
+    return result
+
+
+def write_csv(records, file, columns=DEFAULT_COLUMNS, decode_data=False,
+              chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write records to an open text file as CSV with a header
+
+    :param bool decode_data: Write the UTF-8 decoded payload instead of
+        the base64 text into the ``data`` column.
+    """
+    columns = tuple(columns)
+    writer = csv.writer(file)
+    writer.writerow(columns)
+    for chunk in _chunks(records, chunk_size):
+        writer.writerows(_rows(chunk, columns, decode_data))
+
+
+def write_jsonl(records, file, columns=DEFAULT_COLUMNS, decode_data=False,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write records to an open text file as one JSON object per line
+
+    :param bool decode_data: Write the UTF-8 decoded payload instead of
+        the base64 text into the ``data`` field.
+    """
+    columns = tuple(columns)
+    dumps = json.JSONEncoder(separators=(',', ':')).encode
+    for chunk in _chunks(records, chunk_size):
+        file.write(''.join(
+            dumps(dict(zip(columns, row))) + '\n'
+            for row in _rows(chunk, columns, decode_data)))
+
+
+def write_parquet(records, path, columns=DEFAULT_COLUMNS, decode_data=False,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write records to a Parquet file, a row group per chunk
+
+    Requires `pyarrow`, which has to be installed separately.
+
+    :param bool decode_data: Write the decoded ``bytes`` instead of the
+        base64 text into the ``data`` column.
+    """
+    if pyarrow is None:
+        raise exceptions.SDKException(
+            'pyarrow is required to write Parquet files')
+    writer = None
+    try:
+        for chunk in _chunks(records, chunk_size):
+            table = pyarrow.table(to_columns(chunk, columns, decode_data))
+            if writer is None:
+                writer = parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write(records, filename, file_format='csv', **kwargs):
+    """Write records to a file in one of :data:`FILE_FORMATS`"""
+    if file_format not in FILE_FORMATS:
+        raise ValueError('file_format must be one of %s'
+                         % ', '.join(FILE_FORMATS))
+    if file_format == 'parquet':
+        return write_parquet(records, filename, **kwargs)
+    with open(filename, 'w', encoding='UTF8', newline='') as f:
+        if file_format == 'csv':
+            write_csv(records, f, **kwargs)
+        else:
+            write_jsonl(records, f, **kwargs)
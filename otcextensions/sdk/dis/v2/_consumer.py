@@ -0,0 +1,271 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import queue
+import random
+import threading
+import time
+
+from openstack import _log
+from openstack import exceptions
+
+_logger = _log.setup_logging('openstack')
+
+#: Where partitions without checkpoint are read from
+DEFAULT_CURSOR_TYPE = 'TRIM_HORIZON'
+#: Number of pages fetched ahead per partition
+DEFAULT_PREFETCH = 2
+#: Seconds a partition waits before polling again when it is drained
+DEFAULT_POLL_INTERVAL = 1.0
+#: Seconds between the checkpoints of the consumed records
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
+#: Number of consecutive failures of a partition before it gives up
+DEFAULT_RETRIES = 5
+
+_CLOSED = object()
+
+
+class Consumer:
+    """Iterator over the records of all partitions of a DIS stream
+
+    Every partition is polled by its own thread, which follows the
+    ``next_partition_cursor`` of the responses and keeps at most
+    ``prefetch`` pages ahead of the iteration. Iterating yields
+    ``(partition_id, record)`` tuples of the raw records in the order of
+    every partition, the partitions interleaved as their pages arrive::
+
+        with conn.dis.consumer('clicks', app_name='etl') as consumer:
+            for partition_id, record in consumer:
+                handle(base64.b64decode(record['data']))
+
+    With an ``app_name`` every partition continues after its
+    ``LAST_READ`` checkpoint and the sequence numbers of the records
+    consumed are committed every ``checkpoint_interval`` seconds and on
+    :meth:`close`. A record counts as consumed once the iteration moves
+    on past it, so records are delivered at least once.
+
+    :param proxy: The DIS proxy.
+    :param str stream_name: Name of the stream.
+    :param str app_name: Name of the app the checkpoints are kept for.
+    :param partitions: IDs of the partitions to read, all partitions of
+        the stream by default.
+    :param str cursor_type: Where partitions without checkpoint are read
+        from, such as ``TRIM_HORIZON`` or ``LATEST``.
+    :param int max_fetch_bytes: Size of a page at most.
+    :param int prefetch: Number of pages fetched ahead per partition.
+    :param float poll_interval: Seconds a drained partition waits before
+        it polls again.
+    :param float checkpoint_interval: Seconds between checkpoints.
+    :param int retries: Number of consecutive failures after which a
+        partition raises its error to the iteration.
+    """
+
+    def __init__(self, proxy, stream_name, app_name=None, partitions=None,
+                 cursor_type=DEFAULT_CURSOR_TYPE, max_fetch_bytes=None,
+                 prefetch=DEFAULT_PREFETCH,
+                 poll_interval=DEFAULT_POLL_INTERVAL,
+                 checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL,
+                 retries=DEFAULT_RETRIES):
+        self.proxy = proxy
+        self.stream_name = stream_name
+        self.app_name = app_name
+        self.cursor_type = cursor_type
+        self.max_fetch_bytes = max_fetch_bytes
+        self.prefetch = prefetch
+        self.poll_interval = poll_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.retries = retries
+        if partitions is None:
+            stream = proxy.get_stream(stream_name)
+            partitions = [partition['partition_id']
+                          for partition in stream.partitions or []]
+        self.partitions = list(partitions)
+        # partition id -> sequence number consumed and not committed
+        self._uncommitted = {}
+        self._commit_lock = threading.Lock()
+        self._last_commit = time.monotonic()
+        self._pages = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self._slots = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        for partition_id, page in self.pages():
+            for record in page:
+                yield partition_id, record
+                with self._commit_lock:
+                    self._uncommitted[partition_id] = \
+                        record['sequence_number']
+
+    def _start(self):
+        if self._threads:
+            return
+        for partition_id in self.partitions:
+            self._slots[partition_id] = threading.Semaphore(self.prefetch)
+            thread = threading.Thread(
+                target=self._run, args=(partition_id,),
+                name='otce-dis-consumer', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def pages(self):
+        """Yield ``(partition_id, records)`` of every page fetched
+
+        Unlike iterating the consumer the records of a page count as
+        consumed once the next page is requested.
+        """
+        self._start()
+        running = len(self._threads)
+        while running and not self._stop.is_set():
+            try:
+                partition_id, page = self._pages.get(
+                    timeout=self.checkpoint_interval)
+            except queue.Empty:
+                self._maybe_commit()
+                continue
+            if page is _CLOSED:
+                running -= 1
+                continue
+            if isinstance(page, Exception):
+                # the other partitions stop polling as well
+                self._stop.set()
+                raise page
+            self._slots[partition_id].release()
+            yield partition_id, page
+            if page:
+                with self._commit_lock:
+                    self._uncommitted[partition_id] = \
+                        page[-1]['sequence_number']
+            self._maybe_commit()
+
+    def _maybe_commit(self):
+        if time.monotonic() - self._last_commit >= self.checkpoint_interval:
+            self.commit()
+
+    def commit(self):
+        """Checkpoint the sequence numbers of the consumed records
+
+        Safe to call from another thread than the one iterating, such as
+        by :meth:`close`.
+        """
+        with self._commit_lock:
+            self._last_commit = time.monotonic()
+            if not self.app_name:
+                self._uncommitted.clear()
+                return
+            while self._uncommitted:
+                partition_id, sequence_number = self._uncommitted.popitem()
+                try:
+                    self.proxy.create_checkpoint(
+                        app_name=self.app_name,
+                        stream_name=self.stream_name,
+                        partition_id=partition_id,
+                        sequence_number=sequence_number)
+                except Exception:
+                    # keep it for the next attempt
+                    self._uncommitted[partition_id] = sequence_number
+                    raise
+
+    def close(self):
+        """Commit the consumed records and stop polling"""
+        self._stop.set()
+        try:
+            self.commit()
+        finally:
+            for thread in self._threads:
+                thread.join()
+
+    def _start_sequence_number(self, partition_id):
+        if not self.app_name:
+            return None
+        try:
+            checkpoint = self.proxy.get_checkpoint(
+                self.stream_name, self.app_name, partition_id)
+        except exceptions.NotFoundException:
+            return None
+        sequence_number = checkpoint.sequence_number
+        if sequence_number in (None, '', '-1', -1):
+            return None
+        return sequence_number
+
+    def _cursor(self, partition_id, sequence_number):
+        params = {'cursor-type': self.cursor_type}
+        if sequence_number is not None:
+            params = {'cursor-type': 'AFTER_SEQUENCE_NUMBER',
+                      'starting-sequence-number': sequence_number}
+        return self.proxy.get_data_cursor(
+            self.stream_name, partition_id, **params).partition_cursor
+
+    def _fetch(self, cursor):
+        params = {'partition-cursor': cursor}
+        if self.max_fetch_bytes:
+            params['max_fetch_bytes'] = self.max_fetch_bytes
+        response = self.proxy.get('/records', params=params)
+        exceptions.raise_from_response(response)
+        data = response.json()
+        return data.get('records') or [], data.get('next_partition_cursor')
+
+    def _acquire(self, partition_id):
+        while not self._stop.is_set():
+            if self._slots[partition_id].acquire(timeout=0.1):
+                return True
+        return False
+
+    def _run(self, partition_id):
+        try:
+            self._poll(partition_id)
+        except Exception as e:
+            self._pages.put((partition_id, e))
+        finally:
+            self._pages.put((partition_id, _CLOSED))
+
+    def _poll(self, partition_id):
+        sequence_number = cursor = None
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                if cursor is None:
+                    if sequence_number is None:
+                        sequence_number = self._start_sequence_number(
+                            partition_id)
+                    cursor = self._cursor(partition_id, sequence_number)
+                records, next_cursor = self._fetch(cursor)
+            except Exception as e:
+                failures += 1
+                if failures > self.retries:
+                    raise
+                _logger.debug(
+                    'Failed to read partition %s of %s: %s',
+                    partition_id, self.stream_name, e)
+                # cursors expire after 5 minutes, continue after the last
+                # record with a new one
+                cursor = None
+                delay = self.poll_interval * 2 ** (failures - 1)
+                self._stop.wait(delay / 2 + random.uniform(0, delay / 2))
+                continue
+            failures = 0
+            if records:
+                if not self._acquire(partition_id):
+                    return
+                self._pages.put((partition_id, records))
+                sequence_number = records[-1]['sequence_number']
+            if not next_cursor:
+                # the partition was closed by scaling the stream
+                return
+            cursor = next_cursor
+            if not records:
+                self._stop.wait(self.poll_interval)
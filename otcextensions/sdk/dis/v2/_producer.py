@@ -0,0 +1,282 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import itertools
+import queue
+import random
+import threading
+import time
+import zlib
+
+from openstack import _log
+from openstack import exceptions
+
+from otcextensions.sdk import instrumentation
+from otcextensions.sdk.dis.v2 import _codec
+
+_logger = _log.setup_logging('openstack')
+
+#: Number of records sent in one request at most
+DEFAULT_BATCH_SIZE = 500
+#: Size of the records sent in one request at most
+DEFAULT_BATCH_BYTES = 4 * 1024 * 1024
+#: Seconds a record waits at most for a batch to fill up
+DEFAULT_LINGER = 0.05
+#: Number of records queued at most, ``send`` blocks while it is reached
+DEFAULT_QUEUE_SIZE = 50000
+#: Number of batches sent concurrently
+DEFAULT_PRODUCER_WORKERS = 8
+#: Number of times failed records are sent again
+DEFAULT_RETRIES = 3
+#: Seconds before the first retry, doubled for every further one
+DEFAULT_RETRY_INTERVAL = 0.2
+
+#: ``error_code`` of the records of a failed request
+ERROR_REQUEST_FAILED = 'OTCE.RequestFailed'
+#: ``error_code`` of the records the response holds no result for
+ERROR_NO_RESULT = 'OTCE.NoResult'
+
+# JSON framing of a record next to its data and keys
+_RECORD_OVERHEAD = 64
+_STOP = object()
+
+
+class Producer:
+    """Long-lived producer sending records to a DIS stream in batches
+
+    Records are queued by :meth:`send` and sent by background threads,
+    one per lane. Every lane collects a batch until it holds
+    ``batch_size`` records or ``batch_bytes`` bytes or ``linger`` seconds
+    passed since its first record, and sends it while the other lanes
+    send theirs. Records are assigned to lanes by ``partition_id``,
+    ``explicit_hash_key`` or ``partition_key``, so the records of a key
+    are sent in order. Records without any of them are spread over the
+    lanes.
+
+    Only the records which the response marks as failed are sent again,
+    at most ``retries`` times with a growing delay. Whole batches are
+    sent again when the request fails.
+
+    :param proxy: The DIS proxy.
+    :param str stream_name: Name of the stream.
+    :param str stream_id: ID of the stream, used when the stream is not
+        found by name.
+    :param int batch_size: Number of records per request at most.
+    :param int batch_bytes: Size of the records per request at most.
+    :param float linger: Seconds a record waits at most for its batch to
+        fill up.
+    :param int queue_size: Number of records queued at most, ``send``
+        blocks while all of them are pending.
+    :param int workers: Number of lanes sending concurrently.
+    :param int retries: Number of times failed records are sent again.
+    :param float retry_interval: Seconds before the first retry, doubled
+        for every further one.
+    :param callback: Called as ``callback(record, result)`` from a lane
+        thread for every record sent or given up, ``result`` is the record
+        result of the response, failed ones hold an ``error_code``. It is
+        :data:`ERROR_REQUEST_FAILED` when the whole request failed and
+        :data:`ERROR_NO_RESULT` when the response misses the record.
+    """
+
+    def __init__(self, proxy, stream_name, stream_id=None,
+                 batch_size=DEFAULT_BATCH_SIZE,
+                 batch_bytes=DEFAULT_BATCH_BYTES,
+                 linger=DEFAULT_LINGER, queue_size=DEFAULT_QUEUE_SIZE,
+                 workers=DEFAULT_PRODUCER_WORKERS, retries=DEFAULT_RETRIES,
+                 retry_interval=DEFAULT_RETRY_INTERVAL, callback=None):
+        self.proxy = proxy
+        self.stream_name = stream_name
+        self.stream_id = stream_id
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.linger = linger
+        self.retries = retries
+        self.retry_interval = retry_interval
+        self.callback = callback
+        #: Number of records accepted by the stream
+        self.sent = 0
+        #: Number of records given up after the retries
+        self.failed = 0
+        self._queues = [queue.Queue(max(queue_size // workers, 1))
+                        for _lane in range(workers)]
+        self._round_robin = itertools.cycle(range(workers))
+        self._pending = 0
+        self._done = threading.Condition()
+        self._closed = False
+        self._threads = []
+        for lane in self._queues:
+            thread = threading.Thread(
+                target=self._run, args=(lane,), name='otce-dis-producer',
+                daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _lane(self, partition_id, explicit_hash_key, partition_key):
+        key = partition_id or explicit_hash_key or partition_key
+        if key is None:
+            return self._queues[next(self._round_robin)]
+        return self._queues[
+            zlib.crc32(str(key).encode('utf-8')) % len(self._queues)]
+
+    def send(self, data, partition_key=None, explicit_hash_key=None,
+             partition_id=None, timeout=None):
+        """Queue a record
+
+        :param data: The payload, ``bytes`` or ``str`` which is sent UTF-8
+            encoded. It is base64 encoded for the request.
+        :param str partition_key: Key the partition is chosen by.
+        :param str explicit_hash_key: Hash value choosing the partition,
+            overrides ``partition_key``.
+        :param str partition_id: Partition to write to.
+        :param float timeout: Seconds to wait at most while the queue is
+            full, forever by default.
+
+        :raises: :class:`queue.Full` when the queue stays full for
+            ``timeout`` seconds.
+        """
+        if self._closed:
+            raise exceptions.SDKException('The producer is closed')
+        record = {'data': _codec.encode((data,))[0]}
+        if partition_key is not None:
+            record['partition_key'] = partition_key
+        if explicit_hash_key is not None:
+            record['explicit_hash_key'] = explicit_hash_key
+        if partition_id is not None:
+            record['partition_id'] = partition_id
+        lane = self._lane(partition_id, explicit_hash_key, partition_key)
+        with self._done:
+            self._pending += 1
+        try:
+            lane.put(record, timeout=timeout)
+        except queue.Full:
+            self._finished(1)
+            raise
+
+    def _finished(self, count):
+        with self._done:
+            self._pending -= count
+            if not self._pending:
+                self._done.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until all queued records are sent or given up
+
+        :returns: ``True`` unless records are still pending after
+            ``timeout`` seconds.
+        """
+        with self._done:
+            return self._done.wait_for(lambda: not self._pending, timeout)
+
+    def close(self, timeout=None):
+        """Send the queued records and stop the lanes"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(timeout)
+        for lane in self._queues:
+            lane.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    @staticmethod
+    def _size(record):
+        return (len(record['data']) + len(record.get('partition_key') or '')
+                + len(record.get('explicit_hash_key') or '')
+                + _RECORD_OVERHEAD)
+
+    def _run(self, lane):
+        carry = None
+        while True:
+            record = carry if carry is not None else lane.get()
+            carry = None
+            if record is _STOP:
+                return
+            batch = [record]
+            size = self._size(record)
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = lane.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    carry = record
+                    break
+                size += self._size(record)
+                if size > self.batch_bytes:
+                    carry = record
+                    break
+                batch.append(record)
+            try:
+                self._send(batch)
+            except Exception:
+                _logger.exception('Error sending records to %s',
+                                  self.stream_name)
+            finally:
+                self._finished(len(batch))
+
+    def _put_records(self, records):
+        body = {'stream_name': self.stream_name, 'records': records}
+        if self.stream_id:
+            body['stream_id'] = self.stream_id
+        response = self.proxy.post('/records', json=body)
+        exceptions.raise_from_response(response)
+        return response.json().get('records') or []
+
+    def _send(self, batch):
+        attempt = 0
+        while batch:
+            try:
+                results = self._put_records(batch)
+            except Exception as e:
+                _logger.debug('Failed to put %d records to %s: %s',
+                              len(batch), self.stream_name, e)
+                results = [{'error_code': ERROR_REQUEST_FAILED,
+                            'error_message': str(e)}] * len(batch)
+            # the results are in the order of the records
+            results = list(results) + [
+                {'error_code': ERROR_NO_RESULT, 'error_message': 'No result'}
+            ] * (len(batch) - len(results))
+            failed = []
+            sent = given_up = 0
+            for record, result in zip(batch, results):
+                if not result.get('error_code'):
+                    sent += 1
+                elif attempt < self.retries:
+                    failed.append(record)
+                    continue
+                else:
+                    given_up += 1
+                    _logger.warning(
+                        'Giving up a record of %s: %s %s', self.stream_name,
+                        result.get('error_code'), result.get('error_message'))
+                if self.callback:
+                    self.callback(record, result)
+            with self._done:
+                self.sent += sent
+                self.failed += given_up
+            batch = failed
+            if batch:
+                attempt += 1
+                instrumentation.increment(
+                    'retries_total', service_type='dis',
+                    operation='put_records')
+                delay = self.retry_interval * 2 ** (attempt - 1)
+                time.sleep(delay / 2 + random.uniform(0, delay / 2))
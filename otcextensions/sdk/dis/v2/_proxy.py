@@ -11,12 +11,14 @@
 # under the License.
 
 import csv
-import base64
-import binascii
 from pathlib import Path
 
 from openstack import proxy
 # from openstack import exceptions
+from otcextensions.sdk import sdk_resource
+from otcextensions.sdk.dis.v2 import _codec
+from otcextensions.sdk.dis.v2 import _consumer
+from otcextensions.sdk.dis.v2 import _producer
 from otcextensions.sdk.dis.v2 import app as _app
 from otcextensions.sdk.dis.v2 import checkpoint as _checkpoint
 from otcextensions.sdk.dis.v2 import data as _data
@@ -233,15 +235,7 @@ class Proxy(proxy.Proxy):
         :returns: The results of uploaded data.
         :rtype: :class:`~otcextensions.sdk.dis.v2.data.Data`
         """
-        def encode_data(data):
-            try:
-                base64.b64decode(data, validate=True)
-                return data
-            except binascii.Error:
-                return base64.b64encode(data.encode('ascii')).decode('ascii')
-
         records = records if records else []
-        records_data = []
         if filename:
             with Path(filename).open('r') as csv_content:
                 header = next(csv.reader(csv_content, delimiter=','))
@@ -249,40 +243,60 @@ class Proxy(proxy.Proxy):
                     raise ValueError(
                         f'data column is missing in the header of {filename}'
                     )
-                reader = csv.DictReader(csv_content, header, delimiter=',')
-                for record in reader:
-                    data = record.get('data')
-                    if data and data != '':
-                        record['data'] = encode_data(data)
-                    else:
-                        raise ValueError('Data File contains empty data!')
-                    records_data.append(record)
+                records_data = list(
+                    csv.DictReader(csv_content, header, delimiter=','))
+            message = 'Data File contains empty data!'
         else:
-            for record in records:
-                data = record.get('data')
-                if data and data != '':
-                    record['data'] = encode_data(data)
-                else:
-                    raise ValueError('data is missing in the attributes')
-                records_data.append(record)
+            records_data = list(records)
+            message = 'data is missing in the attributes'
+        values = [record.get('data') for record in records_data]
+        if not all(values):
+            raise ValueError(message)
+        for record, data in zip(records_data, _codec.encode_text(values)):
+            record['data'] = data
 
         request_attrs = {
             'stream_name': stream_name,
             'records': records_data
         }
         if stream_id:
-            request_attrs.append(stream_id=stream_id)
+            request_attrs['stream_id'] = stream_id
         return self._create(_data.Data, **request_attrs)
 
+    def producer(self, stream_name, **kwargs):
+        """Return a producer sending records to a stream in batches
+
+        Unlike :meth:`upload_data` records are queued and sent by
+        background threads, batched by count, size and linger time.
+        Close the producer to send the remaining records::
+
+            with conn.dis.producer('clicks') as producer:
+                for event in events:
+                    producer.send(event.payload, partition_key=event.user)
+
+        :param stream_name: Name of the stream.
+        :param kwargs: Options of
+            :class:`~otcextensions.sdk.dis.v2._producer.Producer`.
+
+        :returns: A started
+            :class:`~otcextensions.sdk.dis.v2._producer.Producer`
+        """
+        return _producer.Producer(self, stream_name, **kwargs)
+
     def download_data(self, partititon_cursor,
-                      max_fetch_bytes=None, filename=None):
+                      max_fetch_bytes=None, filename=None,
+                      file_format='csv', decode_data=False):
         """Download data from a DIS stream.
 
         :param partititon_cursor: Data cursor, which needs to be
             obtained through the API for obtaining data cursors.
         :param max_fetch_bytes: Maximum number of bytes
             that can be obtained for each request.
-        :param filename: Path to the CSV file.
+        :param filename: Path to the file to write the records to.
+        :param file_format: Format of the file, ``csv``, ``jsonl`` or
+            ``parquet``, which requires `pyarrow`.
+        :param decode_data: Write the decoded payloads instead of their
+            base64 text into the file.
 
         :returns: a generator of
             (:class:`~otcextensions.sdk.dis.v2.data.Data`) instances
@@ -290,25 +304,37 @@ class Proxy(proxy.Proxy):
         params = {'partition-cursor': partititon_cursor}
         if max_fetch_bytes:
             params.update(max_fetch_bytes=max_fetch_bytes)
-        data = self._list(_data.Data, **params)
         if filename:
-            columns = (
-                'sequence_number',
-                'data',
-                'timestamp',
-                'timestamp_type',
-            )
-            with open(filename, 'w', encoding='UTF8', newline='') as f:
-                writer = csv.writer(f)
-                # write the header
-                writer.writerow(columns)
-                # write multiple rows
-                writer.writerows(
-                    (s.sequence_number, s.data, s.timestamp,
-                        s.timestamp_type) for s in data
-                )
+            # the raw records are written, no Data is built per record
+            records = sdk_resource.list_records(
+                _data.Data, self, lambda raw: raw, paginated=False,
+                **params)
+            _codec.write(records, filename, file_format=file_format,
+                         decode_data=decode_data)
         else:
-            return data
+            return self._list(_data.Data, **params)
+
+    def consumer(self, stream_name, app_name=None, **kwargs):
+        """Return a consumer iterating over all partitions of a stream
+
+        Unlike :meth:`download_data` the partitions are polled
+        concurrently and their cursors are followed automatically. With an
+        ``app_name`` reading continues after the checkpoints of the app,
+        which are updated while the records are consumed::
+
+            with conn.dis.consumer('clicks', app_name='etl') as consumer:
+                for partition_id, record in consumer:
+                    ...
+
+        :param stream_name: Name of the stream.
+        :param app_name: Name of the app keeping the checkpoints.
+        :param kwargs: Options of
+            :class:`~otcextensions.sdk.dis.v2._consumer.Consumer`.
+
+        :returns: A :class:`~otcextensions.sdk.dis.v2._consumer.Consumer`
+        """
+        return _consumer.Consumer(self, stream_name, app_name=app_name,
+                                  **kwargs)
 
     def get_data_cursor(self, stream_name, partition_id, **params):
         """Query data cursor.
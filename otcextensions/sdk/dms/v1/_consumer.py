@@ -0,0 +1,308 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import queue
+import random
+import threading
+
+from openstack import _log
+from openstack import exceptions
+
+from otcextensions.sdk import instrumentation
+from otcextensions.sdk.dms.v1 import message as _message
+
+_logger = _log.setup_logging('openstack')
+
+#: Number of handlers running concurrently
+DEFAULT_CONSUMER_WORKERS = 8
+#: Number of messages consumed and not acknowledged yet at most
+DEFAULT_PREFETCH = 100
+#: Number of messages requested at once at most, the API allows 10
+DEFAULT_MAX_MSGS = 10
+#: Seconds a request waits for messages, the API allows up to 60
+DEFAULT_TIME_WAIT = 20
+#: Number of acknowledgements sent in one request at most
+DEFAULT_ACK_BATCH_SIZE = 100
+#: Seconds an acknowledgement waits at most to be sent with others
+DEFAULT_ACK_INTERVAL = 1.0
+#: Number of consecutive failures before the consumer gives up
+DEFAULT_RETRIES = 5
+#: Seconds before the first retry, doubled for every further one
+DEFAULT_RETRY_INTERVAL = 1.0
+
+_STOP = object()
+
+
+class Consumer:
+    """Managed consumer of the messages of a DMS queue group
+
+    A fetch thread long-polls the group and fills a buffer which
+    ``workers`` threads pass to ``handler``, one message at a time. A
+    message is acknowledged as ``success`` once the handler returns and as
+    ``fail`` when it raises, so that DMS delivers it again. The
+    acknowledgements are collected and sent in batches of up to
+    ``ack_batch_size`` or after ``ack_interval`` seconds::
+
+        def handle(message):
+            process_order(message.body)
+
+        with conn.dms.consumer('orders', 'workers', handle) as consumer:
+            consumer.wait()
+
+    No more than ``prefetch`` messages are consumed and not acknowledged
+    at once, polling pauses while the handlers fall behind. Closing the
+    consumer stops polling, lets the handlers finish the buffered messages
+    and sends the remaining acknowledgements.
+
+    :param proxy: The DMS proxy.
+    :param queue_obj: The :class:`~otcextensions.sdk.dms.v1.queue.Queue`.
+    :param group_obj: The :class:`~otcextensions.sdk.dms.v1.group.Group`.
+    :param handler: Called with every
+        :class:`~otcextensions.sdk.dms.v1.message.Message` from a worker
+        thread.
+    :param int workers: Number of handlers running concurrently.
+    :param int prefetch: Number of messages consumed and not acknowledged
+        at most.
+    :param int max_msgs: Number of messages requested at once at most.
+    :param int time_wait: Seconds a request waits for messages when the
+        group has none.
+    :param int ack_wait: Seconds DMS waits for the acknowledgement of a
+        message before delivering it again, the default of the service
+        when not set.
+    :param int ack_batch_size: Number of acknowledgements per request at
+        most.
+    :param float ack_interval: Seconds an acknowledgement waits at most
+        for others.
+    :param int retries: Number of consecutive failures of polling after
+        which the consumer stops, and of an acknowledgement request after
+        which its acknowledgements are dropped.
+    :param float retry_interval: Seconds before the first retry, doubled
+        for every further one.
+    """
+
+    def __init__(self, proxy, queue_obj, group_obj, handler,
+                 workers=DEFAULT_CONSUMER_WORKERS, prefetch=DEFAULT_PREFETCH,
+                 max_msgs=DEFAULT_MAX_MSGS, time_wait=DEFAULT_TIME_WAIT,
+                 ack_wait=None, ack_batch_size=DEFAULT_ACK_BATCH_SIZE,
+                 ack_interval=DEFAULT_ACK_INTERVAL, retries=DEFAULT_RETRIES,
+                 retry_interval=DEFAULT_RETRY_INTERVAL):
+        self.proxy = proxy
+        self.queue = queue_obj
+        self.group = group_obj
+        self.handler = handler
+        self.prefetch = max(prefetch, 1)
+        self.max_msgs = max_msgs
+        self.time_wait = time_wait
+        self.ack_wait = ack_wait
+        self.ack_batch_size = ack_batch_size
+        self.ack_interval = ack_interval
+        self.retries = retries
+        self.retry_interval = retry_interval
+        #: Number of messages the handler returned for
+        self.processed = 0
+        #: Number of messages the handler raised for
+        self.failed = 0
+        #: Number of acknowledgements sent
+        self.acked = 0
+        #: The error polling stopped with
+        self.error = None
+        self._buffer = queue.Queue()
+        # messages consumed and not acknowledged yet
+        self._outstanding = 0
+        self._state = threading.Condition()
+        self._acks = []
+        self._ack_failures = 0
+        self._ack_lock = threading.Lock()
+        self._flush = threading.Event()
+        self._stop = threading.Event()
+        self._closed = False
+        self._fetcher = self._thread(self._fetch_loop)
+        self._workers = [self._thread(self._work)
+                         for _worker in range(workers)]
+        self._acker = self._thread(self._ack_loop)
+
+    def _thread(self, target):
+        thread = threading.Thread(target=target, name='otce-dms-consumer',
+                                  daemon=True)
+        thread.start()
+        return thread
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def wait(self, timeout=None):
+        """Wait until polling stops on :meth:`close` or an error
+
+        :returns: ``True`` unless polling continues after ``timeout``
+            seconds.
+        """
+        self._fetcher.join(timeout)
+        return not self._fetcher.is_alive()
+
+    def close(self, drain=True, timeout=None):
+        """Stop polling and send the remaining acknowledgements
+
+        A request in flight is waited for, which takes up to ``time_wait``
+        seconds.
+
+        :param bool drain: Handle the buffered messages first, otherwise
+            they are left to DMS to deliver again once their ``ack_wait``
+            passed.
+        :param float timeout: Seconds to wait for every thread at most.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._fetcher.join(timeout)
+        if not drain:
+            self._discard()
+        for _worker in self._workers:
+            self._buffer.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout)
+        self._flush.set()
+        self._acker.join(timeout)
+
+    def _discard(self):
+        while True:
+            try:
+                message = self._buffer.get_nowait()
+            except queue.Empty:
+                return
+            if message is not _STOP:
+                self._release(1)
+
+    def _release(self, count):
+        with self._state:
+            self._outstanding -= count
+            self._state.notify_all()
+
+    def _free(self):
+        # wait until the handlers caught up, returns the number of messages
+        # to request
+        with self._state:
+            while self._outstanding >= self.prefetch:
+                if self._stop.is_set():
+                    return 0
+                self._state.wait(0.1)
+            return min(self.max_msgs, self.prefetch - self._outstanding)
+
+    def _consume(self, count):
+        params = {'max_msgs': count, 'time_wait': self.time_wait}
+        if self.ack_wait:
+            params['ack_wait'] = self.ack_wait
+        response = self.proxy.get(
+            '/queues/%s/groups/%s/messages' % (self.queue.id, self.group.id),
+            params=params)
+        exceptions.raise_from_response(response)
+        return [_message.Message.existing(id=raw['handler'], **raw['message'])
+                for raw in response.json() or []]
+
+    def _fetch_loop(self):
+        failures = 0
+        while not self._stop.is_set():
+            count = self._free()
+            if not count:
+                continue
+            try:
+                messages = self._consume(count)
+            except Exception as e:
+                failures += 1
+                if failures > self.retries:
+                    _logger.error('Giving up consuming %s of %s: %s',
+                                  self.group.id, self.queue.id, e)
+                    self.error = e
+                    return
+                instrumentation.increment(
+                    'retries_total', service_type='dms',
+                    operation='consume_message')
+                self._backoff(failures)
+                continue
+            failures = 0
+            with self._state:
+                self._outstanding += len(messages)
+            for message in messages:
+                self._buffer.put(message)
+
+    def _backoff(self, failures):
+        delay = self.retry_interval * 2 ** (failures - 1)
+        self._stop.wait(delay / 2 + random.uniform(0, delay / 2))
+
+    def _work(self):
+        while True:
+            message = self._buffer.get()
+            if message is _STOP:
+                return
+            try:
+                self.handler(message)
+            except Exception:
+                _logger.exception('Error handling message %s of %s',
+                                  message.id, self.queue.id)
+                status = 'fail'
+            else:
+                status = 'success'
+            self._ack(message.id, status)
+
+    def _ack(self, handler, status):
+        with self._ack_lock:
+            self._acks.append((handler, status))
+            if status == 'success':
+                self.processed += 1
+            else:
+                self.failed += 1
+            if len(self._acks) >= self.ack_batch_size:
+                self._flush.set()
+
+    def _ack_loop(self):
+        while True:
+            self._flush.wait(self.ack_interval)
+            self._flush.clear()
+            with self._ack_lock:
+                acks, self._acks = self._acks, []
+            for start in range(0, len(acks), self.ack_batch_size):
+                self._send_acks(acks[start:start + self.ack_batch_size])
+            if self._closed and not any(w.is_alive() for w in self._workers):
+                with self._ack_lock:
+                    if not self._acks:
+                        return
+
+    def _send_acks(self, acks):
+        by_status = {}
+        for handler, status in acks:
+            by_status.setdefault(status, []).append(handler)
+        for status, handlers in by_status.items():
+            try:
+                self.group.ack(self.proxy, self.queue, handlers,
+                               status=status)
+            except Exception as e:
+                self._ack_failures += 1
+                if self._ack_failures > self.retries:
+                    # DMS delivers them again once their ack_wait passed
+                    _logger.error(
+                        'Dropping %d acknowledgements of %s: %s',
+                        len(handlers), self.queue.id, e)
+                    self._ack_failures = 0
+                else:
+                    instrumentation.increment(
+                        'retries_total', service_type='dms',
+                        operation='ack_message')
+                    with self._ack_lock:
+                        self._acks.extend(
+                            (handler, status) for handler in handlers)
+                    continue
+            else:
+                self._ack_failures = 0
+                self.acked += len(handlers)
+            self._release(len(handlers))
@@ -13,6 +13,8 @@
 from openstack import exceptions
 from openstack import proxy
 
+from otcextensions.sdk.dms.v1 import _consumer
+from otcextensions.sdk.dms.v1 import _sender
 from otcextensions.sdk.dms.v1 import az as _az
 from otcextensions.sdk.dms.v1 import group as _group
 from otcextensions.sdk.dms.v1 import instance as _instance
@@ -168,6 +170,32 @@ class Proxy(proxy.Proxy):
                             messages=messages_list,
                             return_id=return_id)
 
+    def bulk_send_messages(self, queue, messages, **kwargs):
+        """Send any number of messages in batches concurrently
+
+        Unlike :meth:`send_messages` the messages are consumed lazily, no
+        :class:`~otcextensions.sdk.dms.v1.message.Message` is built for a
+        message dict, and they are split into batches within the count and
+        size limits of a request. The batches are sent concurrently and
+        failed messages are sent again::
+
+            ids = conn.dms.bulk_send_messages(
+                queue, ({'body': row} for row in rows), workers=16)
+
+        :param queue: The queue id or an instance of
+            :class:`~otcextensions.sdk.dms.v1.queue.Queue`
+        :param messages: An iterable of message dictionaries or
+            :class:`~otcextensions.sdk.dms.v1.message.Message` instances
+        :param kwargs: ``batch_size``, ``batch_bytes``, ``workers``,
+            ``retries`` and ``retry_interval``, see
+            :func:`~otcextensions.sdk.dms.v1._sender.send_many`.
+        :returns: A list of the message ids in the order of the messages,
+            ``None`` for the messages which could not be sent
+        """
+        queue_obj = self._get_resource(_queue.Queue, queue)
+
+        return _sender.send_many(self, queue_obj.id, messages, **kwargs)
+
     def send_message(self, queue, return_id=True, body=None, **attrs):
         """Send single message into a given queue
 
@@ -227,6 +255,35 @@ class Proxy(proxy.Proxy):
 
         return group_obj.ack(self, queue_obj, messages, status=status)
 
+    def consumer(self, queue, group, handler, **kwargs):
+        """Return a consumer passing the messages of a group to a handler
+
+        Unlike :meth:`consume_message` the group is polled by a background
+        thread, the messages are handled by a pool of worker threads and
+        acknowledged in batches. Close the consumer to handle the buffered
+        messages and send the remaining acknowledgements::
+
+            with conn.dms.consumer(queue, group, handle) as consumer:
+                consumer.wait()
+
+        :param queue: The queue id or an instance of
+          :class:`~otcextensions.sdk.dms.v1.queue.Queue`
+        :param group: The consume group id or an instance of
+          :class:`~otcextensions.sdk.dms.v1.group.Group`
+        :param handler: Called with every
+          :class:`~otcextensions.sdk.dms.v1.message.Message`, which is
+          acknowledged as failed when it raises.
+        :param kwargs: Options of
+          :class:`~otcextensions.sdk.dms.v1._consumer.Consumer`.
+        :returns: A started
+          :class:`~otcextensions.sdk.dms.v1._consumer.Consumer`
+        """
+        queue_obj = self._get_resource(_queue.Queue, queue)
+        group_obj = self._get_resource(_group.Group, group)
+
+        return _consumer.Consumer(self, queue_obj, group_obj, handler,
+                                  **kwargs)
+
     # ======== Instances =======
     def instances(self, **kwargs):
         """List all DMS Instances
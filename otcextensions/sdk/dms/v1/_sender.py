@@ -0,0 +1,152 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+import random
+import time
+
+from openstack import _log
+from openstack import exceptions
+
+from otcextensions.sdk import bulk
+from otcextensions.sdk import instrumentation
+from otcextensions.sdk.dms.v1 import message as _message
+
+_logger = _log.setup_logging('openstack')
+
+#: Number of messages sent in one request at most, the API allows 10
+DEFAULT_BATCH_SIZE = 10
+#: Size of the messages sent in one request at most, the API allows 512KB
+DEFAULT_BATCH_BYTES = 512 * 1024
+#: Number of requests in flight at once
+DEFAULT_SENDER_WORKERS = 8
+#: Number of times failed messages are sent again
+DEFAULT_RETRIES = 3
+#: Seconds before the first retry, doubled for every further one
+DEFAULT_RETRY_INTERVAL = 0.5
+
+_dumps = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def _message_dict(message):
+    if isinstance(message, _message.Message):
+        return message.to_dict(computed=False, ignore_none=True)
+    return {key: value for key, value in message.items()
+            if value is not None}
+
+
+def batches(messages, batch_size=DEFAULT_BATCH_SIZE,
+            batch_bytes=DEFAULT_BATCH_BYTES):
+    """Yield lists of message dicts within the limits of a request
+
+    :param messages: An iterable of message dicts or
+        :class:`~otcextensions.sdk.dms.v1.message.Message` instances,
+        consumed lazily.
+    :param int batch_size: Number of messages per batch at most.
+    :param int batch_bytes: Size of the JSON of the messages per batch at
+        most. A larger single message is sent in a batch of its own.
+    """
+    batch = []
+    size = 0
+    for message in messages:
+        message = _message_dict(message)
+        # the comma separating it from the previous message
+        message_size = len(_dumps(message).encode('utf-8')) + 1
+        if batch and (len(batch) >= batch_size
+                      or size + message_size > batch_bytes):
+            yield batch
+            batch = []
+            size = 0
+        batch.append(message)
+        size += message_size
+    if batch:
+        yield batch
+
+
+def _post(proxy, queue_id, batch):
+    response = proxy.post('/queues/%s/messages' % queue_id,
+                          json={'messages': batch, 'returnId': True})
+    exceptions.raise_from_response(response)
+    return response.json().get('messages') or []
+
+
+def send_batch(proxy, queue_id, batch, retries=DEFAULT_RETRIES,
+               retry_interval=DEFAULT_RETRY_INTERVAL):
+    """Send a batch of messages and return their ids in order
+
+    Messages the response marks as failed are sent again, whole batches
+    when the request fails, at most ``retries`` times. Messages given up
+    have ``None`` for an id.
+    """
+    ids = [None] * len(batch)
+    pending = list(range(len(batch)))
+    attempt = 0
+    while True:
+        try:
+            results = _post(proxy, queue_id, [batch[i] for i in pending])
+        except Exception as e:
+            _logger.debug('Failed to send %d messages to %s: %s',
+                          len(pending), queue_id, e)
+            results = []
+        failed = []
+        for index, position in enumerate(pending):
+            result = results[index] if index < len(results) else {}
+            if result.get('id') and not result.get('error_code'):
+                ids[position] = result['id']
+            else:
+                failed.append(position)
+        if not failed:
+            return ids
+        if attempt >= retries:
+            _logger.warning('Giving up %d messages of %s',
+                            len(failed), queue_id)
+            return ids
+        pending = failed
+        attempt += 1
+        instrumentation.increment(
+            'retries_total', service_type='dms', operation='send_messages')
+        delay = retry_interval * 2 ** (attempt - 1)
+        time.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+
+def send_many(proxy, queue_id, messages, batch_size=DEFAULT_BATCH_SIZE,
+              batch_bytes=DEFAULT_BATCH_BYTES,
+              workers=DEFAULT_SENDER_WORKERS, retries=DEFAULT_RETRIES,
+              retry_interval=DEFAULT_RETRY_INTERVAL):
+    """Send messages in batches concurrently
+
+    :param proxy: The DMS proxy.
+    :param str queue_id: ID of the queue.
+    :param messages: An iterable of message dicts or
+        :class:`~otcextensions.sdk.dms.v1.message.Message` instances,
+        consumed lazily.
+    :param int batch_size: Number of messages per request at most.
+    :param int batch_bytes: Size of the messages per request at most.
+    :param int workers: Number of requests in flight at once.
+    :param int retries: Number of times failed messages are sent again.
+    :param float retry_interval: Seconds before the first retry, doubled
+        for every further one.
+
+    :returns: A list of the message ids in the order of the messages,
+        ``None`` for the messages given up.
+    """
+    ids = []
+    # iterated to let go of every batch once it is sent
+    for batch, batch_ids, error in bulk.iter_many(
+            lambda batch: send_batch(proxy, queue_id, batch, retries,
+                                     retry_interval),
+            batches(messages, batch_size, batch_bytes), workers):
+        if error is not None:
+            _logger.warning('Failed to send %d messages to %s: %s',
+                            len(batch), queue_id, error)
+            batch_ids = [None] * len(batch)
+        ids.extend(batch_ids)
+    return ids
@@ -11,13 +11,16 @@
 # under the License.
 from openstack import proxy
 from openstack import resource
+from otcextensions.sdk import bulk
+from otcextensions.sdk import find_cache
 from otcextensions.sdk.dns.v2 import nameserver as _ns
 from otcextensions.sdk.dns.v2 import recordset as _rs
 from otcextensions.sdk.dns.v2 import zone as _zone
 from otcextensions.sdk.dns.v2 import floating_ip as _fip
 
 
-class Proxy(proxy.Proxy):
+class Proxy(find_cache.FindCacheProxyMixin, bulk.BulkProxyMixin,
+            proxy.Proxy):
 
     # ======== Zones ========
     def zones(self, **query):
@@ -100,6 +103,18 @@ class Proxy(proxy.Proxy):
                           ignore_missing=ignore_missing,
                           **attrs)
 
+    def resolve_zones(self, names, **query):
+        """Resolve zone names to ids with a single listing
+
+        :param names: Names or IDs of zones.
+        :param dict query: Optional query parameters of the listing, such
+            as `zone_type`.
+
+        :returns: A dict of the given names to zone IDs, names no zone
+            matches are left out.
+        """
+        return self._resolve(_zone.Zone, names, **query)
+
     def add_router_to_zone(self, zone, **router):
         """Add router(VPC) to private zone
 
@@ -266,6 +281,63 @@ class Proxy(proxy.Proxy):
         return self._delete(_rs.Recordset, recordset,
                             ignore_missing=ignore_missing)
 
+    def get_recordsets(self, recordsets, zone,
+                       workers=bulk.DEFAULT_BULK_WORKERS):
+        """Get many recordsets of a zone concurrently
+
+        :param recordsets: An iterable of IDs of recordsets or
+             :class:`~otcextensions.sdk.dns.v2.recordset.Recordset`
+             instances.
+        :param zone: The value can be the ID of a zone
+             or a :class:`~otcextensions.sdk.dns.v2.zone.Zone` instance.
+        :param int workers: Number of recordsets fetched concurrently.
+
+        :returns: A list of ``(recordset, result, error)`` tuples in the
+            order of ``recordsets``, where ``result`` is the fetched
+            :class:`~otcextensions.sdk.dns.v2.recordset.Recordset` or
+            ``None`` if fetching it raised ``error``.
+        """
+        zone = self._get_resource(_zone.Zone, zone)
+        return self._get_many(_rs.Recordset, recordsets, workers=workers,
+                              zone_id=zone.id)
+
+    def update_recordsets(self, updates, workers=bulk.DEFAULT_BULK_WORKERS):
+        """Update many recordsets concurrently
+
+        :param updates: An iterable of ``(recordset, attrs)`` pairs of a
+            :class:`~otcextensions.sdk.dns.v2.recordset.Recordset` and
+            the attributes to update on it.
+        :param int workers: Number of recordsets updated concurrently.
+
+        :returns: A list of ``((recordset, attrs), result, error)`` tuples
+            in the order of ``updates``.
+        """
+        return self._update_many(_rs.Recordset, updates, workers=workers)
+
+    def delete_recordsets(self, recordsets, zone=None, ignore_missing=True,
+                          workers=bulk.DEFAULT_BULK_WORKERS):
+        """Delete many recordsets concurrently
+
+        :param recordsets: An iterable of
+             :class:`~otcextensions.sdk.dns.v2.recordset.Recordset`
+             instances, or of IDs of recordsets of ``zone``.
+        :param zone: The value can be the ID of a zone
+             or a :class:`~otcextensions.sdk.dns.v2.zone.Zone` instance.
+        :param bool ignore_missing: When set to ``False`` a nonexistent
+            recordset is reported with a
+            :class:`~openstack.exceptions.ResourceNotFound` error.
+        :param int workers: Number of recordsets deleted concurrently.
+
+        :returns: A list of ``(recordset, result, error)`` tuples in the
+            order of ``recordsets``.
+        """
+        attrs = {}
+        if zone:
+            attrs['zone_id'] = self._get_resource(_zone.Zone, zone).id
+        return self._delete_many(_rs.Recordset, recordsets,
+                                 ignore_missing=ignore_missing,
+                                 workers=workers, **attrs)
+
     def find_recordset(self, zone, name_or_id, ignore_missing=True, **attrs):
         """Find a single recordset
 
@@ -285,6 +357,20 @@ class Proxy(proxy.Proxy):
                           ignore_missing=ignore_missing, zone_id=zone.id,
                           **attrs)
 
+    def resolve_recordsets(self, zone, names, **query):
+        """Resolve recordset names of a zone to ids with a single listing
+
+        :param zone: The value can be the ID of a zone
+             or a :class:`~otcextensions.sdk.dns.v2.zone.Zone` instance.
+        :param names: Names or IDs of recordsets.
+        :param dict query: Optional query parameters of the listing.
+
+        :returns: A dict of the given names to recordset IDs, names no
+            recordset matches are left out.
+        """
+        zone = self._get_resource(_zone.Zone, zone)
+        return self._resolve(_rs.Recordset, names, zone_id=zone.id, **query)
+
     def wait_for_recordset(self, recordset, status='ACTIVE', failures=None,
                            interval=2, wait=180, attribute='status'):
         """Wait for an recordset to be in a particular status.
@@ -12,6 +12,9 @@
 import urllib
 from openstack import exceptions
 
+from otcextensions.sdk import find_cache
+from otcextensions.sdk import sdk_resource
+
 
 class DNSProxyMixin:
 
@@ -39,6 +42,15 @@ class DNSProxyMixin:
                  is found and ignore_missing is ``False``.
         """
         session = cls._get_session(session)
+        return find_cache.find(
+            cls, session, name_or_id,
+            lambda: cls._find_uncached(
+                session, name_or_id, ignore_missing, **params),
+            **params)
+
+    @classmethod
+    def _find_uncached(cls, session, name_or_id, ignore_missing=True,
+                       **params):
         # Try to short-circuit by looking directly for a matching ID.
         try:
             match = cls.existing(
@@ -65,6 +77,26 @@ class DNSProxyMixin:
         raise exceptions.ResourceNotFound(
             "No %s found for %s" % (cls.__name__, name_or_id))
 
+    @classmethod
+    def list(cls, session, paginated=True, base_path=None,
+             allow_unknown_params=False, raw=False, fields=None, **params):
+        """This method is a generator which yields resource objects.
+
+        :param bool raw: Yield compact
+            :class:`~otcextensions.sdk.sdk_resource.Record` objects instead
+            of resources.
+        :param fields: Yield tuples of the given attributes instead of
+            resources.
+        """
+        build = sdk_resource.record_factory(cls, raw, fields)
+        if build is None:
+            return super(DNSProxyMixin, cls).list(
+                session, paginated=paginated, base_path=base_path,
+                allow_unknown_params=allow_unknown_params, **params)
+        return sdk_resource.list_records(
+            cls, session, build, paginated=paginated, base_path=base_path,
+            allow_unknown_params=allow_unknown_params, **params)
+
     @classmethod
     def _get_next_link(cls, uri, response, data, marker, limit, total_yielded):
         next_link = None
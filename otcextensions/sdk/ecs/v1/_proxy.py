@@ -11,7 +11,9 @@
 # under the License.
 from openstack import proxy
 
+from otcextensions.sdk import bulk
 
-class Proxy(proxy.Proxy):
+
+class Proxy(bulk.BulkProxyMixin, proxy.Proxy):
 
     skip_discovery = True
@@ -0,0 +1,214 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import inspect
+import threading
+import time
+import weakref
+
+from openstack import exceptions
+
+from otcextensions.sdk import sdk_resource
+
+#: Seconds a name to id resolution is reused
+DEFAULT_TTL = 300
+
+_CACHES = weakref.WeakKeyDictionary()
+_CACHES_LOCK = threading.Lock()
+
+
+class NameCache:
+    """Name to id resolutions of ``find`` with a time to live
+
+    Entries are keyed by the resource type, the find parameters (URI
+    parameters and filters) and the name. Creating or deleting a resource
+    through a proxy drops all entries of its type. A ttl of 0 disables
+    the cache.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(resource_type, name, params):
+        return (resource_type, name,
+                tuple(sorted((k, str(v)) for k, v in params.items())))
+
+    def get(self, resource_type, name, params):
+        key = self._key(resource_type, name, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            resource_id, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            return resource_id
+
+    def set(self, resource_type, name, resource_id, params):
+        if not self.ttl:
+            return
+        key = self._key(resource_type, name, params)
+        with self._lock:
+            self._entries[key] = (resource_id, time.monotonic() + self.ttl)
+
+    def discard(self, resource_type, name, params):
+        """Drop the entry of a single name"""
+        key = self._key(resource_type, name, params)
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, resource_type=None):
+        """Drop the entries of resource_type, or all of them"""
+        with self._lock:
+            if resource_type is None:
+                self._entries.clear()
+            else:
+                self._entries = {
+                    key: entry for key, entry in self._entries.items()
+                    if key[0] is not resource_type}
+
+
+def get_cache(session):
+    """Return the name cache of the connection a proxy belongs to"""
+    get_connection = getattr(session, '_get_connection', None)
+    owner = (get_connection() if get_connection else None) or session
+    with _CACHES_LOCK:
+        try:
+            cache = _CACHES.get(owner)
+            if cache is None:
+                cache = _CACHES[owner] = NameCache()
+        except TypeError:
+            # not weak referenceable, nothing to attach the cache to
+            cache = NameCache(ttl=0)
+    return cache
+
+
+def _revalidate(resource_type, session, resource_id, **params):
+    get_connection = getattr(session, '_get_connection', None)
+    res = resource_type.existing(
+        id=resource_id,
+        connection=get_connection() if get_connection else None,
+        **params)
+    if isinstance(res, sdk_resource.Resource) and res.allow_get:
+        return res.get(session)
+    return res.fetch(session)
+
+
+def find(resource_type, session, name_or_id, finder, **params):
+    """Find a resource through the name cache of the session
+
+    When the name was resolved before, the resource is fetched by its id
+    directly. Otherwise ``finder`` is called without arguments and the id
+    of a resource it found by name is cached. Resources which can not be
+    fetched by id are always found by ``finder``.
+
+    A cached name is not checked for duplicates again: another resource
+    created with the same name within the ttl is not detected.
+    """
+    if not resource_type.allow_fetch:
+        return finder()
+    cache = get_cache(session)
+    resource_id = cache.get(resource_type, name_or_id, params)
+    if resource_id is not None:
+        try:
+            result = _revalidate(
+                resource_type, session, resource_id, **params)
+        except (exceptions.NotFoundException,
+                exceptions.MethodNotSupported):
+            cache.discard(resource_type, name_or_id, params)
+        except exceptions.HttpException:
+            # i.e. a transient error, the entry may still be valid
+            pass
+        else:
+            if result.name == name_or_id:
+                return result
+            cache.discard(resource_type, name_or_id, params)
+
+    result = finder()
+    if result is not None and result.id != name_or_id:
+        cache.set(resource_type, name_or_id, result.id, params)
+    return result
+
+
+def resolve(resource_type, session, names, **params):
+    """Resolve names (or ids) to ids with a single listing
+
+    :param names: Names or ids of resources of resource_type.
+    :param dict params: Parameters of the listing, such as URI parameters
+        or filters.
+
+    :returns: A dict of the given names to ids. Names nothing matches are
+        left out.
+    :raises: :class:`openstack.exceptions.DuplicateResource` if more than
+        one resource matches a name.
+    """
+    cache = get_cache(session)
+    result = {}
+    for name in set(names):
+        resource_id = cache.get(resource_type, name, params)
+        if resource_id is not None:
+            result[name] = resource_id
+    missing = set(names) - set(result)
+    if not missing:
+        return result
+
+    if 'fields' in inspect.signature(resource_type.list).parameters:
+        listing = resource_type.list(
+            session, fields=('id', 'name'), **params)
+    else:
+        listing = ((res.id, res.name)
+                   for res in resource_type.list(session, **params))
+
+    by_name = {}
+    for resource_id, name in listing:
+        if resource_id in missing:
+            result[resource_id] = resource_id
+        if name in missing:
+            if by_name.get(name, resource_id) != resource_id:
+                raise exceptions.DuplicateResource(
+                    "More than one %s exists with the name '%s'."
+                    % (resource_type.__name__, name))
+            by_name[name] = resource_id
+
+    for name, resource_id in by_name.items():
+        if name not in result:
+            result[name] = resource_id
+            cache.set(resource_type, name, resource_id, params)
+    return result
+
+
+class FindCacheProxyMixin:
+    """Keep the name cache of a proxy consistent with its changes
+
+    Mixed in before :class:`openstack.proxy.Proxy`, creating or deleting a
+    resource drops the cached names of its type.
+    """
+
+    def _create(self, resource_type, *args, **kwargs):
+        result = super(FindCacheProxyMixin, self)._create(
+            resource_type, *args, **kwargs)
+        get_cache(self).invalidate(resource_type)
+        return result
+
+    def _delete(self, resource_type, *args, **kwargs):
+        try:
+            return super(FindCacheProxyMixin, self)._delete(
+                resource_type, *args, **kwargs)
+        finally:
+            get_cache(self).invalidate(resource_type)
+
+    def _resolve(self, resource_type, names, **attrs):
+        """Resolve names of resource_type to ids with one listing"""
+        return resolve(resource_type, self, names, **attrs)
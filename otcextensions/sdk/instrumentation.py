@@ -0,0 +1,359 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""In-process instrumentation of the API calls
+
+Disabled by default, once enabled every request of the proxies is
+recorded into a :class:`Registry`::
+
+    from otcextensions.sdk import instrumentation
+
+    registry = instrumentation.enable()
+    ...
+    for entry in registry.snapshot()[:10]:
+        print(entry['name'], entry['labels'], entry['sum'], entry['p99'])
+    print(registry.to_prometheus())
+
+The registry holds
+
+* ``request_duration_seconds``: histogram per ``service_type``,
+  ``method`` and ``endpoint``, the URL path with the project and resource
+  ids replaced by ``{project_id}`` and ``{id}``,
+* ``requests_total``: counter per ``service_type``, ``method``,
+  ``endpoint`` and ``status_code``, which is ``error`` for requests
+  failed without a response,
+* ``request_bytes_total`` and ``response_bytes_total``: counters of the
+  ``Content-Length`` sent and received per ``service_type``,
+* ``pages_total``: counter of listing pages per ``service_type`` and
+  ``resource``,
+* ``retries_total``: counter of requests repeated by the SDK per
+  ``service_type`` and ``operation``,
+* ``signing_duration_seconds``: histogram of the AK/SK request signing
+  per ``service``.
+"""
+import threading
+import time
+
+#: Significant bits of the histogram buckets, the relative error of a
+#: recorded value is below ``2 ** -DEFAULT_PRECISION_BITS``
+DEFAULT_PRECISION_BITS = 6
+#: Bucket upper bounds in seconds of the exported Prometheus histograms
+DEFAULT_PROMETHEUS_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+    60.0)
+#: Prefix of the exported Prometheus metric names
+DEFAULT_PROMETHEUS_PREFIX = 'otce_'
+
+_HELP = {
+    'request_duration_seconds': 'Duration of the API requests.',
+    'requests_total': 'Number of API requests.',
+    'request_bytes_total': 'Bytes sent in API request bodies.',
+    'response_bytes_total': 'Bytes received in API response bodies.',
+    'pages_total': 'Number of listing pages requested.',
+    'retries_total': 'Number of requests repeated by the SDK.',
+    'signing_duration_seconds': 'Duration of the AK/SK request signing.',
+}
+
+_REGISTRY = None
+
+
+class Histogram:
+    """Latency histogram with buckets of bounded relative error
+
+    Like an HDR histogram values are counted in microseconds in buckets
+    whose width grows with the value, so that every bucket is at most
+    ``2 ** -precision_bits`` of its lower bound wide. Recording is cheap
+    and independent of the range of the values.
+    """
+
+    def __init__(self, precision_bits=DEFAULT_PRECISION_BITS):
+        self._exact = 2 << precision_bits
+        self._bits = precision_bits + 1
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def _lower_bound(self, micros):
+        if micros < self._exact:
+            return micros
+        shift = micros.bit_length() - self._bits
+        return (micros >> shift) << shift
+
+    def _upper_bound(self, lower):
+        if lower < self._exact:
+            return lower
+        return lower + (1 << (lower.bit_length() - self._bits)) - 1
+
+    def record(self, seconds):
+        """Record a value in seconds"""
+        lower = self._lower_bound(max(int(seconds * 1000000), 0))
+        with self._lock:
+            self._counts[lower] = self._counts.get(lower, 0) + 1
+            self.count += 1
+            self.sum += seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+            if self.max is None or seconds > self.max:
+                self.max = seconds
+
+    def buckets(self):
+        """Return the ``(upper bound in seconds, count)`` of the buckets"""
+        with self._lock:
+            counts = sorted(self._counts.items())
+        return [(self._upper_bound(lower) / 1000000.0, count)
+                for lower, count in counts]
+
+    def percentile(self, percent):
+        """Return the value below which ``percent`` of the values are
+
+        :returns: The upper bound of the bucket of the value in seconds or
+            ``None`` when nothing is recorded.
+        """
+        buckets = self.buckets()
+        total = sum(count for _bound, count in buckets)
+        if not total:
+            return None
+        rank = max(percent / 100.0 * total, 1)
+        seen = 0
+        for bound, count in buckets:
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self, bounds):
+        """Return the number of values up to each of the bounds"""
+        buckets = self.buckets()
+        result = []
+        index = seen = 0
+        for bound in bounds:
+            while index < len(buckets) and buckets[index][0] <= bound:
+                seen += buckets[index][1]
+                index += 1
+            result.append(seen)
+        return result
+
+
+class Registry:
+    """Histograms and counters of the instrumented calls
+
+    :param tracer: An OpenTelemetry tracer, when set every request is
+        also reported as a client span.
+    :param int precision_bits: Precision of the histograms.
+    """
+
+    def __init__(self, tracer=None, precision_bits=DEFAULT_PRECISION_BITS):
+        self.tracer = tracer
+        self.precision_bits = precision_bits
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(
+            (key, '' if value is None else str(value))
+            for key, value in labels.items()))
+
+    def observe(self, name, seconds, **labels):
+        """Record a duration into the histogram of name and labels"""
+        key = self._key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    key, Histogram(self.precision_bits))
+        histogram.record(seconds)
+
+    def increment(self, name, value=1, **labels):
+        """Add value to the counter of name and labels"""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def histogram(self, name, **labels):
+        """Return the histogram of name and labels or ``None``"""
+        return self._histograms.get(self._key(name, labels))
+
+    def counter(self, name, **labels):
+        """Return the value of the counter of name and labels"""
+        return self._counters.get(self._key(name, labels), 0)
+
+    def histograms(self, name=None):
+        """Return ``(name, labels, histogram)`` of all or named histograms"""
+        with self._lock:
+            items = list(self._histograms.items())
+        return [(key[0], dict(key[1]), histogram)
+                for key, histogram in sorted(items, key=lambda i: i[0])
+                if name is None or key[0] == name]
+
+    def counters(self, name=None):
+        """Return ``(name, labels, value)`` of all or named counters"""
+        with self._lock:
+            items = list(self._counters.items())
+        return [(key[0], dict(key[1]), value)
+                for key, value in sorted(items)
+                if name is None or key[0] == name]
+
+    def snapshot(self):
+        """Return the histograms as dicts, the most time consuming first
+
+        Every dict has the ``name``, ``labels``, ``count``, ``sum``,
+        ``min``, ``max``, ``p50``, ``p90`` and ``p99`` of a histogram,
+        durations are in seconds.
+        """
+        result = []
+        for name, labels, histogram in self.histograms():
+            result.append(dict(
+                name=name, labels=labels, count=histogram.count,
+                sum=histogram.sum, min=histogram.min, max=histogram.max,
+                p50=histogram.percentile(50), p90=histogram.percentile(90),
+                p99=histogram.percentile(99)))
+        result.sort(key=lambda entry: entry['sum'], reverse=True)
+        return result
+
+    def reset(self):
+        """Forget everything recorded"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def report_request(self, service_type, method, endpoint,
+                       status_code=None, duration=None, bytes_sent=None,
+                       bytes_received=None):
+        """Record an API request
+
+        :param str endpoint: The URL path template of the request.
+        :param status_code: Status of the response, ``None`` when the
+            request failed without one.
+        :param float duration: Time until the response in seconds.
+        """
+        labels = dict(service_type=service_type, method=method,
+                      endpoint=endpoint)
+        self.increment(
+            'requests_total',
+            status_code='error' if status_code is None else status_code,
+            **labels)
+        if duration is not None:
+            self.observe('request_duration_seconds', duration, **labels)
+        if bytes_sent:
+            self.increment('request_bytes_total', bytes_sent,
+                           service_type=service_type)
+        if bytes_received:
+            self.increment('response_bytes_total', bytes_received,
+                           service_type=service_type)
+        if self.tracer is not None and duration is not None:
+            end = time.time_ns()
+            attributes = {
+                'http.method': method,
+                'http.route': endpoint,
+                'otc.service_type': service_type,
+            }
+            if status_code is not None:
+                attributes['http.status_code'] = int(status_code)
+            span = self.tracer.start_span(
+                '%s %s' % (method, endpoint),
+                start_time=end - int(duration * 1000000000),
+                attributes=attributes)
+            span.end(end_time=end)
+
+    def to_prometheus(self, prefix=DEFAULT_PROMETHEUS_PREFIX,
+                      buckets=DEFAULT_PROMETHEUS_BUCKETS):
+        """Return the metrics in the Prometheus text exposition format
+
+        The bucket counts are exact up to the precision of the histograms.
+        """
+        lines = []
+        described = set()
+
+        def _describe(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in _HELP:
+                    lines.append(
+                        '# HELP %s%s %s' % (prefix, name, _HELP[name]))
+                lines.append('# TYPE %s%s %s' % (prefix, name, kind))
+
+        for name, labels, histogram in self.histograms():
+            _describe(name, 'histogram')
+            counts = histogram.cumulative(buckets)
+            for bound, count in zip(buckets, counts):
+                lines.append('%s%s_bucket%s %d' % (
+                    prefix, name, _labels(labels, le=repr(bound)), count))
+            lines.append('%s%s_bucket%s %d' % (
+                prefix, name, _labels(labels, le='+Inf'), histogram.count))
+            lines.append('%s%s_sum%s %r' % (
+                prefix, name, _labels(labels), histogram.sum))
+            lines.append('%s%s_count%s %d' % (
+                prefix, name, _labels(labels), histogram.count))
+        for name, labels, value in self.counters():
+            _describe(name, 'counter')
+            lines.append('%s%s%s %r' % (prefix, name, _labels(labels), value))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+def _labels(labels, **extra):
+    items = list(labels.items()) + list(extra.items())
+    if not items:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (key, _escape(value)) for key, value in items)
+
+
+def enable(registry=None, tracer=None):
+    """Start recording the API calls
+
+    :param registry: The :class:`Registry` to record into, a new one by
+        default.
+    :param tracer: An OpenTelemetry tracer to report the requests to.
+
+    :returns: The registry.
+    """
+    global _REGISTRY
+    if registry is None:
+        registry = Registry(tracer=tracer)
+    elif tracer is not None:
+        registry.tracer = tracer
+    _REGISTRY = registry
+    return registry
+
+
+def disable():
+    """Stop recording the API calls"""
+    global _REGISTRY
+    _REGISTRY = None
+
+
+def get_registry():
+    """Return the registry recorded into or ``None`` when disabled"""
+    return _REGISTRY
+
+
+def observe(name, seconds, **labels):
+    """Record a duration when the instrumentation is enabled"""
+    registry = _REGISTRY
+    if registry is not None:
+        registry.observe(name, seconds, **labels)
+
+
+def increment(name, value=1, **labels):
+    """Add to a counter when the instrumentation is enabled"""
+    registry = _REGISTRY
+    if registry is not None:
+        registry.increment(name, value, **labels)
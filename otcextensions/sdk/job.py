@@ -9,9 +9,28 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import concurrent.futures
+import heapq
+import random
+import time
+
+from openstack import _log
 from openstack import exceptions
 from openstack import resource
 
+from otcextensions.sdk import instrumentation
+
+_logger = _log.setup_logging('openstack')
+
+#: Seconds before a job is polled the second time. Every further poll
+#: doubles the interval up to DEFAULT_MAX_POLL_INTERVAL.
+DEFAULT_POLL_INTERVAL = 2
+DEFAULT_MAX_POLL_INTERVAL = 30
+#: Number of jobs fetched concurrently by wait_for_jobs
+DEFAULT_POLL_WORKERS = 8
+#: Number of consecutive failed polls of a job before wait_for_jobs gives up
+DEFAULT_POLL_RETRIES = 3
+
 
 class Job(resource.Resource):
 
@@ -93,7 +112,156 @@ class JobProxyMixin(object):
         else:
             failures = ['FAIL'] if failures is None else failures
 
-        job = Job.existing(id=job_id).fetch(self)
-        return resource.wait_for_status(
-            self, job, status, failures, interval, wait, attribute='status'
-        )
+        return wait_for_job(
+            self, Job.existing(id=job_id), status, failures,
+            interval=interval, wait=wait)
+
+    def wait_for_jobs(self, job_ids, status='success', failures=None,
+                      interval=DEFAULT_POLL_INTERVAL,
+                      max_interval=DEFAULT_MAX_POLL_INTERVAL, wait=3600,
+                      attribute='status', callback=None):
+        """Wait for many jobs, yielding each one as soon as it finished
+
+        See :func:`wait_for_jobs`, the jobs are fetched by ID.
+        """
+        if self.service_type == 'rdsv3':
+            status = 'completed'
+            failures = ['failed']
+        else:
+            failures = ['FAIL'] if failures is None else failures
+
+        return wait_for_jobs(
+            self, [Job.existing(id=job_id) for job_id in job_ids],
+            status, failures, interval=interval, max_interval=max_interval,
+            wait=wait, attribute=attribute, callback=callback)
+
+
+def _backoff(delay):
+    """Return the delay with up to half of it replaced by jitter"""
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _fetch(session, job):
+    try:
+        return job.fetch(session), None
+    except Exception as e:
+        return job, e
+
+
+def wait_for_job(session, job, status, failures,
+                 interval=DEFAULT_POLL_INTERVAL,
+                 max_interval=DEFAULT_MAX_POLL_INTERVAL, wait=3600,
+                 attribute='status', retries=DEFAULT_POLL_RETRIES):
+    """Wait for a single job to finish
+
+    The job is polled like by :func:`wait_for_jobs`, the polling interval
+    starts at ``interval`` seconds and grows up to ``max_interval``.
+
+    :return: The finished job.
+    :raises: :class:`~openstack.exceptions.ResourceFailure` if the job
+        transitioned to one of the ``failures``.
+    :raises: :class:`~openstack.exceptions.ResourceTimeout` if the job is
+        still running after ``wait`` seconds.
+    """
+    for finished in wait_for_jobs(
+            session, [job], status, failures, interval=interval,
+            max_interval=max(interval, max_interval), wait=wait,
+            attribute=attribute, retries=retries, workers=1):
+        current = getattr(finished, attribute)
+        if str(current).lower() != status.lower():
+            raise exceptions.ResourceFailure(
+                "%s:%s transitioned to failure state %s" % (
+                    finished.__class__.__name__, finished.id, current))
+        return finished
+
+
+def wait_for_jobs(session, jobs, status, failures,
+                  interval=DEFAULT_POLL_INTERVAL,
+                  max_interval=DEFAULT_MAX_POLL_INTERVAL, wait=3600,
+                  attribute='status', callback=None,
+                  workers=DEFAULT_POLL_WORKERS,
+                  retries=DEFAULT_POLL_RETRIES):
+    """Wait for many jobs, yielding each one as soon as it finished
+
+    Every job is polled on its own schedule: right away, then after
+    ``interval`` seconds, doubling the interval up to ``max_interval``.
+    Half of every interval is randomized so that jobs started together do
+    not keep polling in lockstep. Jobs due at the same time are fetched
+    concurrently by up to ``workers`` threads. A job which fails to be
+    fetched is polled again on its next turn, the error is raised once
+    fetching it failed ``retries`` times in a row.
+
+    :param session: The session to use for making the requests.
+    :param jobs: Job resources to wait for.
+    :param status: Status a finished job reaches.
+    :param list failures: Statuses of a failed job. Failed jobs are
+        yielded as well, their ``attribute`` tells them apart.
+    :param wait: Maximum number of seconds to wait for all jobs. Set to
+        ``None`` to wait forever.
+    :param attribute: Name of the job attribute holding the status.
+    :param callback: Called with every finished job before it is yielded.
+    :param int workers: Number of jobs fetched concurrently.
+    :param int retries: Number of consecutive failed polls of a job which
+        are retried.
+
+    :return: A generator of the finished jobs in the order they finished.
+    :raises: :class:`~openstack.exceptions.ResourceTimeout` if jobs are
+        still running after ``wait`` seconds.
+    :raises: The error of the last poll of a job that failed to be fetched
+        more than ``retries`` times in a row.
+    """
+    status = status.lower()
+    failures = [failure.lower() for failure in failures or []]
+    now = time.monotonic()
+    deadline = None if wait is None else now + wait
+    # (due time, sequence, job, current interval, consecutive errors)
+    schedule = [(now, sequence, job, interval, 0)
+                for sequence, job in enumerate(jobs)]
+    heapq.heapify(schedule)
+
+    executor = concurrent.futures.ThreadPoolExecutor(workers)
+    try:
+        while schedule:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise exceptions.ResourceTimeout(
+                    "Timeout waiting for jobs %s to transition to %s" % (
+                        ', '.join(str(entry[2].id) for entry in schedule),
+                        status))
+            due = []
+            while schedule and schedule[0][0] <= now:
+                due.append(heapq.heappop(schedule))
+            if not due:
+                next_poll = schedule[0][0]
+                if deadline is not None:
+                    next_poll = min(next_poll, deadline)
+                time.sleep(next_poll - now)
+                continue
+
+            fetched = executor.map(
+                lambda entry: _fetch(session, entry[2]), due)
+            for (_due, sequence, _job, delay, errors), (job, error) in zip(
+                    due, fetched):
+                if error is not None:
+                    errors += 1
+                    if errors > retries:
+                        raise error
+                    _logger.debug('Failed to poll job %s, retrying: %s',
+                                  job.id, error)
+                    instrumentation.increment(
+                        'retries_total', service_type=getattr(
+                            session, 'service_type', None),
+                        operation='wait_for_jobs')
+                else:
+                    errors = 0
+                    current = str(getattr(job, attribute)).lower()
+                    if current == status or current in failures:
+                        if callback:
+                            callback(job)
+                        yield job
+                        continue
+                heapq.heappush(schedule, (
+                    time.monotonic() + _backoff(delay), sequence, job,
+                    min(delay * 2, max_interval), errors))
+    finally:
+        executor.shutdown(wait=False)
@@ -0,0 +1,126 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import atexit
+import queue
+import threading
+import time
+import weakref
+
+from openstack import _log
+
+_logger = _log.setup_logging('openstack')
+
+#: Number of metrics queued at most, further ones are dropped
+DEFAULT_QUEUE_SIZE = 10000
+#: Number of metrics written at once
+DEFAULT_BATCH_SIZE = 500
+#: Seconds a batch is collected at most before it is written
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+_BUFFERS = weakref.WeakKeyDictionary()
+_BUFFERS_LOCK = threading.Lock()
+
+
+class MetricsBuffer:
+    """Bounded queue of metrics written in batches by a daemon thread
+
+    ``put`` never blocks the request being reported: when the queue is
+    full the metric is dropped and counted in ``dropped``. The thread is
+    started with the first metric and writes a batch once ``batch_size``
+    metrics are queued or ``interval`` seconds after the first one of the
+    batch arrived.
+
+    :param write: Called with a list of queued metrics.
+    """
+
+    def __init__(self, write, max_size=DEFAULT_QUEUE_SIZE,
+                 batch_size=DEFAULT_BATCH_SIZE,
+                 interval=DEFAULT_FLUSH_INTERVAL):
+        self._write = write
+        self._queue = queue.Queue(max_size)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, metric):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(metric)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='otce-metrics', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._send(batch)
+
+    def _send(self, batch):
+        try:
+            self._write(batch)
+        except Exception:
+            _logger.exception('Error writing metrics')
+
+    def flush(self):
+        """Write the queued metrics from the calling thread"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) == self.batch_size:
+                self._send(batch)
+                batch = []
+        if batch:
+            self._send(batch)
+
+
+def get_buffer(client, write):
+    """Return the metrics buffer shared by all users of a client
+
+    :param client: The metrics client, such as a statsd or InfluxDB one.
+    :param write: Called as ``write(client, batch)`` to write a batch.
+    """
+    with _BUFFERS_LOCK:
+        buffer = _BUFFERS.get(client)
+        if buffer is None:
+            # the buffer must not keep the client alive
+            client_ref = weakref.ref(client)
+
+            def _write(batch):
+                target = client_ref()
+                if target is not None:
+                    write(target, batch)
+
+            buffer = _BUFFERS[client] = MetricsBuffer(_write)
+        return buffer
@@ -10,6 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import itertools
+import xml.etree.ElementTree as ET
+
 from openstack import _log
 
 from collections import defaultdict
@@ -23,6 +26,9 @@ _logger = _log.setup_logging('openstack')
 class BaseResource(sdk_resource.Resource):
     OBS_NS = "http://obs.otc.t-systems.com/doc/2016-01-01/"
 
+    #: Size of the chunks the listing responses are parsed in
+    LIST_CHUNK_SIZE = 64 * 1024
+
     @classmethod
     def etree_to_dict(cls, t):
         """Convert ETree to python dict
@@ -48,3 +54,54 @@ class BaseResource(sdk_resource.Resource):
             else:
                 d[t.tag] = text
         return d
+
+    @classmethod
+    def _iter_elements(cls, response, root_tag, tags):
+        """Incrementally parse the XML response body
+
+        The body is fed into a pull parser chunk by chunk and every element
+        with a local name from tags is yielded as (name, element) as soon as
+        it is closed. Yielded elements are detached from the tree afterwards,
+        so memory stays flat regardless of the response size.
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        stack = []
+        # None marks the end of the body and flushes the parser
+        chunks = itertools.chain(
+            response.iter_content(chunk_size=cls.LIST_CHUNK_SIZE), [None])
+        for chunk in chunks:
+            if chunk is None:
+                parser.close()
+            else:
+                parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if not stack and element.tag != ET.QName(
+                            cls.OBS_NS, root_tag):
+                        _logger.warn('Namespace in the response does not '
+                                     'match expectation')
+                        cls.OBS_NS = element.tag.split('}', 1)[0][1:]
+                    stack.append(element)
+                    continue
+                stack.pop()
+                name = element.tag.rpartition('}')[2]
+                if name in tags:
+                    yield name, element
+                    if stack:
+                        stack[-1].remove(element)
+
+    @staticmethod
+    def _element_to_record(element):
+        """Decode a flat listing entry into a dict of its fields
+
+        Unlike etree_to_dict this skips attributes and repeated tags, which
+        listing entries do not have.
+        """
+        record = {}
+        for child in element:
+            name = child.tag.rpartition('}')[2]
+            if len(child):
+                record[name] = BaseResource._element_to_record(child)
+            else:
+                record[name] = (child.text or '').strip(' "') or None
+        return record
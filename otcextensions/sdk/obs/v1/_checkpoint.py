@@ -0,0 +1,89 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+import os
+import threading
+
+from openstack import _log
+
+_logger = _log.setup_logging('openstack')
+
+
+class UploadCheckpoint:
+    """Persisted state of a resumable multipart upload
+
+    The state is a JSON file holding the upload_id and the ETags of the
+    completed parts. It is rewritten atomically every time a part completes
+    and is only reused for the very same source (target, file size, mtime,
+    segment size).
+    """
+
+    def __init__(self, path, **source):
+        self.path = path
+        self.source = source
+        self.upload_id = None
+        self.parts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, **source):
+        """Load the checkpoint from path if it matches the source"""
+        checkpoint = cls(path, **source)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return checkpoint
+        except ValueError:
+            _logger.warning('Ignoring corrupted upload checkpoint %s', path)
+            return checkpoint
+        if state.get('source') != source:
+            _logger.debug('Upload checkpoint %s belongs to another source, '
+                          'starting a new upload', path)
+            return checkpoint
+        checkpoint.upload_id = state.get('upload_id')
+        checkpoint.parts = {
+            int(number): etag
+            for number, etag in state.get('parts', {}).items()}
+        return checkpoint
+
+    def start(self, upload_id, parts=None):
+        """Bind the checkpoint to an upload and persist it"""
+        with self._lock:
+            self.upload_id = upload_id
+            self.parts = dict(parts or {})
+            self._save()
+
+    def add_part(self, number, etag):
+        """Record a completed part"""
+        with self._lock:
+            self.parts[number] = etag
+            self._save()
+
+    def remove(self):
+        """Drop the checkpoint once the upload is completed"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _save(self):
+        state = {
+            'source': self.source,
+            'upload_id': self.upload_id,
+            'parts': {str(number): etag
+                      for number, etag in self.parts.items()}
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
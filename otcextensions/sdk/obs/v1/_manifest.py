@@ -0,0 +1,77 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+import os
+import threading
+
+from openstack import _log
+
+_logger = _log.setup_logging('openstack')
+
+
+class SyncManifest:
+    """Cache of local file checksums used by directory synchronization
+
+    Every entry maps a path relative to the synchronized directory to the
+    size, mtime and ETag (plain or multipart MD5) of the file. The ETag is
+    only trusted while size and mtime are unchanged, so unmodified files
+    are not hashed again on the next run. Without a path the manifest only
+    lives in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.files = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        manifest = cls(path)
+        try:
+            with open(path) as f:
+                manifest.files = json.load(f).get('files', {})
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            _logger.warning('Ignoring corrupted sync manifest %s', path)
+        return manifest
+
+    def get(self, name, stat):
+        """Return the cached ETag of the file if it did not change"""
+        entry = self.files.get(name)
+        if (entry and entry['size'] == stat.st_size
+                and entry['mtime'] == stat.st_mtime_ns):
+            return entry['etag']
+        return None
+
+    def set(self, name, stat, etag):
+        with self._lock:
+            self.files[name] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'etag': etag
+            }
+
+    def retain(self, names):
+        """Drop the entries of files not in names"""
+        with self._lock:
+            self.files = {
+                name: entry for name, entry in self.files.items()
+                if name in names}
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'files': self.files}, f)
+        os.replace(tmp_path, self.path)
@@ -9,22 +9,44 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import base64
+import concurrent.futures
+import hashlib
 import os
+import queue
+import threading
+import uuid
 from urllib import parse
 from urllib.parse import urlsplit
 
+from keystoneauth1 import exceptions as ks_exceptions
 from openstack import exceptions
+from requests import exceptions as requests_exceptions
 from urllib3.exceptions import LocationParseError
 
 from otcextensions.common import utils
 from otcextensions.common.utils import extract_region_from_url
 from otcextensions.sdk import ak_auth
+from otcextensions.sdk import instrumentation
 from otcextensions.sdk import sdk_proxy
+from otcextensions.sdk import sdk_resource
+from otcextensions.sdk.obs.v1 import _checkpoint
+from otcextensions.sdk.obs.v1 import _manifest
 from otcextensions.sdk.obs.v1 import container as _container
 from otcextensions.sdk.obs.v1 import obj as _obj
 
 DEFAULT_OBJECT_SEGMENT_SIZE = 1073741824  # 1GB
 DEFAULT_MAX_FILE_SIZE = (5 * 1024 * 1024 * 1024 + 2) / 2
+DEFAULT_DOWNLOAD_SEGMENT_SIZE = 104857600  # 100MB
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1048576  # 1MB
+DEFAULT_SEGMENT_RETRIES = 3
+DEFAULT_STREAM_SEGMENT_SIZE = 16777216  # 16MB
+DEFAULT_STREAM_BUFFERS = 4
+DEFAULT_SYNC_WORKERS = 8
+DEFAULT_LIST_WORKERS = 8
+DEFAULT_LIST_BUFFER = 1000  # objects buffered per listing shard
+DEFAULT_DELETE_BATCH_SIZE = 1000  # server limit of a multi-object delete
+DEFAULT_DELETE_WORKERS = 4
 EXPIRES_ISO8601_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 SHORT_EXPIRES_ISO8601_FORMAT = '%Y-%m-%d'
 
@@ -33,6 +55,19 @@ def _normalize_obs_keys(obj):
     return {k.lower(): v for k, v in obj.items()}
 
 
+def _part_number_from_url(url):
+    query = parse.parse_qs(parse.urlsplit(url).query)
+    return int(query['partNumber'][0])
+
+
+def _object_headers(attrs):
+    """Return HTTP headers of Object attributes, others are kept as is"""
+    names = {attr: header
+             for header, attr in _obj.Object._header_mapping().items()}
+    return {names.get(key, key): value for key, value in attrs.items()
+            if value is not None}
+
+
 class Proxy(sdk_proxy.Proxy):
     skip_discovery = True
 
@@ -228,26 +263,143 @@ class Proxy(sdk_proxy.Proxy):
 
     # ======== Objects ========
 
-    def objects(self, container, **query):
+    def objects(self, container, parallel=False, boundaries=None,
+                ordered=True, workers=DEFAULT_LIST_WORKERS, **query):
         """Return a generator that yields the Container's objects.
 
         :param container: A container object or the name of a container
             that you want to retrieve objects from.
         :type container:
             :class:`~otcextensions.sdk.obs.v1.container.Container`
+        :param bool parallel: List the container in shards which are paged
+            concurrently. Unless boundaries are given the shards are the
+            common prefixes of the ``delimiter`` query parameter (``/`` by
+            default), discovered while listing the first level.
+        :param boundaries: Sorted object names a parallel listing is split
+            at. A shard holds the names greater than the previous boundary
+            up to and including the next one.
+        :param bool ordered: Whether a parallel listing yields the objects
+            in key order. Otherwise they are yielded as they arrive.
+        :param int workers: Number of shards listed concurrently.
         :param kwargs query: Optional query parameters to be sent to limit
-                               the resources being returned.
+                               the resources being returned. ``raw=True``
+                               or ``fields=[...]`` yield compact records
+                               instead of objects.
 
         :rtype: A generator of
             :class:`~otcextensions.sdk.obs.v1.obj.Object` objects.
         """
         container = self._get_container_name(container=container)
         endpoint = self.get_container_endpoint(container)
+        if parallel:
+            return self._list_sharded(
+                endpoint, boundaries, ordered, workers, **query)
         return self._list(
             _obj.Object,
             endpoint_override=endpoint,
             requests_auth=self._get_req_auth(endpoint), **query)
 
+    def _list_sharded(self, endpoint, boundaries, ordered, workers, **query):
+        requests_auth = self._get_req_auth(endpoint)
+        delimiter = query.pop('delimiter', None) or '/'
+        build = sdk_resource.record_factory(
+            _obj.Object, query.pop('raw', False), query.pop('fields', None))
+        stop = threading.Event()
+        # Discovery puts the objects of the first level and the shards in
+        # key order. Ordered shards get a queue of their own, which is
+        # drained when the consumer reaches it, unordered ones share it.
+        results = queue.Queue(DEFAULT_LIST_BUFFER)
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+        futures = []
+
+        def _put(output, item):
+            while not stop.is_set():
+                try:
+                    output.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def _entries(**params):
+            return _obj.Object._list_entries(
+                self, endpoint_override=endpoint,
+                requests_auth=requests_auth, build=build, **params)
+
+        def _shard(output, upper, params):
+            try:
+                for _name, key, obj in _entries(**params):
+                    if upper is not None and key > upper:
+                        break
+                    if not _put(output, ('object', obj)):
+                        return
+                _put(output, ('done', None))
+            except Exception as e:
+                _put(output, ('error', e))
+
+        def _start_shard(upper=None, **params):
+            output = queue.Queue(DEFAULT_LIST_BUFFER) if ordered \
+                else results
+            # announce the shard before it can report completion
+            if not _put(results, ('shard', output)):
+                return False
+            futures.append(executor.submit(
+                _shard, output, upper, dict(query, **params)))
+            return True
+
+        def _discover():
+            try:
+                if boundaries is None:
+                    for name, _key, value in _entries(
+                            delimiter=delimiter, **query):
+                        if name == 'CommonPrefixes':
+                            started = _start_shard(prefix=value)
+                        else:
+                            started = _put(results, ('object', value))
+                        if not started:
+                            return
+                else:
+                    lower = None
+                    for upper in list(boundaries) + [None]:
+                        params = {'marker': lower} if lower else {}
+                        if not _start_shard(upper, **params):
+                            return
+                        lower = upper
+                _put(results, ('done', None))
+            except Exception as e:
+                _put(results, ('error', e))
+
+        def _drain(output):
+            while True:
+                kind, value = output.get()
+                if kind == 'done':
+                    return
+                if kind == 'error':
+                    raise value
+                yield value
+
+        threading.Thread(target=_discover, daemon=True).start()
+        pending = 1
+        try:
+            while pending:
+                kind, value = results.get()
+                if kind == 'object':
+                    yield value
+                elif kind == 'shard':
+                    if ordered:
+                        yield from _drain(value)
+                    else:
+                        pending += 1
+                elif kind == 'done':
+                    pending -= 1
+                else:
+                    raise value
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     def _get_container_name(self, obj=None, container=None):
         if obj is not None:
             obj = self._get_resource(_obj.Object, obj)
@@ -281,7 +433,8 @@ class Proxy(sdk_proxy.Proxy):
                          endpoint_override=endpoint,
                          requests_auth=self._get_req_auth(endpoint))
 
-    def download_object(self, obj, container=None, **attrs):
+    def download_object(self, obj, container=None, parallel=False,
+                        segment_size=None, **attrs):
         """Download the data contained inside an object.
 
         :param obj: The value can be the name of an object or a
@@ -289,6 +442,13 @@ class Proxy(sdk_proxy.Proxy):
         :param container: The value can be the name of a container or a
                :class:`~otcextensions.sdk.obs.v1.container.Container`
                instance.
+        :param bool parallel: When set to ``True`` the object is fetched in
+            byte ranges concurrently and written into the file in place.
+            The ranges are written at their offsets, so this needs the
+            name of a regular file as ``file``, without one the object is
+            downloaded serially. (optional, defaults to False)
+        :param segment_size: Size in bytes of a single range in the parallel
+            mode. (optional, defaults to 100MB)
 
         :raises: :class:`~openstack.exceptions.ResourceNotFound`
                  when no resource can be found.
@@ -298,11 +458,103 @@ class Proxy(sdk_proxy.Proxy):
         endpoint = self.get_container_endpoint(container_name)
         obj = self._get_resource(
             _obj.Object, obj, container=container_name, **attrs)
+        filename = attrs.pop('file', '-')
+        if parallel and filename != '-':
+            return self._download_large_object(
+                endpoint, obj.id, filename, segment_size)
         return obj.download(
             self,
             endpoint_override=endpoint,
             requests_auth=self._get_req_auth(endpoint),
-            filename=attrs.pop('file', '-'))
+            filename=filename,
+            chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE)
+
+    def _download_large_object(self, endpoint, name, filename,
+                               segment_size=None):
+        """
+        Fetch the object in ranges of segment_size bytes in parallel and
+        write every range into its place of a file preallocated to the
+        object size. All ranges are requested with If-Match on the ETag
+        returned by the initial HEAD, so an object replaced during the
+        download fails it instead of producing a mixed file.
+        """
+        requests_auth = self._get_req_auth(endpoint)
+        url = f'{endpoint}/{name}'
+
+        response = self.head(url, requests_auth=requests_auth)
+        exceptions.raise_from_response(response)
+        file_size = int(response.headers['Content-Length'])
+        etag = response.headers.get('ETag')
+
+        if segment_size:
+            segment_size = int(segment_size)
+        segment_size = segment_size or DEFAULT_DOWNLOAD_SEGMENT_SIZE
+
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT, 0o644)
+        segment_futures = []
+        try:
+            os.ftruncate(fd, file_size)
+            for offset, length in utils._get_file_ranges(
+                    file_size, segment_size):
+                segment_futures.append(
+                    self._connection._pool_executor.submit(
+                        self._download_segment,
+                        url, fd, offset, length, etag, requests_auth))
+            for future in concurrent.futures.as_completed(segment_futures):
+                future.result()
+        except Exception:
+            # Running workers still write into fd, let them finish before
+            # it is closed
+            for future in segment_futures:
+                future.cancel()
+            concurrent.futures.wait(segment_futures)
+            os.close(fd)
+            os.unlink(filename)
+            raise
+        os.close(fd)
+
+    def _download_segment(self, url, fd, offset, length, etag,
+                          requests_auth, retries=DEFAULT_SEGMENT_RETRIES):
+        headers = {'Range': 'bytes=%d-%d' % (offset, offset + length - 1)}
+        if etag:
+            headers['If-Match'] = etag
+        attempt = 0
+        while True:
+            attempt += 1
+            position = offset
+            try:
+                response = self.get(
+                    url, headers=headers, stream=True,
+                    requests_auth=requests_auth)
+                exceptions.raise_from_response(response)
+                if etag and response.headers.get('ETag', etag) != etag:
+                    raise exceptions.SDKException(
+                        'Object %s has changed during download' % url)
+                for chunk in response.iter_content(
+                        DEFAULT_DOWNLOAD_CHUNK_SIZE):
+                    utils._write_at(fd, chunk, position)
+                    position += len(chunk)
+                if position - offset == length:
+                    return length
+                error = 'got %d of %d bytes' % (position - offset, length)
+            except exceptions.HttpException as e:
+                # Client errors (i.e. failed If-Match) are not transient
+                if e.status_code is not None and e.status_code < 500:
+                    raise
+                error = e
+            except (ks_exceptions.RetriableConnectionFailure,
+                    requests_exceptions.RequestException) as e:
+                error = e
+            if attempt >= retries:
+                raise exceptions.SDKException(
+                    'Failed to download %s of %s: %s'
+                    % (headers['Range'], url, error))
+            instrumentation.increment(
+                'retries_total', service_type=self.service_type,
+                operation='download_segment')
+            self.log.debug(
+                "Retrying download of %(range)s of %(url)s: %(error)s",
+                {'range': headers['Range'], 'url': url, 'error': error})
 
     def stream_object(self, obj, container=None, chunk_size=1024, **attrs):
         """Stream the data contained inside an object.
@@ -331,20 +583,29 @@ class Proxy(sdk_proxy.Proxy):
 
     def create_object(self, container, name, filename=None, data=None,
                       segment_size=None, md5=None,
-                      generate_checksums=None,
+                      generate_checksums=None, checkpoint_file=None,
                       **headers):
         """Upload a new object from attributes
 
-        :param generate_checksums: Whether to generate checksums on the client
-            side that get added to headers for later prevention of double
-            uploads of identical data. (optional, defaults to True)
+        :param generate_checksums: Whether to verify the ETags returned for
+            the uploaded data against MD5 checksums generated on the client
+            side. The checksums are computed while the file is read for the
+            upload. Not usable with SSE-KMS and SSE-C, where the ETag is not
+            an MD5. (optional, defaults to False)
         :param md5: A hexadecimal md5 of the file. (Optional), if it is known
             and can be passed here, it will save repeating the expensive md5
-            process. It is assumed to be accurate.
+            process when the object already exists. It is assumed to be
+            accurate.
+            In the same way a known hex SHA256 of the data can be passed as
+            ``content_sha256`` to skip hashing it for request signing.
         :param segment_size: Break the uploaded object into segments of this
             many bytes. (Optional) SDK will attempt to discover the maximum
             value for this from the server if it is not specified, or will use
             a reasonable default.
+        :param checkpoint_file: Path of a local file to persist the state of
+            a multipart upload in. (Optional) When given, an interrupted
+            upload of the same file is resumed on the next call, skipping
+            the parts already stored on the server.
         :param container: The value can be the name of a container or a
                :class:`~otcextensions.sdk.obs.v1.container.Container`
                instance.
@@ -394,102 +655,321 @@ class Proxy(sdk_proxy.Proxy):
         segment_size = self.get_object_segment_size(segment_size)
         file_size = os.path.getsize(filename)
 
-        if generate_checksums and md5 is None:
-            md5 = utils._get_file_hashes(filename)
-
-        if self.is_object_stale(container, name, filename, md5):
+        # The file is only hashed up front when an object to compare with
+        # exists, the upload itself hashes the data while reading it
+        if self.is_object_stale(container, name, filename, md5,
+                                segment_size=segment_size):
 
             self.log.debug(
                 "uploading %(filename)s to %(endpoint)s",
                 {'filename': filename, 'endpoint': endpoint})
 
             if file_size <= segment_size:
-                self._upload_object(endpoint, filename, headers, name)
+                self._upload_object(
+                    endpoint, filename, headers, name,
+                    verify=generate_checksums)
             else:
                 self._upload_large_object(
                     endpoint, filename, headers,
-                    file_size, segment_size)
+                    file_size, segment_size, name=name,
+                    checkpoint_file=checkpoint_file,
+                    verify=generate_checksums)
 
     # Backwards compat
     upload_object = create_object
 
-    def _upload_object(self, endpoint, filename, headers, name=None):
+    def create_object_from_stream(self, container, name, stream,
+                                  segment_size=None, buffers=None,
+                                  **headers):
+        """Upload a new object from a stream of unknown length
+
+        The stream is read into a fixed pool of reusable buffers of
+        segment_size bytes and every filled buffer is uploaded concurrently
+        as a part of a multipart upload, so no more than
+        ``buffers * segment_size`` bytes are held in memory. A stream
+        shorter than one segment is uploaded with a single PUT.
+
+        :param container: The value can be the name of a container or a
+               :class:`~otcextensions.sdk.obs.v1.container.Container`
+               instance.
+        :param name: Name of the object to create.
+        :param stream: A readable file-like object (i.e. a pipe) or an
+            iterable of bytes (i.e. a generator).
+        :param segment_size: Size of a single part in bytes. (Optional,
+            defaults to 16MB). OBS allows up to 10000 parts per object.
+        :param buffers: Number of part buffers, which is also the maximum
+            number of parts in flight. (Optional, defaults to 4)
+        :param dict headers: Header attributes of the object, such as
+            ``content_type``, or raw header names like ``x-obs-meta-*``.
+
+        :returns: ``None``
+        """
+        container = self._get_container_name(container=container)
+        endpoint = self.get_container_endpoint(container)
+        requests_auth = self._get_req_auth(endpoint)
+        segment_size = int(segment_size or DEFAULT_STREAM_SEGMENT_SIZE)
+        reader = utils.StreamReader(stream)
+
+        pool = queue.Queue()
+        for _ in range(buffers or DEFAULT_STREAM_BUFFERS):
+            pool.put(bytearray(segment_size))
+
+        buffer = pool.get()
+        size = reader.readinto(buffer)
+        if size < segment_size:
+            data = bytes(buffer[:size])
+            self.log.debug(
+                "uploading stream to %(endpoint)s",
+                {'endpoint': endpoint})
+            self._create(
+                _obj.Object, container=container, name=name, data=data,
+                content_md5=base64.b64encode(hashlib.md5(
+                    data, usedforsecurity=False).digest()).decode(),
+                endpoint_override=endpoint,
+                requests_auth=requests_auth,
+                **headers)
+            return
+
+        self.log.debug(
+            "uploading stream in segments to %(endpoint)s",
+            {'endpoint': endpoint})
+        url = f'{endpoint}/{name}'
+        upload_id = _obj.Object.initiate_multipart_upload(
+            self, endpoint, name, headers=_object_headers(headers),
+            requests_auth=requests_auth)
+        failed = threading.Event()
+        segment_futures = []
+
+        def _release(future, buffer):
+            pool.put(buffer)
+            if not future.cancelled() and future.exception():
+                failed.set()
+
+        try:
+            while size:
+                segment_future = self._connection._pool_executor.submit(
+                    self._upload_stream_segment,
+                    url, upload_id, len(segment_futures) + 1,
+                    memoryview(buffer)[:size], requests_auth)
+                segment_future.add_done_callback(
+                    lambda f, buffer=buffer: _release(f, buffer))
+                segment_futures.append(segment_future)
+                if size < segment_size:
+                    break
+                # Blocks while all the buffers are in flight
+                buffer = pool.get()
+                if failed.is_set():
+                    break
+                size = reader.readinto(buffer)
+
+            parts = [
+                {'PartNumber': str(number), 'ETag': future.result()}
+                for number, future in enumerate(segment_futures, 1)]
+            exceptions.raise_from_response(
+                _obj.Object.complete_multipart_upload(
+                    self, url, upload_id, parts, {},
+                    requests_auth=requests_auth))
+        except Exception:
+            for future in segment_futures:
+                future.cancel()
+            concurrent.futures.wait(segment_futures)
+            try:
+                self.log.debug(
+                    "Failed to upload stream for %s. "
+                    "Aborting uploads.", upload_id)
+                self._abort_multipart_upload(endpoint=url,
+                                             upload_id=upload_id)
+            except Exception:
+                self.log.exception(
+                    "Failed to cleanup stream parts for %s:",
+                    upload_id)
+            raise
+
+    def _upload_stream_segment(self, url, upload_id, part_number, data,
+                               requests_auth,
+                               retries=DEFAULT_SEGMENT_RETRIES):
+        segment_url = f'{url}?partNumber={part_number}&uploadId={upload_id}'
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.put(
+                    segment_url, data=data, requests_auth=requests_auth)
+                exceptions.raise_from_response(response)
+                return response.headers['ETag'].strip('"')
+            except exceptions.HttpException as e:
+                if e.status_code is not None and e.status_code < 500:
+                    raise
+                error = e
+            except (ks_exceptions.RetriableConnectionFailure,
+                    requests_exceptions.RequestException) as e:
+                error = e
+            if attempt >= retries:
+                raise exceptions.SDKException(
+                    'Failed to upload part %d of %s: %s'
+                    % (part_number, url, error))
+            instrumentation.increment(
+                'retries_total', service_type=self.service_type,
+                operation='upload_part')
+            self.log.debug(
+                "Retrying upload of part %(part)d of %(url)s: %(error)s",
+                {'part': part_number, 'url': url, 'error': error})
+
+    def _upload_object(self, endpoint, filename, headers, name=None,
+                       verify=False):
         if not name:
             name = os.path.basename(filename)
-        with open(filename, 'rb') as dt:
-            return self._create(
+        segment = utils.FileSegment(
+            filename, 0, os.path.getsize(filename))
+        try:
+            result = self._create(
                 _obj.Object,
-                name=name, data=dt,
+                name=name, data=segment,
                 endpoint_override=endpoint,
                 requests_auth=self._get_req_auth(endpoint),
                 **headers)
+        finally:
+            segment.close()
+        if verify:
+            self._verify_segment_etag(
+                f'{endpoint}/{name}', segment, result.etag)
+        return result
+
+    def _verify_segment_etag(self, url, segment, etag):
+        if segment.md5 is None:
+            # not read completely (i.e. skipped on resume)
+            return
+        if (etag or '').strip('"') != segment.md5:
+            raise exceptions.SDKException(
+                'Checksum mismatch uploading %s: local %s, remote %s'
+                % (url, segment.md5, etag))
 
     def _upload_large_object(self, endpoint, filename, headers,
-                             file_size, segment_size):
+                             file_size, segment_size, name=None,
+                             checkpoint_file=None, verify=False):
         """
         If the object is big, we need to break it up into segments that
         are no larger than segment_size, upload each of them individually
         and then upload a manifest object. The segments can be uploaded in
         parallel, so we'll use the async feature of the TaskManager.
+
+        With checkpoint_file the upload_id and the completed parts are
+        persisted, so that a failed upload is resumed instead of being
+        started over (and it is not aborted on failure).
+
+        With verify the part ETags are checked against the MD5 of the
+        segments, computed while they are read for the upload.
+
+        Returns the response of completing the upload.
         """
 
         segment_futures = []
         segment_results = []
         retry_results = []
         retry_futures = []
-        manifest = []
 
-        object_name = os.path.basename(filename)
+        object_name = name or os.path.basename(filename)
         requests_auth = self._get_req_auth(endpoint)
         segments = utils._get_file_segments(
             endpoint, filename, file_size, segment_size)
-
-        upload_id = _obj.Object.initiate_multipart_upload(
-            self, endpoint, object_name,
-            requests_auth=requests_auth
-        )
         url = f'{endpoint}/{object_name}'
-        # Schedule the segments for upload
-        for name, segment in segments.items():
-            # Async call to put - schedules execution and returns a future
-            segment_future = self._connection._pool_executor.submit(
-                self.put,
-                f'{url}?partNumber={name[-1]}&uploadId={upload_id}',
-                headers=headers, data=segment,
-                requests_auth=requests_auth,
-                raise_exc=False)
-            segment_futures.append(segment_future)
-            # dict. Then sort the list of dicts by path.
-            manifest.append(dict(
-                path='/{name}'.format(name=name),
-                size_bytes=segment.length))
-
-        segment_results, retry_results = self._connection._wait_for_futures(
-            segment_futures, raise_on_error=False)
-
-        for result in retry_results:
-            # Grab the FileSegment for the failed upload so we can retry
-            name = self._object_name_from_url(result.url)
-            segment = segments[name]
-            segment.seek(0)
-            # Async call to put - schedules execution and returns a future
-            segment_future = self._connection._pool_executor.submit(
-                self.put,
-                f'{url}?partNumber={name[-1]}&uploadId={upload_id}',
-                headers=headers, data=segment,
+
+        checkpoint = None
+        upload_id = None
+        if checkpoint_file:
+            checkpoint = _checkpoint.UploadCheckpoint.load(
+                checkpoint_file, url=url, file_size=file_size,
+                segment_size=segment_size,
+                mtime=os.path.getmtime(filename))
+            upload_id = self._resume_large_object_upload(
+                endpoint, url, checkpoint, segments, requests_auth)
+
+        if not upload_id:
+            upload_id = _obj.Object.initiate_multipart_upload(
+                self, endpoint, object_name,
                 requests_auth=requests_auth
             )
-            # dict. Then sort the list of dicts by path.
-            retry_futures.append(segment_future)
+            if checkpoint:
+                checkpoint.start(upload_id)
+        # part number -> ETag of the parts stored before this run
+        uploaded = dict(checkpoint.parts) if checkpoint else {}
 
-        # If any segments fail the second time, just throw the error
-        segment_results, retry_results = self._connection._wait_for_futures(
-            retry_futures, raise_on_error=True)
+        # Segments open their file when they are read by the upload and
+        # are closed once it is done
+        try:
+            # Schedule the segments for upload
+            for name, segment in segments.items():
+                # Async call to put - schedules execution and returns a future
+                segment_future = self._connection._pool_executor.submit(
+                    self.put,
+                    f'{url}?partNumber={name.rsplit("/", 1)[-1]}'
+                    f'&uploadId={upload_id}',
+                    headers=headers, data=segment,
+                    requests_auth=requests_auth,
+                    raise_exc=False)
+                segment_future.add_done_callback(
+                    lambda f, segment=segment: segment.close())
+                if checkpoint:
+                    segment_future.add_done_callback(
+                        lambda f: self._checkpoint_segment(checkpoint, f))
+                segment_futures.append(segment_future)
+
+            segment_results, retry_results = \
+                self._connection._wait_for_futures(
+                    segment_futures, raise_on_error=False)
+
+            for result in retry_results:
+                # Grab the FileSegment for the failed upload so we can retry
+                part_number = _part_number_from_url(result.url)
+                segment = segments[f'{endpoint}/{part_number}']
+                segment.seek(0)
+                # Async call to put - schedules execution and returns a future
+                segment_future = self._connection._pool_executor.submit(
+                    self.put,
+                    f'{url}?partNumber={part_number}&uploadId={upload_id}',
+                    headers=headers, data=segment,
+                    requests_auth=requests_auth
+                )
+                segment_future.add_done_callback(
+                    lambda f, segment=segment: segment.close())
+                if checkpoint:
+                    segment_future.add_done_callback(
+                        lambda f: self._checkpoint_segment(checkpoint, f))
+                # dict. Then sort the list of dicts by path.
+                retry_futures.append(segment_future)
+
+            # If any segments fail the second time, just throw the error
+            retry_results, _ = self._connection._wait_for_futures(
+                retry_futures, raise_on_error=True)
+        finally:
+            # A failed part leaves others running, let them finish before
+            # their files are closed
+            for future in segment_futures + retry_futures:
+                future.cancel()
+            concurrent.futures.wait(segment_futures + retry_futures)
+            for segment in segments.values():
+                segment.close()
 
         try:
-            return self._finish_large_object_upload(
-                url, headers, upload_id)
+            if verify:
+                for result in segment_results + retry_results:
+                    part_number = _part_number_from_url(result.url)
+                    self._verify_segment_etag(
+                        result.url, segments[f'{endpoint}/{part_number}'],
+                        result.headers.get('ETag'))
+            for result in segment_results + retry_results:
+                uploaded[_part_number_from_url(result.url)] = \
+                    result.headers.get('ETag', '').strip('"')
+            result = self._finish_large_object_upload(
+                url, headers, upload_id,
+                parts=[{'PartNumber': str(number), 'ETag': etag}
+                       for number, etag in sorted(uploaded.items())])
         except Exception:
+            if checkpoint:
+                self.log.debug(
+                    "Failed to upload large object for %s. "
+                    "Keeping it for resume.", upload_id)
+                raise
             try:
                 self.log.debug(
                     "Failed to upload large object for %s. "
@@ -501,27 +981,103 @@ class Proxy(sdk_proxy.Proxy):
                     "Failed to cleanup image objects for %s:",
                     upload_id)
             raise
+        if checkpoint:
+            checkpoint.remove()
+        return result
+
+    def _resume_large_object_upload(self, endpoint, url, checkpoint,
+                                    segments, requests_auth):
+        """Continue the upload recorded in the checkpoint
+
+        Parts already stored on the server are removed from segments. The
+        server listing is authoritative, the ETags kept in the checkpoint
+        are only replaced by it.
+
+        :returns: upload_id to continue or None when a new upload is needed
+        """
+        upload_id = checkpoint.upload_id
+        if not upload_id:
+            return None
+        try:
+            parts = self.parts(url, upload_id, requests_auth)
+        except exceptions.NotFoundException:
+            self.log.debug(
+                "Multipart upload %s does not exist anymore, "
+                "starting a new one", upload_id)
+            return None
+
+        uploaded = {}
+        for part in parts.get('Parts', []):
+            number = int(part['PartNumber'])
+            segment = segments.get(f'{endpoint}/{number}')
+            if segment is not None and int(part['Size']) == segment.length:
+                uploaded[number] = part['ETag']
+        for number in uploaded:
+            segments.pop(f'{endpoint}/{number}').close()
+        checkpoint.start(upload_id, uploaded)
+        self.log.debug(
+            "Resuming multipart upload %(upload_id)s, %(done)d parts "
+            "are already uploaded",
+            {'upload_id': upload_id, 'done': len(uploaded)})
+        return upload_id
+
+    def _checkpoint_segment(self, checkpoint, future):
+        try:
+            response = future.result()
+        except Exception:
+            return
+        if response is not None and response.ok:
+            checkpoint.add_part(
+                _part_number_from_url(response.url),
+                response.headers.get('ETag', '').strip('"'))
 
     def parts(self, endpoint, upload_id, requests_auth):
-        return _obj.Object.get_parts(
-            self, f'{endpoint}?uploadId={upload_id}', requests_auth)
+        """List all parts of a multipart upload
 
-    def _finish_large_object_upload(self, endpoint, headers, upload_id):
+        OBS returns at most 1000 parts at once, the following pages are
+        requested with the ``part-number-marker`` of the previous one.
+        """
+        url = f'{endpoint}?uploadId={upload_id}'
+        result = _obj.Object.get_parts(self, url, requests_auth)
+        parts = list(result.get('Parts', []))
+        page = result
+        while (str(page.get('IsTruncated')).lower() == 'true'
+               and page.get('NextPartNumberMarker')):
+            page = _obj.Object.get_parts(
+                self, f'{url}&part-number-marker='
+                f'{page["NextPartNumberMarker"]}', requests_auth)
+            parts.extend(page.get('Parts', []))
+        result['Parts'] = parts
+        return result
+
+    def _finish_large_object_upload(self, endpoint, headers, upload_id,
+                                    parts=None):
+        """Complete a multipart upload
+
+        :param parts: ``PartNumber`` and ``ETag`` dicts of all parts, by
+            default they are listed from the server.
+        :returns: The response of the completion.
+        """
         requests_auth = self._get_req_auth(endpoint)
-        parts = self.parts(endpoint, upload_id, requests_auth)
+        if parts is None:
+            parts = self.parts(endpoint, upload_id, requests_auth)['Parts']
         retries = 3
         while True:
             try:
-                return exceptions.raise_from_response(
-                    _obj.Object.complete_multipart_upload(
-                        self, endpoint, upload_id,
-                        parts['Parts'], headers,
-                        requests_auth=requests_auth
-                    ))
+                response = _obj.Object.complete_multipart_upload(
+                    self, endpoint, upload_id,
+                    parts, headers,
+                    requests_auth=requests_auth
+                )
+                exceptions.raise_from_response(response)
+                return response
             except Exception:
                 retries -= 1
                 if retries == 0:
                     raise
+                instrumentation.increment(
+                    'retries_total', service_type=self.service_type,
+                    operation='complete_multipart_upload')
 
     def _object_name_from_url(self, url):
         '''Get container_name/object_name from the full URL called.
@@ -534,13 +1090,17 @@ class Proxy(sdk_proxy.Proxy):
         return object_name
 
     def is_object_stale(
-            self, container, name, filename, file_md5=None):
+            self, container, name, filename, file_md5=None,
+            segment_size=None):
         """Check to see if an object matches the hashes of a file.
         :param container: Name of the container.
         :param name: Name of the object.
         :param filename: Path to the file.
         :param file_md5: Pre-calculated md5 of the file contents. Defaults to
             None which means calculate locally.
+        :param segment_size: Segment size the object would be uploaded
+            with. It is needed to compare with objects uploaded in multiple
+            parts, whose ETag is the MD5 of the part MD5s.
         """
         try:
             metadata = self.get_object_metadata(name, container)
@@ -550,9 +1110,12 @@ class Proxy(sdk_proxy.Proxy):
                     container=container, name=name))
             return True
 
-        if not file_md5:
-            file_md5 = utils._get_file_hashes(filename)
-        if file_md5 == metadata.etag.strip('\"'):
+        etag = metadata.etag.strip('\"')
+        multipart = '-' in etag
+        if not file_md5 or ('-' in file_md5) != multipart:
+            file_md5 = utils._get_file_hashes(
+                filename, segment_size if multipart else None)
+        if file_md5 == etag:
             self.log.debug(
                 "swift object up to date: %(container)s/%(name)s",
                 {'container': container, 'name': name})
@@ -576,6 +1139,176 @@ class Proxy(sdk_proxy.Proxy):
             return min_segment_size
         return segment_size
 
+    def sync_directory(self, local_path, container, prefix=None,
+                       direction='upload', delete=False, manifest_file=None,
+                       segment_size=None, workers=DEFAULT_SYNC_WORKERS,
+                       callback=None):
+        """Synchronize a local directory tree with objects of a container
+
+        The container is listed once and compared with the local files by
+        size and ETag. Only the differing files are transferred, by a pool
+        of ``workers`` threads. Local checksums are cached in the manifest
+        file, so unchanged files are not hashed again on the next run.
+
+        :param local_path: Path of the local directory.
+        :param container: The value can be the name of a container or a
+               :class:`~otcextensions.sdk.obs.v1.container.Container`
+               instance.
+        :param prefix: Object name prefix the directory is mapped to.
+            (Optional, defaults to the container root)
+        :param direction: ``upload`` to make the objects match the local
+            files or ``download`` to make the local files match the objects.
+        :param bool delete: Whether to delete objects (upload) or local
+            files (download) missing on the source side.
+        :param manifest_file: Path of the checksum cache. (Optional) It may
+            be placed inside local_path, it is not synchronized itself.
+        :param segment_size: Segment size for uploads, see
+            :meth:`create_object`. (Optional)
+        :param int workers: Number of parallel transfers.
+        :param callback: Callable invoked for every file as
+            ``callback(action, name, error)`` with the action being one of
+            ``upload``, ``download``, ``delete`` or ``skip`` and error the
+            exception of a failed action or ``None``.
+
+        :returns: A list of ``(action, name, error)`` tuples of the
+            performed (not skipped) actions. Failures of single files are
+            reported there instead of being raised.
+        """
+        if direction not in ('upload', 'download'):
+            raise ValueError("direction must be 'upload' or 'download'")
+        container = self._get_container_name(container=container)
+        endpoint = self.get_container_endpoint(container)
+        prefix = prefix.strip('/') + '/' if prefix and prefix.strip('/') \
+            else ''
+        if segment_size:
+            segment_size = int(segment_size)
+        segment_size = self.get_object_segment_size(segment_size)
+
+        query = {'prefix': prefix} if prefix else {}
+        remote = {}
+        for obj in self.objects(container, **query):
+            name = obj.name[len(prefix):]
+            if name and not name.endswith('/'):
+                remote[name] = obj
+
+        if manifest_file:
+            manifest = _manifest.SyncManifest.load(manifest_file)
+            manifest_paths = {os.path.abspath(p) for p in (
+                manifest_file, manifest_file + '.tmp')}
+        else:
+            manifest = _manifest.SyncManifest()
+            manifest_paths = set()
+        local = {}
+        for root, dirs, files in os.walk(local_path):
+            for filename in files:
+                path = os.path.join(root, filename)
+                if os.path.abspath(path) in manifest_paths:
+                    continue
+                name = os.path.relpath(path, local_path).replace(os.sep, '/')
+                local[name] = path
+
+        tasks = {}
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            if direction == 'upload':
+                for name, path in local.items():
+                    tasks[executor.submit(
+                        self._sync_upload, endpoint, prefix + name, path,
+                        remote.get(name), manifest, name, segment_size)
+                    ] = ('upload', name)
+                if delete:
+                    for name in remote.keys() - local.keys():
+                        tasks[executor.submit(
+                            self.delete_object, prefix + name,
+                            container=container)] = ('delete', name)
+            else:
+                for name, obj in remote.items():
+                    tasks[executor.submit(
+                        self._sync_download, container, obj,
+                        os.path.join(local_path, *name.split('/')),
+                        manifest, name, segment_size)
+                    ] = ('download', name)
+                if delete:
+                    for name in local.keys() - remote.keys():
+                        tasks[executor.submit(os.remove, local[name])] = \
+                            ('delete', name)
+
+            report = []
+            for future in concurrent.futures.as_completed(tasks):
+                action, name = tasks.pop(future)
+                error = future.exception()
+                if error is None and future.result() is False:
+                    action = 'skip'
+                else:
+                    report.append((action, prefix + name, error))
+                if error is not None:
+                    self.log.debug(
+                        "Failed to %(action)s %(name)s: %(error)s",
+                        {'action': action, 'name': name, 'error': error})
+                if callback:
+                    callback(action, prefix + name, error)
+
+        manifest.retain(local.keys() if direction == 'upload'
+                        else remote.keys())
+        manifest.save()
+        return report
+
+    def _sync_local_etag(self, manifest, name, path, stat, etag,
+                         segment_size):
+        """ETag of a local file in the format of the object ETag"""
+        multipart = '-' in etag
+        local_etag = manifest.get(name, stat)
+        if local_etag is None or ('-' in local_etag) != multipart:
+            local_etag = utils._get_file_hashes(
+                path, segment_size if multipart else None)
+            manifest.set(name, stat, local_etag)
+        return local_etag
+
+    def _sync_upload(self, endpoint, key, path, obj, manifest, name,
+                     segment_size):
+        stat = os.stat(path)
+        if obj is not None and obj.content_length == stat.st_size:
+            etag = (obj.etag or '').strip('"')
+            if self._sync_local_etag(
+                    manifest, name, path, stat, etag, segment_size) == etag:
+                return False
+        if stat.st_size <= segment_size:
+            result = self._upload_object(endpoint, path, {}, key)
+            if result.etag:
+                manifest.set(name, stat, result.etag.strip('"'))
+        else:
+            etag = _obj.Object.get_completed_etag(self._upload_large_object(
+                endpoint, path, {}, stat.st_size, segment_size, name=key))
+            if etag:
+                manifest.set(name, stat, etag)
+        return True
+
+    def _sync_download(self, container, obj, path, manifest, name,
+                       segment_size):
+        etag = (obj.etag or '').strip('"')
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+        if (stat is not None and stat.st_size == obj.content_length
+                and self._sync_local_etag(
+                    manifest, name, path, stat, etag, segment_size) == etag):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # the synced file is only replaced by a complete download
+        partial = '%s.%s.tmp' % (path, uuid.uuid4().hex)
+        try:
+            self.download_object(
+                obj.name, container=container, file=partial,
+                parallel=(obj.content_length or 0)
+                > DEFAULT_DOWNLOAD_SEGMENT_SIZE)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        manifest.set(name, os.stat(path), etag)
+        return True
+
     def copy_object(self):
         """Copy an object."""
         raise NotImplementedError
@@ -605,6 +1338,102 @@ class Proxy(sdk_proxy.Proxy):
                      requests_auth=self._get_req_auth(endpoint),
                      )
 
+    def delete_objects(self, container, keys,
+                       batch_size=DEFAULT_DELETE_BATCH_SIZE,
+                       workers=DEFAULT_DELETE_WORKERS):
+        """Delete objects in batches using the multi-object delete
+
+        Keys are consumed lazily, so a generator like :meth:`objects` can
+        be passed to clear a prefix. At most ``workers`` batches are in
+        flight at once.
+
+        :param container: The value can be the name of a container or a
+               :class:`~otcextensions.sdk.obs.v1.container.Container`
+               instance.
+        :param keys: An iterable of object names or
+            :class:`~otcextensions.sdk.obs.v1.obj.Object` instances.
+        :param int batch_size: Number of objects deleted per request, at
+            most 1000.
+        :param int workers: Number of batches deleted concurrently.
+
+        :returns: A list of ``(name, code, message)`` tuples of the objects
+            which could not be deleted. The code is ``None`` when the whole
+            batch request failed. Missing objects are not reported.
+        """
+        if not 0 < batch_size <= DEFAULT_DELETE_BATCH_SIZE:
+            raise ValueError('batch_size must be between 1 and %d'
+                             % DEFAULT_DELETE_BATCH_SIZE)
+        container = self._get_container_name(container=container)
+        endpoint = self.get_container_endpoint(container)
+        requests_auth = self._get_req_auth(endpoint)
+
+        report = []
+        batches = {}
+
+        def _collect(done):
+            for future in done:
+                names = batches.pop(future)
+                try:
+                    report.extend(future.result())
+                except Exception as e:
+                    self.log.debug(
+                        "Failed to delete %(count)d objects from "
+                        "%(endpoint)s: %(error)s",
+                        {'count': len(names), 'endpoint': endpoint,
+                         'error': e})
+                    report.extend((name, None, str(e)) for name in names)
+
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+
+            def _submit(names):
+                # Blocks while all the workers are busy
+                if len(batches) >= workers:
+                    _collect(concurrent.futures.wait(
+                        batches,
+                        return_when=concurrent.futures.FIRST_COMPLETED).done)
+                batches[executor.submit(
+                    self._delete_batch, endpoint, names,
+                    requests_auth)] = names
+
+            names = []
+            for key in keys:
+                names.append(
+                    key.name if isinstance(key, _obj.Object) else key)
+                if len(names) == batch_size:
+                    _submit(names)
+                    names = []
+            if names:
+                _submit(names)
+            _collect(concurrent.futures.wait(batches).done)
+        return report
+
+    def _delete_batch(self, endpoint, names, requests_auth,
+                      retries=DEFAULT_SEGMENT_RETRIES):
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return _obj.Object.delete_multiple(
+                    self, endpoint, names, requests_auth=requests_auth)
+            except exceptions.HttpException as e:
+                if e.status_code is not None and e.status_code < 500:
+                    raise
+                error = e
+            except (ks_exceptions.RetriableConnectionFailure,
+                    requests_exceptions.RequestException) as e:
+                error = e
+            if attempt >= retries:
+                raise exceptions.SDKException(
+                    'Failed to delete %d objects from %s: %s'
+                    % (len(names), endpoint, error))
+            instrumentation.increment(
+                'retries_total', service_type=self.service_type,
+                operation='delete_objects')
+            self.log.debug(
+                "Retrying delete of %(count)d objects from %(endpoint)s: "
+                "%(error)s",
+                {'count': len(names), 'endpoint': endpoint, 'error': error})
+
     def get_object_metadata(self, obj, container=None):
         """Get metadata for an object.
 
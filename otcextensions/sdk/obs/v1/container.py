@@ -10,13 +10,13 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import xml.etree.ElementTree as ET
 
 from openstack import _log
 from openstack import exceptions
 from openstack import resource
 from openstack import utils
 
+from otcextensions.sdk import sdk_resource
 from otcextensions.sdk.obs.v1 import _base
 
 
@@ -100,7 +100,15 @@ class Container(_base.BaseResource):
     @classmethod
     def list(cls, session, paginated=False,
              endpoint_override=None, headers=None, requests_auth=None,
-             **params):
+             raw=False, fields=None, **params):
+        """Yield the containers of the account
+
+        :param bool raw: Yield compact
+            :class:`~otcextensions.sdk.sdk_resource.Record` objects instead
+            of resources.
+        :param fields: Yield tuples of the given attributes instead of
+            resources.
+        """
         if not cls.allow_list:
             raise exceptions.MethodNotSupported(cls, "list")
 
@@ -110,27 +118,16 @@ class Container(_base.BaseResource):
         response = session.get(
             session.get_endpoint(),
             params=query_params.copy(),
-            requests_auth=requests_auth
+            requests_auth=requests_auth,
+            stream=True
         )
+        exceptions.raise_from_response(response)
 
-        root = ET.fromstring(response.content)
-
-        if root.tag != ET.QName(cls.OBS_NS, 'ListAllMyBucketsResult'):
-            _logger.warn('Namespace in the response does not match '
-                         'expectation')
-            cls.OBS_NS = root.tag.split('}', 1)[0][1:]
-
-        for elements in root:
-
-            if elements.tag == ET.QName(cls.OBS_NS, cls.resources_key):
-                for el in elements:
-                    if el.tag == ET.QName(cls.OBS_NS, cls.resource_key):
-                        # Convert XML part into dict
-                        dict_raw_resource = cls.etree_to_dict(el)
-                        # extract resource data
-                        dict_resource = dict_raw_resource[cls.resource_key]
-                        value = cls.existing(**dict_resource)
-                        yield value
+        build = sdk_resource.record_factory(cls, raw, fields)
+        for _name, element in cls._iter_elements(
+                response, 'ListAllMyBucketsResult', (cls.resource_key,)):
+            record = cls._element_to_record(element)
+            yield build(record) if build else cls.existing(**record)
 
         return
 
@@ -14,13 +14,14 @@
 import base64
 import hashlib
 import xml.etree.ElementTree as ET
-from io import BufferedReader
 
 from openstack import _log
 from openstack import exceptions
 from openstack import resource
 
 # from otcextensions.i18n import _
+from otcextensions.sdk import instrumentation
+from otcextensions.sdk import sdk_resource
 from otcextensions.sdk.obs.v1 import _base
 
 _logger = _log.setup_logging('openstack')
@@ -42,15 +43,19 @@ class Object(_base.BaseResource):
 
     _query_mapping = resource.QueryParameters(
         'prefix', 'delimiter',
-        'limit',
+        'limit', 'marker',
         prefix='prefix',
         delimiter='delimiter',
-        limit='max-keys'
+        limit='max-keys',
+        marker='marker'
     )
 
     # Data to be passed during a POST call to create an object on the server.
     data = None
 
+    # Header attributes also returned by the listing, for raw records
+    _record_keys = {'etag': 'ETag', 'storage_class': 'StorageClass'}
+
     # URL parameters
     #: The unique name for the container.
     container = resource.URI("container")
@@ -74,6 +79,9 @@ class Object(_base.BaseResource):
     #: and then use Base 64 encoding to convert the binary data to
     #: a character string.
     content_md5 = resource.Header('Content-MD5', type=str)
+    #: Hex SHA256 of the message body, when it is known in advance. It
+    #: saves hashing the body for signing on insecure connections.
+    content_sha256 = resource.Header('x-amz-content-sha256', type=str)
     #: Indicates the content type of a requested resource, for example,
     #: text/plain.
     content_type = resource.Header('Content-Type', type=str)
@@ -169,8 +177,12 @@ class Object(_base.BaseResource):
         This method updates attributes that correspond to headers
         and body on this instance and clears the dirty set.
         """
-        exceptions.raise_from_response(response, error_message=response.text)
-        _logger.debug(response.text)
+        # the body of a streamed download is left to the caller
+        exceptions.raise_from_response(
+            response,
+            error_message=response.text if has_body else error_message)
+        if has_body:
+            _logger.debug(response.text)
         if response:
             if has_body:
                 # TODO(agoncharov): do nothing so far. Generally need
@@ -185,13 +197,42 @@ class Object(_base.BaseResource):
     @classmethod
     def list(cls, session, paginated=False,
              endpoint_override=None, headers=None, requests_auth=None,
-             **params):
+             raw=False, fields=None, **params):
+        """Yield the objects of a listing
+
+        :param bool raw: Yield compact
+            :class:`~otcextensions.sdk.sdk_resource.Record` objects instead
+            of resources.
+        :param fields: Yield tuples of the given attributes instead of
+            resources.
+        """
         if not cls.allow_list:
             raise exceptions.MethodNotSupported(cls, "list")
 
+        for name, _key, value in cls._list_entries(
+                session, endpoint_override=endpoint_override,
+                headers=headers, requests_auth=requests_auth,
+                build=sdk_resource.record_factory(cls, raw, fields),
+                **params):
+            if name == cls.resource_key:
+                yield value
+
+    @classmethod
+    def _list_entries(cls, session, endpoint_override=None, headers=None,
+                      requests_auth=None, build=None, **params):
+        """Yield the objects and common prefixes of a listing
+
+        Entries are yielded as (resource_key, name, object) or
+        ('CommonPrefixes', prefix, prefix), objects being built from the
+        raw listing entry by ``build`` (an Object by default). When a
+        delimiter is given the server returns the objects and the common
+        prefixes of a page as separate lists, so every page is buffered
+        and yielded in key order.
+        """
         cls._query_mapping._validate(params, base_path=cls.base_path)
         query_params = cls._query_mapping._transpose(params, cls)
         uri = cls.base_path % params
+        ordered_pages = 'delimiter' in query_params
 
         # Build additional arguments to the GET call
         get_args = cls._prepare_override_args(
@@ -204,38 +245,45 @@ class Object(_base.BaseResource):
                 uri,
                 params=query_params.copy(),
                 requests_auth=requests_auth,
+                stream=True,
                 **get_args
             )
+            instrumentation.increment(
+                'pages_total',
+                service_type=getattr(session, 'service_type', None),
+                resource=cls.__name__)
+            exceptions.raise_from_response(response)
 
             uri = None
             next_params = {}
-
-            root = ET.fromstring(response.content)
-
-            if root.tag != ET.QName(cls.OBS_NS, 'ListBucketResult'):
-                _logger.warn('Namespace in the response does not match '
-                             'expectation')
-                cls.OBS_NS = root.tag.split('}', 1)[0][1:]
-
-            for element in root:
-
-                if element.tag == ET.QName(cls.OBS_NS, cls.resource_key):
-                    # Convert XML part into dict
-                    dict_raw_resource = cls.etree_to_dict(element)
-                    # extract resource data
-                    dict_resource = dict_raw_resource[cls.resource_key]
-                    value = cls.existing(**dict_resource)
-                    yield value
-
-                elif element.tag == ET.QName(cls.OBS_NS, 'NextMarker'):
+            page = []
+
+            for name, element in cls._iter_elements(
+                    response, 'ListBucketResult',
+                    (cls.resource_key, 'CommonPrefixes', 'NextMarker')):
+                if name == cls.resource_key:
+                    record = cls._element_to_record(element)
+                    entry = (name, record.get('Key'),
+                             build(record) if build
+                             else cls.existing(**record))
+                elif name == 'CommonPrefixes':
+                    prefix = cls._element_to_record(element)['Prefix']
+                    entry = (name, prefix, prefix)
+                else:
                     next_params['marker'] = element.text
+                    continue
+                if ordered_pages:
+                    page.append(entry)
+                else:
+                    yield entry
+
+            page.sort(key=lambda entry: entry[1])
+            yield from page
 
             if 'marker' in next_params:
                 uri = cls.base_path % params
                 query_params.update(next_params)
 
-        return
-
     def create(self, session, prepend_key=True,
                endpoint_override=None, headers=None, requests_auth=None):
 
@@ -245,9 +293,10 @@ class Object(_base.BaseResource):
         session = self._get_session(session)
 
         if not self.content_md5 and self.data and\
-                not isinstance(self.data, BufferedReader):
+                isinstance(self.data, (str, bytes)):
             md5 = hashlib.md5()
-            md5.update(str.encode(self.data))
+            md5.update(self.data if isinstance(self.data, bytes)
+                       else str.encode(self.data))
             self.content_md5 = base64.b64encode(md5.digest()).decode()
 
         request = self._prepare_request(
@@ -301,7 +350,9 @@ class Object(_base.BaseResource):
         return self
 
     def download(self, session, filename=None,
-                 endpoint_override=None, requests_auth=None):
+                 endpoint_override=None, requests_auth=None,
+                 chunk_size=1048576):
+        """Download the object into a file, chunk by chunk"""
 
         session = self._get_session(session)
 
@@ -314,13 +365,13 @@ class Object(_base.BaseResource):
 
         response = session.get(
             request.url,
+            stream=True,
             **req_args)
-        self._translate_response(response)
-
-        _logger.debug(response.content)
+        self._translate_response(response, has_body=False)
 
         with open(filename, 'wb') as f:
-            f.write(response.content)
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
 
         return
 
@@ -339,6 +390,7 @@ class Object(_base.BaseResource):
     @staticmethod
     def get_parts(proxy, endpoint, requests_auth):
         response = proxy.get(endpoint, requests_auth=requests_auth)
+        exceptions.raise_from_response(response)
         dict_resource = {}
         root = ET.fromstring(response.content)
         for element in root:
@@ -362,4 +414,43 @@ class Object(_base.BaseResource):
         tree = ET.ElementTree(root)
         data = ET.tostring(tree.getroot()).decode()
         return proxy.post(url, data=data,
-                          headers=headers, params=params)
+                          headers=headers, **params)
+
+    @staticmethod
+    def get_completed_etag(response):
+        """ETag of the object created by complete_multipart_upload"""
+        root = ET.fromstring(response.content)
+        for element in root:
+            if element.tag.rpartition('}')[2] == 'ETag' and element.text:
+                return element.text.strip(' "')
+        return None
+
+    @staticmethod
+    def delete_multiple(proxy, endpoint, names, quiet=True, **params):
+        """Delete up to 1000 objects of a container with a single request
+
+        :returns: A list of ``(name, code, message)`` tuples of the objects
+            which could not be deleted.
+        """
+        root = ET.Element('Delete')
+        ET.SubElement(root, 'Quiet').text = 'true' if quiet else 'false'
+        for name in names:
+            ET.SubElement(ET.SubElement(root, 'Object'), 'Key').text = name
+        data = ET.tostring(root, encoding='UTF-8')
+        headers = {
+            'Content-MD5': base64.b64encode(
+                hashlib.md5(data).digest()).decode(),
+            'Content-Type': 'application/xml'
+        }
+        response = proxy.post(f'{endpoint}?delete', data=data,
+                              headers=headers, **params)
+        exceptions.raise_from_response(response)
+        errors = []
+        for element in ET.fromstring(response.content):
+            if element.tag.rpartition('}')[2] != 'Error':
+                continue
+            error = {child.tag.rpartition('}')[2]: child.text
+                     for child in element}
+            errors.append(
+                (error.get('Key'), error.get('Code'), error.get('Message')))
+        return errors
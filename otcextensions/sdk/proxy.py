@@ -9,9 +9,24 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import re
+from urllib import parse
 
 from openstack import proxy
 
+from otcextensions.sdk import instrumentation
+from otcextensions.sdk import metrics
+
+#: Number of URL templates whose metric names are remembered
+METRIC_NAME_CACHE_SIZE = 1024
+
+# Path segments standing for a resource (UUIDs, with or without dashes,
+# and numeric ids)
+_ID_SEGMENT = re.compile(
+    r'^(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+    r'[0-9a-fA-F]{12}|[0-9a-fA-F]{32}|\d+)$')
+_METRIC_NAMES = {}
+
 
 def normalize_metric_name(name):
     name = name.replace('.', '_')
@@ -19,35 +34,113 @@ def normalize_metric_name(name):
     return name
 
 
+def _endpoint_template(path, project_id=None):
+    """Return the path with its project and resource ids replaced"""
+    return '/'.join(
+        '{project_id}' if project_id and segment == project_id
+        else '{id}' if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split('/'))
+
+
+def _url_template(url, project_id=None):
+    """Return the URL with the ids in its path replaced"""
+    parts = parse.urlsplit(url)
+    return parts.netloc + _endpoint_template(parts.path, project_id)
+
+
+def _content_length(headers):
+    try:
+        return int(headers.get('Content-Length') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _send_statsd(client, batch):
+    pipeline = client.pipeline() if hasattr(client, 'pipeline') else None
+    target = client if pipeline is None else pipeline
+    for method, args in batch:
+        getattr(target, method)(*args)
+    if pipeline is not None:
+        pipeline.send()
+
+
+def _write_influxdb(client, points):
+    client.write_points(points)
+
+
 class Proxy(proxy.Proxy):
 
+    def _metric_name(self, url):
+        """Return the metric name of a URL, cached per URL template"""
+        project_id = self.session.get_project_id()
+        key = (type(self), self.service_type, project_id,
+               _url_template(url, project_id))
+        name = _METRIC_NAMES.get(key)
+        if name is None:
+            if len(_METRIC_NAMES) >= METRIC_NAME_CACHE_SIZE:
+                _METRIC_NAMES.clear()
+            name = _METRIC_NAMES[key] = '_'.join(
+                normalize_metric_name(f) for f in
+                self._extract_name(url, self.service_type, project_id))
+        return name
+
+    def _report_stats(self, response, url=None, method=None, exc=None):
+        if self._statsd_client:
+            self._report_stats_statsd(response, url, method, exc)
+        if self._prometheus_counter and self._prometheus_histogram:
+            self._report_stats_prometheus(response, url, method, exc)
+        if self._influxdb_client:
+            self._report_stats_influxdb(response, url, method, exc)
+        if instrumentation.get_registry() is not None:
+            self._report_stats_instrumentation(response, url, method, exc)
+
+    def _report_stats_instrumentation(self, response, url=None, method=None,
+                                      exc=None):
+        try:
+            registry = instrumentation.get_registry()
+            if registry is None:
+                return
+            if response is not None and not url:
+                url = response.request.url
+            if response is not None and not method:
+                method = response.request.method
+            endpoint = _endpoint_template(
+                parse.urlsplit(url).path, self.session.get_project_id())
+            if response is None:
+                registry.report_request(self.service_type, method, endpoint)
+                return
+            registry.report_request(
+                self.service_type, method, endpoint,
+                status_code=str(response.status_code),
+                duration=response.elapsed.total_seconds(),
+                bytes_sent=_content_length(response.request.headers),
+                bytes_received=_content_length(response.headers))
+        except Exception:
+            self.log.exception("Exception recording instrumentation")
+
     def _report_stats_statsd(self, response, url=None, method=None, exc=None):
         try:
             if response is not None and not url:
                 url = response.request.url
             if response is not None and not method:
                 method = response.request.method
-            name_parts = [
-                normalize_metric_name(f) for f in
-                self._extract_name(
-                    url, self.service_type, self.session.get_project_id())
-            ]
 
             key = '.'.join(
                 [self._statsd_prefix,
                  normalize_metric_name(self.service_type), method,
-                 '_'.join(name_parts)
+                 self._metric_name(url)
                  ])
+            buffer = metrics.get_buffer(self._statsd_client, _send_statsd)
             if response is not None:
                 duration = int(response.elapsed.total_seconds() * 1000)
-                metric_name = '%s.%s' % (key, str(response.status_code)),
-                self._statsd_client.timing(metric_name, duration)
-                self._statsd_client.incr(metric_name)
+                metric_name = '%s.%s' % (key, str(response.status_code))
+                buffer.put(('timing', (metric_name, duration)))
+                buffer.put(('incr', (metric_name,)))
                 if duration > 1000:
-                    self._statsd_client.incr('%s.over_1000' % key)
+                    buffer.put(('incr', ('%s.over_1000' % key,)))
             elif exc is not None:
-                self._statsd_client.incr('%s.failed' % key)
-            self._statsd_client.incr('%s.attempted' % key)
+                buffer.put(('incr', ('%s.failed' % key,)))
+            buffer.put(('incr', ('%s.attempted' % key,)))
         except Exception:
             self.log.exception("Exception reporting metrics")
 
@@ -63,12 +156,7 @@ class Proxy(proxy.Proxy):
             method = response.request.method
         tags = dict(
             method=method,
-            name='_'.join([
-                normalize_metric_name(f) for f in
-                self._extract_name(
-                    url, self.service_type,
-                    self.session.get_project_id())
-            ])
+            name=self._metric_name(url)
         )
         fields = dict(
             attempted=1
@@ -92,12 +180,10 @@ class Proxy(proxy.Proxy):
             if self._influxdb_config else 'openstack_api'
         # Note(gtema) append service name into the measurement name
         measurement = '%s.%s' % (measurement, self.service_type)
-        data = [dict(
+        # Points are written in batches by a background thread, see
+        # otcextensions.sdk.metrics
+        metrics.get_buffer(self._influxdb_client, _write_influxdb).put(dict(
             measurement=measurement,
             tags=tags,
             fields=fields
-        )]
-        try:
-            self._influxdb_client.write_points(data)
-        except Exception:
-            self.log.exception('Error writing statistics to InfluxDB')
+        ))
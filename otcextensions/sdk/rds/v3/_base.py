@@ -12,6 +12,9 @@
 from openstack import exceptions
 from openstack import resource
 
+from otcextensions.sdk import find_cache
+from otcextensions.sdk import sdk_resource
+
 
 class Resource(resource.Resource):
 
@@ -24,7 +27,19 @@ class Resource(resource.Resource):
 
     @classmethod
     def list(cls, session, paginated=True, base_path=None,
-             allow_unknown_params=False, **params):
+             allow_unknown_params=False, prefetch=0, raw=False, fields=None,
+             **params):
+        """This method is a generator which yields resource objects.
+
+        :param int prefetch: Number of pages fetched concurrently once the
+            first page tells the total count. By default pages are fetched
+            one after another.
+        :param bool raw: Yield compact
+            :class:`~otcextensions.sdk.sdk_resource.Record` objects instead
+            of resources.
+        :param fields: Yield tuples of the given attributes instead of
+            resources.
+        """
 
         if not cls.allow_list:
             raise exceptions.MethodNotSupported(cls, "list")
@@ -42,6 +57,22 @@ class Resource(resource.Resource):
 
         limit = query_params.get('limit')
 
+        build = sdk_resource.record_factory(cls, raw, fields)
+        if build is None:
+            connection = session._get_connection()
+
+            def build(raw_resource):
+                return cls.existing(
+                    microversion=microversion,
+                    connection=connection,
+                    **raw_resource)
+
+        if paginated and prefetch:
+            yield from sdk_resource.list_prefetched(
+                cls, session, uri, query_params, 'offset', 'total_count',
+                prefetch, microversion=microversion, build=build)
+            return
+
         # Track the total number of resources yielded so we can paginate
         # swift objects
         total_yielded = query_params.get('offset', 0)
@@ -69,10 +100,7 @@ class Resource(resource.Resource):
 
             marker = None
             for raw_resource in resources:
-                value = cls.existing(
-                    microversion=microversion,
-                    connection=session._get_connection(),
-                    **raw_resource)
+                value = build(raw_resource)
                 marker = total_yielded + 1
                 yield value
                 total_yielded += 1
@@ -124,6 +152,15 @@ class Resource(resource.Resource):
                  is found and ignore_missing is ``False``.
         """
         session = cls._get_session(session)
+        return find_cache.find(
+            cls, session, name_or_id,
+            lambda: cls._find_uncached(
+                session, name_or_id, ignore_missing, **params),
+            **params)
+
+    @classmethod
+    def _find_uncached(cls, session, name_or_id, ignore_missing=True,
+                       **params):
         # Try to short-circuit by looking directly for a matching ID.
         try:
             match = cls.existing(
@@ -134,6 +171,11 @@ class Resource(resource.Resource):
         except exceptions.SDKException:
             pass
 
+        # Let the server filter by name where it can
+        if ('name' in cls._query_mapping._mapping.keys()
+                and 'name' not in params):
+            params['name'] = name_or_id
+
         data = cls.list(session, **params)
 
         result = cls._get_one_match(name_or_id, data)
@@ -15,6 +15,8 @@ import datetime
 from openstack import proxy
 from openstack import resource
 
+from otcextensions.sdk import bulk
+from otcextensions.sdk import find_cache
 from otcextensions.sdk import job
 from otcextensions.sdk.rds.v3 import backup as _backup
 from otcextensions.sdk.rds.v3 import configuration as _configuration
@@ -23,7 +25,8 @@ from otcextensions.sdk.rds.v3 import flavor as _flavor
 from otcextensions.sdk.rds.v3 import instance as _instance
 
 
-class Proxy(proxy.Proxy, job.JobProxyMixin):
+class Proxy(find_cache.FindCacheProxyMixin, bulk.BulkProxyMixin,
+            proxy.Proxy, job.JobProxyMixin):
 
     skip_discovery = True
 
@@ -118,6 +121,38 @@ class Proxy(proxy.Proxy, job.JobProxyMixin):
         """
         return self._get(_instance.Instance, instance)
 
+    def get_instances(self, instances, workers=bulk.DEFAULT_BULK_WORKERS):
+        """Get many instances concurrently
+
+        :param instances: An iterable of IDs of instances or
+            :class:`~otcextensions.sdk.rds.v3.instance.Instance` instances.
+        :param int workers: Number of instances fetched concurrently.
+
+        :returns: A list of ``(instance, result, error)`` tuples in the
+            order of ``instances``, where ``result`` is the fetched
+            :class:`~otcextensions.sdk.rds.v3.instance.Instance` or
+            ``None`` if fetching it raised ``error``.
+        """
+        return self._get_many(_instance.Instance, instances, workers=workers)
+
+    def delete_instances(self, instances, ignore_missing=True,
+                         workers=bulk.DEFAULT_BULK_WORKERS):
+        """Delete many instances concurrently
+
+        :param instances: An iterable of IDs of instances or
+            :class:`~otcextensions.sdk.rds.v3.instance.Instance` instances.
+        :param bool ignore_missing: When set to ``False`` a nonexistent
+            instance is reported with a
+            :class:`~openstack.exceptions.ResourceNotFound` error.
+        :param int workers: Number of instances deleted concurrently.
+
+        :returns: A list of ``(instance, result, error)`` tuples in the
+            order of ``instances``.
+        """
+        return self._delete_many(_instance.Instance, instances,
+                                 ignore_missing=ignore_missing,
+                                 workers=workers)
+
     def find_instance(self, name_or_id, ignore_missing=True):
         """Find a single instance
 
@@ -135,11 +170,22 @@ class Proxy(proxy.Proxy, job.JobProxyMixin):
                           name_or_id,
                           ignore_missing=ignore_missing)
 
+    def resolve_instances(self, names):
+        """Resolve instance names to ids with a single listing
+
+        :param names: Names or IDs of instances.
+
+        :returns: A dict of the given names to instance IDs, names no
+            instance matches are left out.
+        """
+        return self._resolve(_instance.Instance, names)
+
     def instances(self, **params):
         """Return a generator of instances
 
         :param dict params: Optional query parameters to be sent to limit
-            the instances being returned.
+            the instances being returned. ``prefetch`` sets the number of
+            pages fetched concurrently.
 
         :returns: A generator of instance objects.
         """
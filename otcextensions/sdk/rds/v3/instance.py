@@ -182,32 +182,8 @@ class Instance(_base.Resource):
         dict.update(self, self.to_dict())
 
     @classmethod
-    def find(cls, session, name_or_id, ignore_missing=True, **params):
-        """Find a resource by its name or id.
-
-        :param session: The session to use for making this request.
-            :type session: :class:`~keystoneauth1.adapter.Adapter`
-        :param name_or_id: This resource's identifier, if needed by
-            the request. The default is ``None``.
-        :param bool ignore_missing: When set to ``False``
-            :class:`~openstack.exceptions.ResourceNotFound` will be
-            raised when the resource does not exist.
-            When set to ``True``, None will be returned when
-            attempting to find a nonexistent resource.
-        :param dict params: Any additional parameters to be passed into
-            underlying methods, such as to
-            :meth:`~openstack.resource.Resource.existing`
-            in order to pass on URI parameters.
-
-        :return: The :class:`Resource` object matching the given name or id
-            or None if nothing matches.
-        :raises: :class:`openstack.exceptions.DuplicateResource` if more
-            than one resource is found for this request.
-        :raises: :class:`openstack.exceptions.ResourceNotFound` if nothing
-            is found and ignore_missing is ``False``.
-        """
-        session = cls._get_session(session)
-
+    def _find_uncached(cls, session, name_or_id, ignore_missing=True,
+                       **params):
         result = cls._find(session, name_or_id, id=name_or_id, **params)
         if not result:
             result = cls._find(session, name_or_id, name=name_or_id, **params)
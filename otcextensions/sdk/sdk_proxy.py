@@ -13,14 +13,21 @@ from openstack import _log
 from openstack import exceptions
 from openstack import proxy as os_proxy
 
+from otcextensions.sdk import bulk
+from otcextensions.sdk import find_cache
+
 _logger = _log.setup_logging('openstack')
 
 
-class Proxy(os_proxy.Proxy):
+class Proxy(bulk.BulkProxyMixin, os_proxy.Proxy):
+
+    #: Whether ``_find`` remembers names in the name cache of the
+    #: connection, set to ``False`` to always look them up
+    use_find_cache = True
 
     def _find(self, resource_type, name_or_id, ignore_missing=True,
               endpoint_override=None, headers=None, requests_auth=None,
-              **attrs):
+              use_cache=None, **attrs):
         """Find a resource
 
         :param name_or_id: The name or ID of a resource to find.
@@ -29,18 +36,39 @@ class Proxy(os_proxy.Proxy):
                     raised when the resource does not exist.
                     When set to ``True``, None will be returned when
                     attempting to find a nonexistent resource.
+        :param bool use_cache: Whether to use the name cache, by default
+                    :attr:`use_find_cache` of the proxy.
         :param dict attrs: Attributes to be passed onto the
                            :meth:`~openstack.resource.Resource.find`
                            method, such as query parameters.
 
+        Names found are remembered in the name cache of the connection,
+        see :mod:`otcextensions.sdk.find_cache`, unless the request is
+        customized by endpoint_override, headers or requests_auth. A cached
+        name is reused for
+        :data:`~otcextensions.sdk.find_cache.DEFAULT_TTL` seconds (300)
+        after the resource is fetched by its id to check it still has the
+        name. Creating or deleting a resource of the type through this
+        proxy drops the cached names, changes made elsewhere only once the
+        check fails or the time to live passed.
+
         :returns: An instance of ``resource_type`` or None
         """
-        result = resource_type.find(self, name_or_id,
-                                    ignore_missing=ignore_missing,
-                                    endpoint_override=endpoint_override,
-                                    headers=headers,
-                                    requests_auth=requests_auth,
-                                    **attrs)
+        def _find():
+            return resource_type.find(self, name_or_id,
+                                      ignore_missing=ignore_missing,
+                                      endpoint_override=endpoint_override,
+                                      headers=headers,
+                                      requests_auth=requests_auth,
+                                      **attrs)
+
+        if use_cache is None:
+            use_cache = self.use_find_cache
+        if not use_cache or endpoint_override or headers or requests_auth:
+            result = _find()
+        else:
+            result = find_cache.find(
+                resource_type, self, name_or_id, _find, **attrs)
         # Inject endpoint_override into the resource for potential
         # direct use (i.e. instance.reboot)
         if endpoint_override:
@@ -97,6 +125,8 @@ class Proxy(os_proxy.Proxy):
             if ignore_missing:
                 return None
             raise
+        finally:
+            find_cache.get_cache(self).invalidate(resource_type)
 
         return rv
 
@@ -157,6 +187,7 @@ class Proxy(os_proxy.Proxy):
             requests_auth=requests_auth,
             prepend_key=prepend_key,
         )
+        find_cache.get_cache(self).invalidate(resource_type)
 
         # Inject endpoint_override into the resource for potential
         # direct use (i.e. instance.reboot)
@@ -236,6 +267,20 @@ class Proxy(os_proxy.Proxy):
                         requests_auth=requests_auth,
                         **attrs)
 
+    def _resolve(self, resource_type, names, **attrs):
+        """Resolve names of a resource with a single listing
+
+        :param resource_type: The type of resource to resolve.
+        :type resource_type: :class:`~openstack.resource.Resource`
+        :param names: Names or ids of resources.
+        :param dict attrs: Attributes to be passed onto the
+            :meth:`~openstack.resource.Resource.list` method.
+
+        :returns: A dict of the given names to ids, names nothing matches
+            are left out.
+        """
+        return find_cache.resolve(resource_type, self, names, **attrs)
+
     def _head(self, resource_type, value=None,
               endpoint_override=None, headers=None, requests_auth=None,
               **attrs):
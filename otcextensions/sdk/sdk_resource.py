@@ -9,16 +9,98 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import collections
+import concurrent.futures
+import itertools
+import queue
+import threading
+
 from openstack import _log
 from openstack import exceptions
 from openstack import resource
 
 from otcextensions.common import exc
 from otcextensions.common import utils
+from otcextensions.sdk import instrumentation
 
 _logger = _log.setup_logging('openstack')
 
 
+class Record:
+    """Compact record of a listed resource
+
+    Subclasses hold the body attributes of a resource type in
+    ``__slots__`` with the values as returned by the server.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and \
+            self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join(
+            '%s=%r' % item for item in self.to_dict().items()))
+
+
+_RECORD_TYPES = {}
+
+
+def record_factory(resource_type, raw=False, fields=None):
+    """Return a callable turning a raw resource into a compact record
+
+    :param resource_type: Resource class being listed.
+    :param bool raw: Build :class:`Record` instances holding all body
+        attributes of the resource type.
+    :param fields: Attribute names to build plain tuples of instead.
+
+    Values are taken as returned by the server, without type conversion.
+    Besides the body attributes, the attributes of
+    ``resource_type._record_keys`` (a dict of attribute names to keys of
+    the listed resource) are included. Returns ``None`` when neither raw
+    nor fields is requested.
+
+    :raises: ValueError if a field is an attribute of the resource which
+        is not part of a listed resource, i.e. a header.
+    """
+    if not (raw or fields):
+        return None
+    mapping = {
+        attr: key for key, attr in resource_type._body_mapping().items()}
+    alternate_id = resource_type._alternate_id()
+    if alternate_id:
+        mapping['id'] = alternate_id
+    mapping.update(getattr(resource_type, '_record_keys', {}))
+    if fields:
+        headers = set(resource_type._header_mapping().values())
+        for field in fields:
+            if field in headers and field not in mapping:
+                raise ValueError(
+                    '%s is not an attribute of listed %s resources' % (
+                        field, resource_type.__name__))
+        keys = [mapping.get(field, field) for field in fields]
+        return lambda raw_resource: tuple(
+            raw_resource.get(key) for key in keys)
+
+    record_type = _RECORD_TYPES.get(resource_type)
+    if record_type is None:
+        record_type = type(
+            resource_type.__name__ + 'Record', (Record,),
+            {'__slots__': tuple(sorted(mapping))})
+        _RECORD_TYPES[resource_type] = record_type
+    keys = [mapping[attr] for attr in record_type.__slots__]
+    return lambda raw_resource: record_type(
+        *[raw_resource.get(key) for key in keys])
+
+
 class Resource(resource.Resource):
 
     service_expectes_json_type = False
@@ -300,7 +382,7 @@ class Resource(resource.Resource):
     @classmethod
     def list(cls, session, paginated=False,
              endpoint_override=None, headers=None, requests_auth=None,
-             **params):
+             read_ahead=0, raw=False, fields=None, **params):
         """Override default list to incorporate endpoint overriding
         and custom headers
 
@@ -327,6 +409,13 @@ class Resource(resource.Resource):
             :data:`~openstack.resource.Resource.base_path` format string
             to see if any path fragments need to be filled in by the contents
             of this argument.
+        :param int read_ahead: Number of pages fetched ahead on a background
+            thread while the current page is consumed. By default the next
+            page is only requested once the current one is drained.
+        :param bool raw: Yield compact :class:`Record` objects instead of
+            resources.
+        :param fields: Yield tuples of the given attributes instead of
+            resources.
 
         :return: A generator of :class:`Resource` objects.
         :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
@@ -345,14 +434,42 @@ class Resource(resource.Resource):
         query_params = cls._query_mapping._transpose(params, cls)
         uri = cls.base_path % params
 
-        limit = query_params.get('limit')
-
         # Build additional arguments to the GET call
         get_args = cls._prepare_override_args(
             endpoint_override=endpoint_override,
             # request_headers=request.headers,
             additional_headers=headers)
 
+        def _resources(response):
+            if response.status_code == 204 or \
+                    (response.status_code == 200 and not response.json()):
+                # Some bad APIs (i.e. DCS.Backup.List) return emptiness
+                return None
+            data = response.json()
+            if cls.resources_key:
+                return data, data[cls.resources_key]
+            return data, data
+
+        pages = cls._list_pages(
+            session, uri, query_params, get_args, paginated, _resources)
+        if read_ahead:
+            pages = _read_ahead(pages, read_ahead)
+        build = record_factory(cls, raw, fields) or (
+            lambda raw_resource: cls.existing(**raw_resource))
+        for page in pages:
+            for raw_resource in page:
+                yield build(raw_resource)
+
+    @classmethod
+    def _list_pages(cls, session, uri, query_params, get_args, paginated,
+                    resources_from):
+        """Yield the raw resources of the listing page by page
+
+        :param resources_from: Callable returning ``(data, resources)`` of
+            a response or ``None`` if it carries no data.
+        """
+        limit = query_params.get('limit')
+
         total_yielded = 0
         while uri:
             response = session.get(
@@ -360,26 +477,21 @@ class Resource(resource.Resource):
                 params=query_params.copy(),
                 **get_args
             )
+            _count_page(cls, session)
             exceptions.raise_from_response(response)
-            if response.status_code == 204 or \
-                    (response.status_code == 200 and not response.json()):
-                # Some bad APIs (i.e. DCS.Backup.List) return emptiness
+            result = resources_from(response)
+            if result is None:
                 return
-            data = response.json()
+            data, resources = result
 
             # Discard any existing pagination keys
             query_params.pop('marker', None)
             query_params.pop('limit', None)
 
-            if cls.resources_key:
-                resources = data[cls.resources_key]
-            else:
-                resources = data
-
             if not isinstance(resources, list):
                 resources = [resources]
 
-            marker = None
+            page = []
             for raw_resource in resources:
                 # Do not allow keys called "self" through. Glance chose
                 # to name a key "self", so we need to pop it out because
@@ -390,12 +502,12 @@ class Resource(resource.Resource):
 
                 if cls.resource_key and cls.resource_key in raw_resource:
                     raw_resource = raw_resource[cls.resource_key]
+                page.append(raw_resource)
 
-                value = cls.existing(**raw_resource)
-
-                marker = value.id
-                yield value
-                total_yielded += 1
+            # the marker is known before the page is consumed
+            marker = cls.existing(**page[-1]).id if page else None
+            total_yielded += len(page)
+            yield page
 
             if resources and paginated:
                 uri, next_params = cls._get_next_link(
@@ -417,7 +529,8 @@ class Resource(resource.Resource):
 
     @classmethod
     def list_ext(cls, session, paginated=False,
-                 endpoint_override=None, headers=None, **params):
+                 endpoint_override=None, headers=None, read_ahead=0,
+                 raw=False, fields=None, **params):
         """Override default list to incorporate endpoint overriding
         and custom headers
 
@@ -444,6 +557,13 @@ class Resource(resource.Resource):
             :data:`~openstack.resource.Resource.base_path` format string
             to see if any path fragments need to be filled in by the contents
             of this argument.
+        :param int read_ahead: Number of pages fetched ahead on a background
+            thread while the current page is consumed. By default the next
+            page is only requested once the current one is drained.
+        :param bool raw: Yield compact :class:`Record` objects instead of
+            resources.
+        :param fields: Yield tuples of the given attributes instead of
+            resources.
 
         :return: A generator of :class:`Resource` objects.
         :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
@@ -474,60 +594,28 @@ class Resource(resource.Resource):
         else:
             uri = cls.list_path % uri_params
 
-        limit = query_params.get('limit')
-
         # Build additional arguments to the GET call
         get_args = cls._prepare_override_args(
             endpoint_override=endpoint_override,
             # request_headers=request.headers,
             additional_headers=headers)
 
-        total_yielded = 0
-        while uri:
-            response = session.get(
-                uri,
-                params=query_params.copy(),
-                **get_args
-            )
-            exceptions.raise_from_response(response)
+        def _resources(response):
             data = response.json()
-
-            # Discard any existing pagination keys
-            query_params.pop('marker', None)
-            query_params.pop('limit', None)
-
             if cls.resources_key:
-                resources = cls.find_value_by_accessor(data, cls.resources_key)
-            else:
-                resources = data
-
-            if not isinstance(resources, list):
-                resources = [resources]
-
-            marker = None
-            for raw_resource in resources:
-                # Do not allow keys called "self" through. Glance chose
-                # to name a key "self", so we need to pop it out because
-                # we can't send it through cls.existing and into the
-                # Resource initializer. "self" is already the first
-                # argument and is practically a reserved word.
-                raw_resource.pop("self", None)
-
-                if cls.resource_key and cls.resource_key in raw_resource:
-                    raw_resource = raw_resource[cls.resource_key]
-
-                value = cls.existing(**raw_resource)
-
-                marker = value.id
-                yield value
-                total_yielded += 1
-
-            if resources and paginated:
-                uri, next_params = cls._get_next_link(
-                    uri, response, data, marker, limit, total_yielded)
-                query_params.update(next_params)
-            else:
-                return
+                return data, cls.find_value_by_accessor(
+                    data, cls.resources_key)
+            return data, data
+
+        pages = cls._list_pages(
+            session, uri, query_params, get_args, paginated, _resources)
+        if read_ahead:
+            pages = _read_ahead(pages, read_ahead)
+        build = record_factory(cls, raw, fields) or (
+            lambda raw_resource: cls.existing(**raw_resource))
+        for page in pages:
+            for raw_resource in page:
+                yield build(raw_resource)
 
     @classmethod
     def find(cls, session, name_or_id, ignore_missing=True,
@@ -633,3 +721,201 @@ class Resource(resource.Resource):
 
         self._translate_response(response, has_body=has_body)
         return self
+
+
+def _count_page(cls, session):
+    instrumentation.increment(
+        'pages_total', service_type=getattr(session, 'service_type', None),
+        resource=cls.__name__)
+
+
+def _read_ahead(pages, depth):
+    """Iterate pages on a background thread
+
+    Up to ``depth`` pages are buffered, so the next requests overlap with
+    the processing of the current page.
+    """
+    buffer = queue.Queue(depth)
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for page in pages:
+                if not _put(('page', page)):
+                    return
+            _put(('done', None))
+        except Exception as e:
+            _put(('error', e))
+
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == 'done':
+                return
+            if kind == 'error':
+                raise value
+            yield value
+    finally:
+        stop.set()
+
+
+def _prefetch_pages(fetch, offset, page_size, total, workers):
+    """Fetch the pages from offset up to total concurrently
+
+    :param fetch: Callable returning ``(resources, total)`` of the page
+        starting at the given offset.
+
+    Up to ``workers`` pages are requested at once and yielded in order.
+    The total reported by every page is honored, so pages added meanwhile
+    are fetched as well. The first empty page ends the listing.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(workers)
+    pending = collections.deque()
+    try:
+        while True:
+            while len(pending) < workers and offset < total:
+                pending.append(executor.submit(fetch, offset))
+                offset += page_size
+            if not pending:
+                return
+            resources, total = pending.popleft().result()
+            if not resources:
+                return
+            total = total or 0
+            yield resources
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def list_prefetched(cls, session, uri, query_params, offset_key, total_key,
+                    workers, microversion=None, uri_params=None, build=None):
+    """Yield the resources of an offset paginated listing
+
+    The first page is fetched on its own and tells the total count under
+    ``total_key``. The remaining pages are then requested up to ``workers``
+    at a time while the resources are still yielded in order.
+
+    :param cls: Resource class being listed.
+    :param query_params: Transposed query parameters of the first page.
+    :param offset_key: Query parameter holding the offset of a page.
+    :param total_key: Response key holding the total count.
+    :param int workers: Number of pages fetched concurrently.
+    :param build: Callable turning a raw resource into the yielded value,
+        see :func:`record_factory`. Defaults to ``cls.existing``.
+    """
+    if build is None:
+        connection = session._get_connection()
+
+        def build(raw_resource):
+            return cls.existing(
+                microversion=microversion,
+                connection=connection,
+                **raw_resource)
+
+    def _fetch(params):
+        response = session.get(
+            uri,
+            headers={"Accept": "application/json"},
+            params=params,
+            microversion=microversion)
+        _count_page(cls, session)
+        exceptions.raise_from_response(response)
+        data = response.json()
+        if cls.resources_key:
+            resources = data[cls.resources_key]
+        else:
+            resources = data
+        if not isinstance(resources, list):
+            resources = [resources]
+        return resources, data.get(total_key)
+
+    offset = int(query_params.get(offset_key) or 0)
+    resources, total = _fetch(query_params.copy())
+    pages = [resources]
+    if resources and total:
+        page_size = int(query_params.get('limit') or len(resources))
+
+        def _fetch_page(page_offset):
+            params = dict(query_params, limit=page_size)
+            params[offset_key] = page_offset
+            return _fetch(params)
+
+        pages = itertools.chain(pages, _prefetch_pages(
+            _fetch_page, offset + len(resources), page_size, total, workers))
+
+    for page in pages:
+        for raw_resource in page:
+            raw_resource.update(uri_params or {})
+            yield build(raw_resource)
+
+
+def list_records(cls, session, build, paginated=True, base_path=None,
+                 allow_unknown_params=False, **params):
+    """Yield records of a listing without instantiating the resources
+
+    Issues the same requests as :meth:`openstack.resource.Resource.list`
+    but passes every raw resource to ``build``, see :func:`record_factory`.
+    Client side filtering is not supported.
+    """
+    if not cls.allow_list:
+        raise exceptions.MethodNotSupported(cls, "list")
+    session = cls._get_session(session)
+    microversion = cls._get_microversion(session, action='list')
+
+    if base_path is None:
+        base_path = cls.base_path
+    api_filters = cls._query_mapping._validate(
+        params, base_path=base_path,
+        allow_unknown_params=allow_unknown_params)
+    query_params = cls._query_mapping._transpose(api_filters, cls)
+    uri = base_path % params
+    limit = query_params.get('limit')
+    id_key = cls._alternate_id() or 'id'
+
+    total_yielded = 0
+    while uri:
+        response = session.get(
+            uri,
+            headers={"Accept": "application/json"},
+            params=query_params.copy(),
+            microversion=microversion)
+        _count_page(cls, session)
+        exceptions.raise_from_response(response)
+        data = response.json()
+
+        # Discard any existing pagination keys
+        query_params.pop('marker', None)
+        query_params.pop('limit', None)
+
+        if cls.resources_key:
+            resources = data[cls.resources_key]
+        else:
+            resources = data
+        if not isinstance(resources, list):
+            resources = [resources]
+
+        marker = None
+        for raw_resource in resources:
+            raw_resource.pop("self", None)
+            marker = raw_resource.get(id_key)
+            yield build(raw_resource)
+            total_yielded += 1
+
+        if resources and paginated:
+            uri, next_params = cls._get_next_link(
+                uri, response, data, marker, limit, total_yielded)
+            query_params.update(next_params)
+        else:
+            return
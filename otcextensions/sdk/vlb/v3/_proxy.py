@@ -13,6 +13,7 @@
 from openstack import proxy
 from openstack import resource
 
+from otcextensions.sdk import bulk
 from otcextensions.sdk.vlb.v3 import availability_zone as _availability_zone
 from otcextensions.sdk.vlb.v3 import certificate as _certificate
 from otcextensions.sdk.vlb.v3 import flavor as _flavor
@@ -29,7 +30,7 @@ from otcextensions.sdk.vlb.v3 import pool as _pool
 from otcextensions.sdk.vlb.v3 import quota as _quota
 
 
-class Proxy(proxy.Proxy):
+class Proxy(bulk.BulkProxyMixin, proxy.Proxy):
     skip_discovery = True
 
     # ======== Load balancer ========
@@ -550,6 +551,63 @@ class Proxy(proxy.Proxy):
         return self._update(_member.Member, member,
                             pool_id=poolobj.id, **attrs)
 
+    def get_members(self, members, pool, workers=bulk.DEFAULT_BULK_WORKERS):
+        """Get many members of a pool concurrently
+
+        :param members: An iterable of IDs of members or
+            :class:`~otcextensions.sdk.vlb.v3.member.Member` instances.
+        :param pool: The pool can be either the ID of a pool or a
+            :class:`~otcextensions.sdk.vlb.v3.pool.Pool` instance
+            that the members belong to.
+        :param int workers: Number of members fetched concurrently.
+        :returns: A list of ``(member, result, error)`` tuples in the order
+            of ``members``, where ``result`` is the fetched
+            :class:`~otcextensions.sdk.vlb.v3.member.Member` or ``None``
+            if fetching it raised ``error``.
+        """
+        poolobj = self._get_resource(_pool.Pool, pool)
+        return self._get_many(_member.Member, members, workers=workers,
+                              pool_id=poolobj.id)
+
+    def update_members(self, updates, pool,
+                       workers=bulk.DEFAULT_BULK_WORKERS):
+        """Update many members of a pool concurrently
+
+        :param updates: An iterable of ``(member, attrs)`` pairs of the ID
+            of a member or a :class:`~otcextensions.sdk.vlb.v3.member.Member`
+            instance and the attributes to update on it.
+        :param pool: The pool can be either the ID of a pool or a
+            :class:`~otcextensions.sdk.vlb.v3.pool.Pool` instance
+            that the members belong to.
+        :param int workers: Number of members updated concurrently.
+        :returns: A list of ``((member, attrs), result, error)`` tuples in
+            the order of ``updates``.
+        """
+        poolobj = self._get_resource(_pool.Pool, pool)
+        return self._update_many(_member.Member, updates, workers=workers,
+                                 pool_id=poolobj.id)
+
+    def delete_members(self, members, pool, ignore_missing=True,
+                       workers=bulk.DEFAULT_BULK_WORKERS):
+        """Delete many members of a pool concurrently
+
+        :param members: An iterable of IDs of members or
+            :class:`~otcextensions.sdk.vlb.v3.member.Member` instances.
+        :param pool: The pool can be either the ID of a pool or a
+            :class:`~otcextensions.sdk.vlb.v3.pool.Pool` instance
+            that the members belong to.
+        :param bool ignore_missing: When set to ``False`` a nonexistent
+            member is reported with a
+            :class:`~openstack.exceptions.ResourceNotFound` error.
+        :param int workers: Number of members deleted concurrently.
+        :returns: A list of ``(member, result, error)`` tuples in the order
+            of ``members``.
+        """
+        poolobj = self._get_resource(_pool.Pool, pool)
+        return self._delete_many(_member.Member, members,
+                                 ignore_missing=ignore_missing,
+                                 workers=workers, pool_id=poolobj.id)
+
     # ======= HealthMonitor =======
     def find_health_monitor(self, name_or_id, ignore_missing=True):
         """Find a single health monitor
@@ -13,6 +13,7 @@ from keystoneauth1 import adapter
 
 import mock
 
+from openstack import exceptions
 from openstack.tests.unit import base
 
 from otcextensions.sdk.auto_scaling.v1 import activity
@@ -93,3 +94,38 @@ class TestActivity(base.TestCase):
         self.assertEqual(obj['instance_deleted_list'],
                          sot.instance_deleted_list)
         self.assertEqual(obj['description'], sot.description)
+
+    def test_list_prefetch(self):
+        logs = EXAMPLE_LIST['scaling_activity_log']
+
+        def _get_page(uri, params=None, **kwargs):
+            start = params.get('start_number', 0)
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {
+                'scaling_activity_log': [dict(log) for log in logs[start:][
+                    :params.get('limit', 1)]],
+                'total_number': 2,
+                'start_number': start
+            }
+            return response
+
+        self.sess.get.side_effect = _get_page
+
+        result = list(activity.Activity.list(
+            self.sess, prefetch=2, scaling_group_id='group', limit=1))
+
+        self.assertEqual([log['id'] for log in logs],
+                         [r.id for r in result])
+        self.assertEqual(['group', 'group'],
+                         [r.scaling_group_id for r in result])
+        self.sess.get.assert_called_with(
+            '/scaling_activity_log/group',
+            headers={'Accept': 'application/json'},
+            params={'limit': 1, 'start_number': 1},
+            microversion=None)
+
+    def test_list_prefetch_lazy(self):
+        result = activity.Activity.list(
+            self.sess, prefetch=2, scaling_group_id='group', unknown=1)
+
+        self.assertRaises(exceptions.InvalidResourceQuery, list, result)
@@ -147,6 +147,34 @@ class TestCCEClusterNode(TestCCEProxy):
             }
         )
 
+    def test_get_nodes(self):
+        cluster = _cluster.Cluster(id='cluster_id')
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._get_many',
+            self.proxy.get_cluster_nodes,
+            method_args=[cluster, ['n1', 'n2']],
+            expected_args=[_cluster_node.ClusterNode, ['n1', 'n2']],
+            expected_kwargs={
+                'cluster_id': cluster.id,
+                'workers': 8
+            }
+        )
+
+    def test_delete_nodes(self):
+        cluster = _cluster.Cluster(id='cluster_id')
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._delete_many',
+            self.proxy.delete_cluster_nodes,
+            method_args=[cluster, ['n1', 'n2']],
+            method_kwargs={'workers': 2},
+            expected_args=[_cluster_node.ClusterNode, ['n1', 'n2']],
+            expected_kwargs={
+                'cluster_id': cluster.id,
+                'ignore_missing': True,
+                'workers': 2
+            }
+        )
+
     def test_server_wait_for(self):
         value = _cluster.Cluster(id='cluster_id')
         self.verify_wait_for_status(
@@ -231,17 +259,28 @@ class TestCCEJob(TestCCEProxy):
             expected_kwargs={}
         )
 
-    def test_wait_for_job(self):
-        self.proxy.get_job = mock.Mock(return_value='some_fake')
-        self.verify_wait_for_status(
-            self.proxy.wait_for_job,
-            method_args=['fake_job_id'],
-            expected_args=[
-                self.proxy, 'some_fake', 'success', ['FAILED'], 5, 3600
-            ],
-            expected_kwargs={'attribute': 'status.status'}
-        )
-        self.proxy.get_job.assert_called_with('fake_job_id')
+    @mock.patch('otcextensions.sdk.job.wait_for_job')
+    def test_wait_for_job(self, mock_wait):
+        self.proxy.wait_for_job('fake_job_id')
+
+        args, kwargs = mock_wait.call_args
+        self.assertIs(self.proxy, args[0])
+        self.assertEqual('fake_job_id', args[1].id)
+        self.assertEqual(('success', ['FAILED']), args[2:])
+        self.assertEqual(
+            {'interval': 5, 'wait': 3600, 'attribute': 'status.status'},
+            kwargs)
+
+    @mock.patch('otcextensions.sdk.job.wait_for_jobs')
+    def test_wait_for_jobs(self, mock_wait):
+        self.proxy.wait_for_jobs(['job1', 'job2'], interval=1)
+
+        args, kwargs = mock_wait.call_args
+        self.assertIs(self.proxy, args[0])
+        self.assertEqual(['job1', 'job2'], [j.id for j in args[1]])
+        self.assertEqual(('success', ['FAILED']), args[2:])
+        self.assertEqual('status.status', kwargs['attribute'])
+        self.assertEqual(1, kwargs['interval'])
 
 
 class TestExtractName(TestCCEProxy):
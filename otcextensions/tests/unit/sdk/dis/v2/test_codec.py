@@ -0,0 +1,120 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import base64
+import csv
+import io
+import json
+import os
+
+import fixtures
+import mock
+
+from openstack import exceptions
+from openstack.tests.unit import base
+
+from otcextensions.sdk.dis.v2 import _codec
+
+
+def _records(count):
+    return ({'sequence_number': str(i),
+             'data': base64.b64encode(b'record %d' % i).decode(),
+             'timestamp': 1600000000000 + i,
+             'timestamp_type': 'CreateTime'}
+            for i in range(count))
+
+
+class TestCodec(base.TestCase):
+
+    def test_encode(self):
+        self.assertEqual(['YWI=', 'w6k=', ''],
+                         _codec.encode([b'ab', 'é', b'']))
+
+    def test_encode_text(self):
+        self.assertEqual(['YWI=', 'YSBi', 'w6k='],
+                         _codec.encode_text(['YWI=', 'a b', 'é']))
+
+    def test_encode_text_matches_validate(self):
+        for value in ('YWI=', 'YWI', 'a b', 'YW==', 'Y===', 'abcd', 'ab+/',
+                      'ab-_', 'YWI=YWI=', 'é'):
+            try:
+                base64.b64decode(value, validate=True)
+                expected = value
+            except ValueError:
+                expected = base64.b64encode(value.encode()).decode()
+            self.assertEqual([expected], _codec.encode_text([value]), value)
+
+    def test_encode_text_excess_padding(self):
+        self.assertEqual(['WVdKaj0='], _codec.encode_text(['YWJj=']))
+
+    def test_decode(self):
+        records = [{'data': 'YWI='}, {'data': 'w6k='}]
+
+        self.assertEqual([b'ab', 'é'.encode()], _codec.decode(records))
+        self.assertEqual(['ab', 'é'], _codec.decode(records, text=True))
+
+    def test_to_columns(self):
+        columns = _codec.to_columns(_records(2), decode_data=True)
+
+        self.assertEqual(['0', '1'], columns['sequence_number'])
+        self.assertEqual([b'record 0', b'record 1'], columns['data'])
+        self.assertEqual(['CreateTime'] * 2, columns['timestamp_type'])
+
+    def test_write_csv(self):
+        f = io.StringIO()
+
+        _codec.write_csv(_records(25), f, chunk_size=10)
+
+        rows = list(csv.reader(io.StringIO(f.getvalue())))
+        self.assertEqual(list(_codec.DEFAULT_COLUMNS), rows[0])
+        self.assertEqual(26, len(rows))
+        self.assertEqual(
+            ['24', base64.b64encode(b'record 24').decode(),
+             '1600000000024', 'CreateTime'], rows[-1])
+
+    def test_write_csv_decoded(self):
+        f = io.StringIO()
+
+        _codec.write_csv(_records(3), f, columns=('sequence_number', 'data'),
+                         decode_data=True)
+
+        self.assertEqual(
+            'sequence_number,data\r\n0,record 0\r\n1,record 1\r\n'
+            '2,record 2\r\n', f.getvalue())
+
+    def test_write_jsonl(self):
+        f = io.StringIO()
+
+        _codec.write_jsonl(_records(3), f, decode_data=True, chunk_size=2)
+
+        lines = [json.loads(line) for line in f.getvalue().splitlines()]
+        self.assertEqual(3, len(lines))
+        self.assertEqual({'sequence_number': '2', 'data': 'record 2',
+                          'timestamp': 1600000000002,
+                          'timestamp_type': 'CreateTime'}, lines[2])
+
+    def test_write_parquet_without_pyarrow(self):
+        with mock.patch.object(_codec, 'pyarrow', None):
+            self.assertRaises(exceptions.SDKException, _codec.write_parquet,
+                              _records(1), 'records.parquet')
+
+    def test_write(self):
+        filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'records.csv')
+
+        _codec.write(_records(2), filename)
+
+        with open(filename) as f:
+            self.assertEqual(3, len(f.readlines()))
+
+    def test_write_unknown_format(self):
+        self.assertRaises(ValueError, _codec.write, _records(1),
+                          'records.xml', file_format='xml')
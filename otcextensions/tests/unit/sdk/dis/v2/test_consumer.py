@@ -0,0 +1,178 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import threading
+
+import mock
+
+from openstack import exceptions
+from openstack.tests.unit import base
+
+from otcextensions.sdk.dis.v2 import _consumer
+from otcextensions.sdk.dis.v2 import checkpoint
+from otcextensions.sdk.dis.v2 import data
+from otcextensions.sdk.dis.v2 import stream
+
+
+class FakeProxy(object):
+    """Serves ``records`` per partition, two per page
+
+    A cursor is ``partition:offset``, the last page of a closed partition
+    has no next cursor.
+    """
+
+    def __init__(self, records, closed=(), checkpoints=None, failures=0):
+        self.records = records
+        self.closed = closed
+        self.checkpoints = dict(checkpoints or {})
+        self.failures = failures
+        self.committed = []
+        self.cursor_requests = []
+        self.lock = threading.Lock()
+
+    def get_stream(self, stream_name):
+        return stream.Stream(partitions=[
+            {'partition_id': partition_id} for partition_id in self.records])
+
+    def get_checkpoint(self, stream_name, app_name, partition_id):
+        if partition_id not in self.checkpoints:
+            raise exceptions.NotFoundException('no checkpoint')
+        return checkpoint.Checkpoint(
+            sequence_number=self.checkpoints[partition_id])
+
+    def create_checkpoint(self, **attrs):
+        self.committed.append(attrs)
+
+    def get_data_cursor(self, stream_name, partition_id, **params):
+        self.cursor_requests.append((partition_id, params))
+        offset = 0
+        if params['cursor-type'] == 'AFTER_SEQUENCE_NUMBER':
+            offset = int(params['starting-sequence-number']) + 1
+        return data.Data(partition_cursor='%s:%d' % (partition_id, offset))
+
+    def get(self, uri, params):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise exceptions.HttpException('cursor expired')
+        partition_id, offset = params['partition-cursor'].split(':')
+        offset = int(offset)
+        records = self.records[partition_id]
+        page = [{'sequence_number': str(i), 'data': records[i]}
+                for i in range(offset, min(offset + 2, len(records)))]
+        next_cursor = '%s:%d' % (partition_id, offset + len(page))
+        if partition_id in self.closed and \
+                offset + len(page) >= len(records):
+            next_cursor = None
+        return mock.Mock(status_code=200, json=mock.Mock(return_value={
+            'records': page, 'next_partition_cursor': next_cursor}))
+
+
+class TestConsumer(base.TestCase):
+
+    def test_all_partitions(self):
+        proxy = FakeProxy({'p0': ['a', 'b', 'c'], 'p1': ['d']},
+                          closed=('p0', 'p1'))
+
+        with _consumer.Consumer(proxy, 'stream') as consumer:
+            records = list(consumer)
+
+        by_partition = {}
+        for partition_id, record in records:
+            by_partition.setdefault(partition_id, []).append(record['data'])
+        self.assertEqual({'p0': ['a', 'b', 'c'], 'p1': ['d']}, by_partition)
+        self.assertEqual([], proxy.committed)
+
+    def test_checkpoints(self):
+        proxy = FakeProxy({'p0': ['a', 'b', 'c', 'd'], 'p1': ['e']},
+                          closed=('p0', 'p1'), checkpoints={'p0': '1'})
+
+        consumer = _consumer.Consumer(
+            proxy, 'stream', app_name='app', checkpoint_interval=60)
+        records = [record['data'] for _partition, record in consumer]
+        consumer.close()
+
+        self.assertEqual(['c', 'd', 'e'], sorted(records))
+        self.assertIn(('p0', {'cursor-type': 'AFTER_SEQUENCE_NUMBER',
+                              'starting-sequence-number': '1'}),
+                      proxy.cursor_requests)
+        self.assertIn(('p1', {'cursor-type': 'TRIM_HORIZON'}),
+                      proxy.cursor_requests)
+        self.assertEqual(
+            [('p0', '3'), ('p1', '0')],
+            sorted((c['partition_id'], c['sequence_number'])
+                   for c in proxy.committed))
+        self.assertEqual('app', proxy.committed[0]['app_name'])
+
+    def test_tail(self):
+        proxy = FakeProxy({'p0': ['a', 'b', 'c']})
+
+        consumer = _consumer.Consumer(proxy, 'stream', poll_interval=0.01)
+        records = []
+        for _partition, record in consumer:
+            records.append(record['data'])
+            if len(records) == 3:
+                consumer.close()
+
+        self.assertEqual(['a', 'b', 'c'], records)
+
+    def test_retry_with_new_cursor(self):
+        proxy = FakeProxy({'p0': ['a', 'b', 'c']}, closed=('p0',),
+                          failures=1)
+
+        consumer = _consumer.Consumer(proxy, 'stream', poll_interval=0.01)
+        records = [record['data'] for _partition, record in consumer]
+
+        self.assertEqual(['a', 'b', 'c'], records)
+        self.assertEqual(2, len(proxy.cursor_requests))
+
+    def test_failure(self):
+        proxy = FakeProxy({'p0': ['a']}, failures=10)
+
+        consumer = _consumer.Consumer(proxy, 'stream', poll_interval=0.001,
+                                      retries=2)
+
+        self.assertRaises(exceptions.HttpException, list, consumer)
+        consumer.close()
+
+    def test_failure_stops_partitions(self):
+        proxy = FakeProxy({'p0': ['a'], 'p1': ['b']})
+        get = proxy.get
+
+        def _get(uri, params):
+            if params['partition-cursor'].startswith('p0'):
+                raise exceptions.HttpException('failed')
+            return get(uri, params)
+
+        proxy.get = _get
+        consumer = _consumer.Consumer(proxy, 'stream', poll_interval=0.001,
+                                      retries=1)
+
+        self.assertRaises(exceptions.HttpException, list, consumer)
+        # stopped without close
+        for thread in consumer._threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+
+    def test_prefetch(self):
+        proxy = FakeProxy({'p0': [str(i) for i in range(20)]},
+                          closed=('p0',))
+        proxy.get = mock.Mock(side_effect=proxy.get)
+
+        consumer = _consumer.Consumer(proxy, 'stream', prefetch=1,
+                                      partitions=['p0'])
+        pages = consumer.pages()
+        next(pages)
+        # one page consumed, one queued and one waiting for its slot
+        consumer._stop.wait(0.1)
+
+        self.assertEqual(3, proxy.get.call_count)
+        consumer.close()
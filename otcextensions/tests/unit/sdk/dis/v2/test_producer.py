@@ -0,0 +1,176 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import base64
+import threading
+
+import mock
+
+from openstack import exceptions
+from openstack.tests.unit import base
+
+from otcextensions.sdk.dis.v2 import _producer
+
+
+class FakeProxy(object):
+    """Accepts records unless their data is listed in ``fail``"""
+
+    def __init__(self, fail=()):
+        self.fail = dict(fail)
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def post(self, uri, json):
+        with self.lock:
+            self.requests.append(json)
+            results = []
+            for record in json['records']:
+                data = base64.b64decode(record['data']).decode()
+                if self.fail.get(data):
+                    self.fail[data] -= 1
+                    results.append({'error_code': 'DIS.4303',
+                                    'error_message': 'throttled'})
+                else:
+                    results.append({'partition_id': 'shardId-0000000000',
+                                    'sequence_number': data})
+        return mock.Mock(status_code=200, json=mock.Mock(
+            return_value={'failed_record_count': 0, 'records': results}))
+
+
+class TestProducer(base.TestCase):
+
+    def _producer(self, proxy, **kwargs):
+        kwargs.setdefault('retry_interval', 0)
+        producer = _producer.Producer(proxy, 'stream', **kwargs)
+        self.addCleanup(producer.close)
+        return producer
+
+    def test_batches(self):
+        proxy = FakeProxy()
+        producer = self._producer(proxy, batch_size=10, linger=0.2, workers=1)
+
+        for i in range(25):
+            producer.send(str(i))
+        self.assertTrue(producer.flush(5))
+
+        self.assertEqual([10, 10, 5],
+                         [len(r['records']) for r in proxy.requests])
+        self.assertEqual('stream', proxy.requests[0]['stream_name'])
+        self.assertEqual(base64.b64encode(b'0').decode(),
+                         proxy.requests[0]['records'][0]['data'])
+        self.assertEqual(25, producer.sent)
+
+    def test_batch_bytes(self):
+        proxy = FakeProxy()
+        producer = self._producer(proxy, batch_bytes=250, linger=0.2,
+                                  workers=1)
+
+        for i in range(4):
+            producer.send(b'x' * 40)
+        producer.flush(5)
+
+        self.assertEqual([2, 2], [len(r['records']) for r in proxy.requests])
+
+    def test_key_order(self):
+        proxy = FakeProxy()
+        producer = self._producer(proxy, batch_size=3, linger=0, workers=4)
+
+        for i in range(30):
+            producer.send(str(i), partition_key='k%d' % (i % 3))
+        producer.flush(5)
+
+        for key in ('k0', 'k1', 'k2'):
+            sent = [int(base64.b64decode(record['data']))
+                    for request in proxy.requests
+                    for record in request['records']
+                    if record['partition_key'] == key]
+            self.assertEqual(sorted(sent), sent)
+            self.assertEqual(10, len(sent))
+
+    def test_retry_failed_records(self):
+        proxy = FakeProxy(fail={'1': 2})
+        callback = mock.Mock()
+        producer = self._producer(proxy, linger=0.2, workers=1,
+                                  callback=callback)
+
+        for i in range(3):
+            producer.send(str(i))
+        producer.flush(5)
+
+        self.assertEqual([3, 1, 1],
+                         [len(r['records']) for r in proxy.requests])
+        self.assertEqual(3, producer.sent)
+        self.assertEqual(3, callback.call_count)
+
+    def test_give_up(self):
+        proxy = FakeProxy(fail={'1': 10})
+        callback = mock.Mock()
+        producer = self._producer(proxy, linger=0, workers=1, retries=1,
+                                  callback=callback)
+
+        producer.send('1')
+        producer.flush(5)
+
+        self.assertEqual(2, len(proxy.requests))
+        self.assertEqual(1, producer.failed)
+        callback.assert_called_once_with(
+            {'data': base64.b64encode(b'1').decode()},
+            {'error_code': 'DIS.4303', 'error_message': 'throttled'})
+
+    def test_request_error(self):
+        proxy = mock.Mock()
+        proxy.post.side_effect = exceptions.HttpException('broken')
+        producer = self._producer(proxy, linger=0, workers=1, retries=2)
+
+        producer.send('1')
+        producer.flush(5)
+
+        self.assertEqual(3, proxy.post.call_count)
+        self.assertEqual(1, producer.failed)
+
+    def test_request_error_code(self):
+        proxy = mock.Mock()
+        proxy.post.side_effect = exceptions.HttpException('broken')
+        callback = mock.Mock()
+        producer = self._producer(proxy, linger=0, workers=1, retries=0,
+                                  callback=callback)
+
+        producer.send('1')
+        producer.flush(5)
+
+        result = callback.call_args[0][1]
+        self.assertEqual(_producer.ERROR_REQUEST_FAILED, result['error_code'])
+        self.assertEqual(1, producer.failed)
+
+    def test_missing_result(self):
+        proxy = mock.Mock()
+        proxy.post.return_value = mock.Mock(
+            status_code=200, json=mock.Mock(return_value={'records': [
+                {'partition_id': 'shardId-0000000000',
+                 'sequence_number': '1', 'error_code': None}]}))
+        callback = mock.Mock()
+        producer = self._producer(proxy, linger=0.2, workers=1, retries=0,
+                                  callback=callback)
+
+        producer.send('1')
+        producer.send('2')
+        producer.flush(5)
+
+        self.assertEqual(1, producer.sent)
+        self.assertEqual(1, producer.failed)
+        self.assertEqual(_producer.ERROR_NO_RESULT,
+                         callback.call_args_list[1][0][1]['error_code'])
+
+    def test_closed(self):
+        producer = self._producer(FakeProxy())
+        producer.close()
+
+        self.assertRaises(exceptions.SDKException, producer.send, 'x')
@@ -9,11 +9,19 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import json
+import os
 
+import fixtures
+import mock
+
+from otcextensions.sdk import sdk_resource
+from otcextensions.sdk.dis.v2 import _producer
 from otcextensions.sdk.dis.v2 import _proxy
 from otcextensions.sdk.dis.v2 import stream
 from otcextensions.sdk.dis.v2 import app
 from otcextensions.sdk.dis.v2 import checkpoint
+from otcextensions.sdk.dis.v2 import data
 from otcextensions.sdk.dis.v2 import dump_task
 
 from openstack.tests.unit import test_proxy_base
@@ -176,3 +184,55 @@ class TestDumpTask(TestDisProxy):
             method_args=['test-stream'],
             expected_args=[self.proxy, 'test-stream', 'stop']
         )
+
+
+class TestData(TestDisProxy):
+
+    def test_producer(self):
+        producer = self.proxy.producer('test-stream', workers=2)
+        self.addCleanup(producer.close)
+
+        self.assertIsInstance(producer, _producer.Producer)
+        self.assertIs(self.proxy, producer.proxy)
+        self.assertEqual('test-stream', producer.stream_name)
+        self.assertEqual(2, len(producer._queues))
+
+    def test_upload_data(self):
+        self._verify(
+            'openstack.proxy.Proxy._create',
+            self.proxy.upload_data,
+            method_args=['test-stream'],
+            method_kwargs={'stream_id': 'sid',
+                           'records': [{'data': 'a b'}, {'data': 'YWI='}]},
+            expected_args=[data.Data],
+            expected_kwargs={'stream_name': 'test-stream',
+                             'stream_id': 'sid',
+                             'records': [{'data': 'YSBi'},
+                                         {'data': 'YWI='}]})
+
+    def test_upload_data_empty(self):
+        self.assertRaises(ValueError, self.proxy.upload_data,
+                          'test-stream', records=[{'data': ''}])
+
+    def test_download_data(self):
+        self._verify('openstack.proxy.Proxy._list',
+                     self.proxy.download_data,
+                     method_args=['cursor'],
+                     expected_args=[data.Data],
+                     expected_kwargs={'partition-cursor': 'cursor'})
+
+    def test_download_data_file(self):
+        records = [{'sequence_number': '1', 'data': 'YWI=',
+                    'timestamp': 1, 'timestamp_type': 'CreateTime'}]
+        filename = os.path.join(self.useFixture(
+            fixtures.TempDir()).path, 'records.jsonl')
+        with mock.patch.object(sdk_resource, 'list_records',
+                               return_value=iter(records)) as list_records:
+            self.proxy.download_data('cursor', max_fetch_bytes=10,
+                                     filename=filename, file_format='jsonl')
+
+        list_records.assert_called_once_with(
+            data.Data, self.proxy, mock.ANY, paginated=False,
+            max_fetch_bytes=10, **{'partition-cursor': 'cursor'})
+        with open(filename) as f:
+            self.assertEqual([records[0]], [json.loads(line) for line in f])
@@ -0,0 +1,185 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import threading
+from unittest import mock
+
+from openstack.tests.unit import base
+
+from otcextensions.sdk.dms.v1 import _consumer
+from otcextensions.sdk.dms.v1 import group as _group
+from otcextensions.sdk.dms.v1 import queue as _queue
+
+
+class FakeProxy(object):
+    """Delivers ``count`` messages and records the acknowledgements"""
+
+    def __init__(self, count, fail_consume=0, fail_ack=0):
+        self.available = list(range(count))
+        self.fail_consume = fail_consume
+        self.fail_ack = fail_ack
+        self.requested = []
+        self.acks = []
+        self.lock = threading.Lock()
+
+    def get(self, uri, params):
+        with self.lock:
+            self.requested.append(params['max_msgs'])
+            if self.fail_consume:
+                self.fail_consume -= 1
+                return mock.Mock(status_code=500, headers={},
+                                 json=mock.Mock(return_value={}))
+            batch = self.available[:params['max_msgs']]
+            del self.available[:params['max_msgs']]
+        return mock.Mock(status_code=200, json=mock.Mock(return_value=[
+            {'handler': 'h%d' % i, 'message': {'body': i}} for i in batch]))
+
+    def post(self, uri, json):
+        with self.lock:
+            if self.fail_ack:
+                self.fail_ack -= 1
+                return mock.Mock(status_code=500, headers={},
+                                 json=mock.Mock(return_value={}))
+            self.acks.append((uri, json['message']))
+        return mock.Mock(status_code=200)
+
+
+class TestConsumer(base.TestCase):
+
+    def _consumer(self, proxy, handler, **kwargs):
+        kwargs.setdefault('time_wait', 0)
+        kwargs.setdefault('retry_interval', 0)
+        kwargs.setdefault('ack_interval', 0.05)
+        consumer = _consumer.Consumer(
+            proxy, _queue.Queue(id='qid'), _group.Group(id='gid'), handler,
+            **kwargs)
+        self.addCleanup(consumer.close)
+        return consumer
+
+    def _wait_for(self, condition):
+        for _attempt in range(500):
+            if condition():
+                return
+            threading.Event().wait(0.01)
+        self.fail('condition not met')
+
+    def test_handles_and_acks(self):
+        proxy = FakeProxy(25)
+        bodies = []
+        lock = threading.Lock()
+
+        def handle(message):
+            with lock:
+                bodies.append(message.body)
+
+        consumer = self._consumer(proxy, handle, workers=4)
+        self._wait_for(lambda: consumer.acked == 25)
+        consumer.close()
+
+        self.assertEqual(list(range(25)), sorted(bodies))
+        self.assertEqual(25, consumer.processed)
+        self.assertEqual(
+            sorted('h%d' % i for i in range(25)),
+            sorted(ack['handler'] for _uri, acks in proxy.acks
+                   for ack in acks))
+        self.assertEqual({'queues/qid/groups/gid/ack'},
+                         {uri for uri, _acks in proxy.acks})
+        self.assertTrue(all(msgs <= 10 for msgs in proxy.requested))
+
+    def test_batched_acks(self):
+        proxy = FakeProxy(30)
+        consumer = self._consumer(proxy, lambda message: None,
+                                  ack_batch_size=10, ack_interval=60)
+        self._wait_for(lambda: consumer.acked == 30)
+
+        self.assertTrue(all(len(acks) <= 10 for _uri, acks in proxy.acks))
+        self.assertLess(len(proxy.acks), 30)
+
+    def test_failed_handler(self):
+        proxy = FakeProxy(2)
+
+        def handle(message):
+            if message.body:
+                raise ValueError('broken')
+
+        consumer = self._consumer(proxy, handle)
+        self._wait_for(lambda: consumer.acked == 2)
+
+        statuses = {ack['handler']: ack['status']
+                    for _uri, acks in proxy.acks for ack in acks}
+        self.assertEqual({'h0': 'success', 'h1': 'fail'}, statuses)
+        self.assertEqual(1, consumer.processed)
+        self.assertEqual(1, consumer.failed)
+
+    def test_backpressure(self):
+        proxy = FakeProxy(100)
+        release = threading.Event()
+        consumer = self._consumer(proxy, lambda message: release.wait(),
+                                  prefetch=15, workers=2)
+        self._wait_for(lambda: sum(proxy.requested) >= 15)
+        threading.Event().wait(0.1)
+
+        self.assertEqual(15, sum(proxy.requested))
+        release.set()
+        self._wait_for(lambda: consumer.acked == 100)
+
+    def test_drain_on_close(self):
+        proxy = FakeProxy(20)
+        release = threading.Event()
+        consumer = self._consumer(proxy, lambda message: release.wait(),
+                                  prefetch=20, workers=1, ack_interval=60)
+        self._wait_for(lambda: sum(proxy.requested) >= 20)
+
+        release.set()
+        consumer.close()
+
+        self.assertEqual(20, consumer.acked)
+        self.assertEqual(20, sum(len(acks) for _uri, acks in proxy.acks))
+
+    def test_close_without_drain(self):
+        proxy = FakeProxy(20)
+        started = threading.Event()
+        release = threading.Event()
+
+        def handle(message):
+            started.set()
+            release.wait()
+
+        consumer = self._consumer(proxy, handle, prefetch=20, workers=1)
+        self._wait_for(lambda: sum(proxy.requested) >= 20)
+        started.wait()
+
+        threading.Timer(0.1, release.set).start()
+        consumer.close(drain=False)
+
+        self.assertEqual(1, consumer.acked)
+
+    def test_retries_consume(self):
+        proxy = FakeProxy(3, fail_consume=2)
+        consumer = self._consumer(proxy, lambda message: None)
+
+        self._wait_for(lambda: consumer.acked == 3)
+        self.assertIsNone(consumer.error)
+
+    def test_gives_up_consume(self):
+        proxy = FakeProxy(3, fail_consume=10)
+        consumer = self._consumer(proxy, lambda message: None, retries=2)
+
+        self.assertTrue(consumer.wait(5))
+        self.assertIsNotNone(consumer.error)
+        self.assertEqual(0, consumer.processed)
+
+    def test_retries_ack(self):
+        proxy = FakeProxy(3, fail_ack=1)
+        consumer = self._consumer(proxy, lambda message: None)
+
+        self._wait_for(lambda: consumer.acked == 3)
+        self.assertEqual(3, sum(len(acks) for _uri, acks in proxy.acks))
@@ -11,6 +11,7 @@
 # under the License.
 from unittest import mock
 
+from otcextensions.sdk.dms.v1 import _consumer
 from otcextensions.sdk.dms.v1 import _proxy
 from otcextensions.sdk.dms.v1 import az as _az
 from otcextensions.sdk.dms.v1 import group as _group
@@ -177,6 +178,18 @@ class TestDMSProxy(test_proxy_base.TestProxyBase):
             }
         )
 
+    def test_bulk_send_messages(self):
+        messages = iter([{'body': 'b1'}])
+        self._verify(
+            'otcextensions.sdk.dms.v1._sender.send_many',
+            self.proxy.bulk_send_messages,
+            method_args=['qid', messages],
+            method_kwargs={'workers': 2},
+            expected_args=[self.proxy, 'qid', messages],
+            expected_kwargs={'workers': 2},
+            method_result=['m1'],
+            expected_result=['m1'])
+
     def test_send_message(self):
         value = _message.Message(id='1')
         self._verify(
@@ -220,6 +233,20 @@ class TestDMSProxy(test_proxy_base.TestProxyBase):
     def test_ack_consumed_message(self):
         pass
 
+    def test_consumer(self):
+        handler = mock.Mock()
+        with mock.patch.object(_consumer, 'Consumer') as consumer:
+            result = self.proxy.consumer('qid', 'gid', handler, workers=2)
+
+        self.assertIs(consumer.return_value, result)
+        (proxy, queue_obj, group_obj, called_handler), kwargs = \
+            consumer.call_args
+        self.assertIs(self.proxy, proxy)
+        self.assertEqual('qid', queue_obj.id)
+        self.assertEqual('gid', group_obj.id)
+        self.assertIs(handler, called_handler)
+        self.assertEqual({'workers': 2}, kwargs)
+
     def test_quotas(self):
         pass
 
@@ -0,0 +1,122 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import threading
+from unittest import mock
+
+from openstack.tests.unit import base
+
+from otcextensions.sdk.dms.v1 import _sender
+from otcextensions.sdk.dms.v1 import message as _message
+
+
+class FakeProxy(object):
+    """Accepts messages unless their body is listed in ``fail``"""
+
+    def __init__(self, fail=(), fail_requests=0):
+        self.fail = dict(fail)
+        self.fail_requests = fail_requests
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def post(self, uri, json):
+        with self.lock:
+            self.requests.append((uri, json))
+            if self.fail_requests:
+                self.fail_requests -= 1
+                return mock.Mock(status_code=500, headers={},
+                                 json=mock.Mock(return_value={}))
+            results = []
+            for message in json['messages']:
+                body = message['body']
+                if self.fail.get(body):
+                    self.fail[body] -= 1
+                    results.append({'state': 1, 'error_code': 'DMS.10240',
+                                    'error': 'throttled'})
+                else:
+                    results.append({'state': 0, 'id': 'id-%s' % body})
+        return mock.Mock(status_code=200, json=mock.Mock(
+            return_value={'messages': results}))
+
+
+class TestBatches(base.TestCase):
+
+    def test_batch_size(self):
+        batches = list(_sender.batches(
+            ({'body': i} for i in range(25)), batch_size=10))
+
+        self.assertEqual([10, 10, 5], [len(batch) for batch in batches])
+
+    def test_batch_bytes(self):
+        messages = [{'body': 'x' * 40}] * 5
+
+        batches = list(_sender.batches(messages, batch_bytes=120))
+
+        self.assertEqual([2, 2, 1], [len(batch) for batch in batches])
+
+    def test_oversized_message(self):
+        batches = list(_sender.batches([{'body': 'x' * 200}, {'body': 'y'}],
+                                       batch_bytes=100))
+
+        self.assertEqual([1, 1], [len(batch) for batch in batches])
+
+    def test_message_dicts(self):
+        batches = list(_sender.batches([
+            {'body': 'b1', 'attributes': None},
+            _message.Message(body='b2', attributes={'a': 'v'})]))
+
+        self.assertEqual([[{'body': 'b1'},
+                           {'body': 'b2', 'attributes': {'a': 'v'}}]],
+                         batches)
+
+
+class TestSendMany(base.TestCase):
+
+    def test_ids_in_order(self):
+        proxy = FakeProxy()
+
+        ids = _sender.send_many(proxy, 'qid',
+                                ({'body': i} for i in range(95)), workers=4)
+
+        self.assertEqual(['id-%d' % i for i in range(95)], ids)
+        self.assertEqual(10, len(proxy.requests))
+        uri, body = proxy.requests[0]
+        self.assertEqual('/queues/qid/messages', uri)
+        self.assertTrue(body['returnId'])
+
+    def test_retries_failed_messages(self):
+        proxy = FakeProxy(fail={3: 2})
+
+        ids = _sender.send_many(proxy, 'qid',
+                                [{'body': i} for i in range(5)],
+                                retry_interval=0)
+
+        self.assertEqual(['id-%d' % i for i in range(5)], ids)
+        self.assertEqual(3, len(proxy.requests))
+        self.assertEqual([{'body': 3}], proxy.requests[-1][1]['messages'])
+
+    def test_retries_failed_requests(self):
+        proxy = FakeProxy(fail_requests=1)
+
+        ids = _sender.send_many(proxy, 'qid', [{'body': 1}],
+                                retry_interval=0)
+
+        self.assertEqual(['id-1'], ids)
+
+    def test_gives_up(self):
+        proxy = FakeProxy(fail={1: 10})
+
+        ids = _sender.send_many(proxy, 'qid',
+                                [{'body': 0}, {'body': 1}, {'body': 2}],
+                                retries=2, retry_interval=0)
+
+        self.assertEqual(['id-0', None, 'id-2'], ids)
+        self.assertEqual(3, len(proxy.requests))
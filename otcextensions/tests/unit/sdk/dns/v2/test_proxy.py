@@ -117,6 +117,33 @@ class TestDnsRecordset(TestDnsProxy):
                          method_kwargs={'zone': 'zid'},
                          expected_kwargs={'zone_id': 'zid'})
 
+    def test_recordsets_get(self):
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._get_many',
+            self.proxy.get_recordsets,
+            method_args=[['rs1', 'rs2'], 'zid'],
+            expected_args=[recordset.Recordset, ['rs1', 'rs2']],
+            expected_kwargs={'zone_id': 'zid', 'workers': 8})
+
+    def test_recordsets_update(self):
+        updates = [('rs1', {'ttl': 300})]
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._update_many',
+            self.proxy.update_recordsets,
+            method_args=[updates],
+            expected_args=[recordset.Recordset, updates],
+            expected_kwargs={'workers': 8})
+
+    def test_recordsets_delete(self):
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._delete_many',
+            self.proxy.delete_recordsets,
+            method_args=[['rs1']],
+            method_kwargs={'zone': 'zid'},
+            expected_args=[recordset.Recordset, ['rs1']],
+            expected_kwargs={'zone_id': 'zid', 'ignore_missing': True,
+                             'workers': 8})
+
     def test_recordset_find(self):
         self._verify("openstack.proxy.Proxy._find",
                      self.proxy.find_recordset,
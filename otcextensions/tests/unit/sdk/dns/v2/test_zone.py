@@ -129,3 +129,20 @@ class TestZone(base.TestCase):
             'zones/%s/disassociaterouter' % FAKE_ID,
             json={'router': {'router_id': 1}}
         )
+
+    def test_list_fields(self):
+        response = mock.Mock(status_code=200, headers={})
+        response.json.return_value = {
+            'zones': [EXAMPLE],
+            'links': {},
+            'metadata': {'total_count': 1}}
+        self.sess.get.return_value = response
+        self.sess.default_microversion = None
+
+        result = list(zone.Zone.list(
+            self.sess, fields=['id', 'name'], zone_type='private'))
+
+        self.assertEqual([(FAKE_ID, 'example.com.')], result)
+        self.sess.get.assert_called_once_with(
+            '/zones', headers={'Accept': 'application/json'},
+            params={'type': 'private'}, microversion=None)
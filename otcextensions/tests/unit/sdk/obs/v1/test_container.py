@@ -69,7 +69,7 @@ class TestContainer(base.TestCase):
 
         mock_response = mock.Mock()
         mock_response.status_code = 200
-        mock_response.content = EXAMPLE_LIST
+        mock_response.iter_content.return_value = [EXAMPLE_LIST.encode()]
 
         self.sess.get.return_value = mock_response
 
@@ -81,6 +81,25 @@ class TestContainer(base.TestCase):
         self.assertEqual('test-v1', result[0].name)
         self.assertEqual('test-v2', result[1].name)
 
+    def test_list_chunks(self):
+
+        sot = container.Container()
+
+        body = EXAMPLE_LIST.encode()
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = [
+            body[i:i + 5] for i in range(0, len(body), 5)]
+
+        self.sess.get.return_value = mock_response
+
+        result = list(sot.list(
+            self.sess,
+        ))
+
+        self.assertEqual(['test-v1', 'test-v2'], [c.name for c in result])
+        self.assertEqual('2018-09-19T12:47:22.205Z', result[1].creation_date)
+
     def test_create(self):
 
         sot = container.Container(name='test-v1')
@@ -11,8 +11,10 @@
 # under the License.
 import base64
 import hashlib
+import os
 from collections import namedtuple
 
+import fixtures
 import mock
 from keystoneauth1 import adapter
 from openstack.tests.unit import base
@@ -105,7 +107,7 @@ class TestObject(base.TestCase):
 
         mock_response = mock.Mock()
         mock_response.status_code = 200
-        mock_response.content = EXAMPLE_LIST
+        mock_response.iter_content.return_value = [EXAMPLE_LIST.encode()]
 
         self.sess.get.return_value = mock_response
 
@@ -118,6 +120,118 @@ class TestObject(base.TestCase):
         self.assertEqual('9c24605289b49ad77a51ba7986425158', result[0].etag)
         self.assertEqual(1030, result[0].content_length)
 
+    def test_list_records(self):
+        mock_response = mock.Mock(status_code=200)
+        mock_response.iter_content.return_value = [EXAMPLE_LIST.encode()]
+        self.sess.get.return_value = mock_response
+
+        result = list(obj.Object.list(self.sess, raw=True))
+
+        self.assertEqual('setup.py', result[0].name)
+        self.assertEqual('1030', result[0].content_length)
+        self.assertNotIsInstance(result[0], obj.Object)
+
+        mock_response.iter_content.return_value = [EXAMPLE_LIST.encode()]
+        self.assertEqual(
+            [('setup.py', '1030')],
+            list(obj.Object.list(
+                self.sess, fields=['name', 'content_length'])))
+
+    def test_list_records_listed_headers(self):
+        mock_response = mock.Mock(status_code=200)
+        mock_response.iter_content.return_value = [EXAMPLE_LIST.encode()]
+        self.sess.get.return_value = mock_response
+
+        record = list(obj.Object.list(self.sess, raw=True))[0]
+        self.assertEqual('9c24605289b49ad77a51ba7986425158', record.etag)
+        self.assertEqual('STANDARD', record.storage_class)
+
+        mock_response.iter_content.return_value = [EXAMPLE_LIST.encode()]
+        self.assertEqual(
+            [('setup.py', '9c24605289b49ad77a51ba7986425158')],
+            list(obj.Object.list(self.sess, fields=['name', 'etag'])))
+
+    def test_list_fields_header(self):
+        self.assertRaises(
+            ValueError, list,
+            obj.Object.list(self.sess, fields=['name', 'content_type']))
+        self.sess.get.assert_not_called()
+
+    def test_list_paginated_chunks(self):
+        sot = obj.Object()
+        page1 = EXAMPLE_LIST.replace(
+            '<IsTruncated>false</IsTruncated>',
+            '<IsTruncated>true</IsTruncated>'
+            '<NextMarker>setup.py</NextMarker>').encode()
+        page2 = EXAMPLE_LIST.replace('setup.py', 'setup.cfg').encode()
+
+        def _chunks(body):
+            return [body[i:i + 7] for i in range(0, len(body), 7)]
+
+        resp1 = mock.Mock(status_code=200)
+        resp1.iter_content.return_value = _chunks(page1)
+        resp2 = mock.Mock(status_code=200)
+        resp2.iter_content.return_value = _chunks(page2)
+        self.sess.get.side_effect = [resp1, resp2]
+
+        result = list(sot.list(self.sess, prefix='setup'))
+
+        self.assertEqual(['setup.py', 'setup.cfg'],
+                         [o.name for o in result])
+        self.assertEqual('9c24605289b49ad77a51ba7986425158', result[1].etag)
+        self.assertEqual(1030, result[1].content_length)
+        self.assertEqual(2, self.sess.get.call_count)
+        self.assertEqual(
+            {'prefix': 'setup', 'marker': 'setup.py'},
+            self.sess.get.call_args_list[1][1]['params'])
+        self.assertTrue(self.sess.get.call_args_list[0][1]['stream'])
+
+    def test_list_yields_before_body_is_read(self):
+        sot = obj.Object()
+        head, tail = EXAMPLE_LIST.encode().split(b'</Contents>')
+        consumed = []
+
+        def _body(chunk_size):
+            yield head + b'</Contents>'
+            consumed.append(True)
+            yield tail
+
+        mock_response = mock.Mock(status_code=200)
+        mock_response.iter_content.side_effect = _body
+        self.sess.get.return_value = mock_response
+
+        result = sot.list(self.sess)
+
+        self.assertEqual('setup.py', next(result).name)
+        self.assertEqual([], consumed)
+        self.assertEqual([], list(result))
+
+    def test_list_entries_delimiter(self):
+        body = b"""<?xml version="1.0" encoding="UTF-8"?>
+<ListBucketResult xmlns="http://obs.otc.t-systems.com/doc/2016-01-01/">
+<Name>bucket</Name><Prefix></Prefix><Delimiter>/</Delimiter>
+<Contents><Key>a.txt</Key><Size>1</Size></Contents>
+<Contents><Key>c</Key><Size>2</Size></Contents>
+<CommonPrefixes><Prefix>a/</Prefix></CommonPrefixes>
+<CommonPrefixes><Prefix>b/</Prefix></CommonPrefixes>
+</ListBucketResult>"""
+        mock_response = mock.Mock(status_code=200)
+        mock_response.iter_content.return_value = [body]
+        self.sess.get.return_value = mock_response
+
+        result = list(obj.Object._list_entries(self.sess, delimiter='/'))
+
+        self.assertEqual(
+            [('Contents', 'a.txt'), ('CommonPrefixes', 'a/'),
+             ('CommonPrefixes', 'b/'), ('Contents', 'c')],
+            [(name, key) for name, key, _value in result])
+        self.assertEqual('a.txt', result[0][2].name)
+
+        mock_response.iter_content.return_value = [body]
+        self.assertEqual(
+            ['a.txt', 'c'],
+            [o.name for o in obj.Object.list(self.sess, delimiter='/')])
+
     def test_create(self):
         data = 'some test data'
         md5 = hashlib.md5()
@@ -165,11 +279,38 @@ class TestObject(base.TestCase):
             endpoint_override='http://obs.otc.t-systems.com'
         )
 
+    def test_download(self):
+        filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+        response = mock.Mock(status_code=200, headers={'ETag': '"e"'})
+        response.iter_content.return_value = [b'some ', b'data']
+        self.sess.get.return_value = response
+        sot = obj.Object(name='test')
+
+        sot.download(self.sess, filename=filename, endpoint_override='epo',
+                     chunk_size=5)
+
+        with open(filename, 'rb') as f:
+            self.assertEqual(b'some data', f.read())
+        self.assertTrue(self.sess.get.call_args[1]['stream'])
+        response.iter_content.assert_called_once_with(5)
+        self.assertEqual('"e"', sot.etag)
+
+    def test_get_completed_etag(self):
+        response = mock.Mock(content=(
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<CompleteMultipartUploadResult xmlns="http://obs.otc.t-systems'
+            '.com/doc/2016-01-01/"><Location>l</Location><Bucket>b</Bucket>'
+            '<Key>k</Key><ETag>"abc-3"</ETag>'
+            '</CompleteMultipartUploadResult>').encode())
+
+        self.assertEqual('abc-3', obj.Object.get_completed_etag(response))
+
     def test_get_parts(self):
         sot = obj.Object()
-        return_data = namedtuple('response', ['content'])
+        return_data = namedtuple('response', ['content', 'status_code'])
 
-        response_data = return_data(LIST_PARTS_RESP)
+        response_data = return_data(LIST_PARTS_RESP, 200)
 
         self.sess.get = mock.Mock(return_value=response_data)
         sot.get_parts(
@@ -203,6 +344,33 @@ class TestObject(base.TestCase):
         self.sess.post.assert_called_once_with(
             'http://obs.otc.t-systems.com?uploadId=test',
             data=COMPLETE_MPU_RESP,
-            headers={},
-            params={}
+            headers={}
+        )
+
+    def test_delete_multiple(self):
+        response = mock.Mock(status_code=200)
+        response.content = b"""<?xml version="1.0" encoding="UTF-8"?>
+<DeleteResult xmlns="http://obs.otc.t-systems.com/doc/2016-01-01/">
+<Error><Key>b</Key><Code>AccessDenied</Code>
+<Message>Access Denied</Message></Error>
+</DeleteResult>"""
+        self.sess.post = mock.Mock(return_value=response)
+
+        errors = obj.Object.delete_multiple(
+            self.sess, 'http://obs.otc.t-systems.com', ['a', 'b'],
+            requests_auth=2)
+
+        self.assertEqual([('b', 'AccessDenied', 'Access Denied')], errors)
+        data = (b"<Delete><Quiet>true</Quiet>"
+                b"<Object><Key>a</Key></Object>"
+                b"<Object><Key>b</Key></Object></Delete>")
+        self.sess.post.assert_called_once_with(
+            'http://obs.otc.t-systems.com?delete',
+            data=data,
+            headers={
+                'Content-MD5': base64.b64encode(
+                    hashlib.md5(data).digest()).decode(),
+                'Content-Type': 'application/xml'
+            },
+            requests_auth=2
         )
@@ -9,20 +9,31 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import concurrent.futures
+import functools
+import hashlib
+import io
+import json
+import os
+from unittest import mock
 from unittest.mock import MagicMock
 
+import fixtures
+from openstack import exceptions
+from openstack.cloud import _object_store
 from openstack.tests.unit import test_proxy_base
 
+from otcextensions.common import utils
 from otcextensions.sdk.ak_auth import AKRequestsAuth
 from otcextensions.sdk.obs.v1 import _proxy
 from otcextensions.sdk.obs.v1 import container as _container
 from otcextensions.sdk.obs.v1 import obj as _obj
 
 
-class TestObsProxy(test_proxy_base.TestProxyBase):
+class ObsProxyBase(test_proxy_base.TestProxyBase):
 
     def setUp(self):
-        super(TestObsProxy, self).setUp()
+        super(ObsProxyBase, self).setUp()
         self.proxy = _proxy.Proxy(self.session)
 
         self._ak_auth = AKRequestsAuth(
@@ -37,6 +48,9 @@ class TestObsProxy(test_proxy_base.TestProxyBase):
             return_value='https://container.obs.regio.otc.t-systems.com'
         )
 
+
+class TestObsProxy(ObsProxyBase):
+
     def test_containers(self):
         self.verify_list(
             self.proxy.containers, _container.Container,
@@ -158,7 +172,8 @@ class TestObsProxy(test_proxy_base.TestProxyBase):
                 'filename': '-',
                 'endpoint_override': 'https://container.obs.regio.'
                                      'otc.t-systems.com',
-                'requests_auth': self._ak_auth
+                'requests_auth': self._ak_auth,
+                'chunk_size': _proxy.DEFAULT_DOWNLOAD_CHUNK_SIZE
             }
         )
 
@@ -204,6 +219,708 @@ class TestObsProxy(test_proxy_base.TestProxyBase):
         )
 
 
+class TestObsProxyParallelDownload(ObsProxyBase):
+
+    DATA = bytes(range(256)) * 40
+
+    def setUp(self):
+        super(TestObsProxyParallelDownload, self).setUp()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+        self.addCleanup(executor.shutdown)
+        self.proxy._connection = mock.Mock()
+        self.proxy._connection._pool_executor = executor
+        self.filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+
+        head = mock.Mock(status_code=200)
+        head.headers = {'Content-Length': str(len(self.DATA)), 'ETag': '"e"'}
+        self.proxy.head = mock.Mock(return_value=head)
+        self.proxy.get = mock.Mock(side_effect=self._get)
+        self.failures = 0
+
+    def _get(self, url, headers, **kwargs):
+        start, end = headers['Range'][len('bytes='):].split('-')
+        chunk = self.DATA[int(start):int(end) + 1]
+        response = mock.Mock(status_code=206)
+        response.headers = {'ETag': '"e"'}
+        if self.failures:
+            self.failures -= 1
+            chunk = chunk[:1]
+        response.iter_content.return_value = [chunk[:7], chunk[7:]]
+        return response
+
+    def test_download_object_parallel(self):
+        self.proxy.download_object(
+            'object', container='container', parallel=True,
+            segment_size=1000, file=self.filename)
+
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(self.DATA, f.read())
+        self.proxy.head.assert_called_once_with(
+            'https://container.obs.regio.otc.t-systems.com/object',
+            requests_auth=self._ak_auth)
+        self.assertEqual(11, self.proxy.get.call_count)
+        self.proxy.get.assert_any_call(
+            'https://container.obs.regio.otc.t-systems.com/object',
+            headers={'Range': 'bytes=10000-10239', 'If-Match': '"e"'},
+            stream=True, requests_auth=self._ak_auth)
+
+    def test_download_object_parallel_without_file(self):
+        with mock.patch.object(_obj.Object, 'download') as mock_download:
+            self.proxy.download_object(
+                'object', container='container', parallel=True)
+
+        mock_download.assert_called_once()
+        self.assertEqual('-', mock_download.call_args[1]['filename'])
+        self.proxy.head.assert_not_called()
+
+    def test_download_object_parallel_retry(self):
+        self.failures = 2
+        self.proxy.download_object(
+            'object', container='container', parallel=True,
+            segment_size=4096, file=self.filename)
+
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(self.DATA, f.read())
+        self.assertEqual(5, self.proxy.get.call_count)
+
+    def test_download_object_parallel_changed(self):
+        def _get(url, headers, **kwargs):
+            response = self._get(url, headers, **kwargs)
+            response.headers = {'ETag': '"other"'}
+            return response
+
+        self.proxy.get.side_effect = _get
+        self.assertRaises(
+            exceptions.SDKException,
+            self.proxy.download_object,
+            'object', container='container', parallel=True,
+            segment_size=4096, file=self.filename)
+        self.assertFalse(os.path.exists(self.filename))
+
+
+class TestObsProxyResumableUpload(ObsProxyBase):
+
+    ENDPOINT = 'https://container.obs.regio.otc.t-systems.com'
+
+    def setUp(self):
+        super(TestObsProxyResumableUpload, self).setUp()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.proxy._connection = mock.Mock()
+        self.proxy._connection._pool_executor = executor
+        self.proxy._connection._wait_for_futures = functools.partial(
+            _object_store.ObjectStoreCloudMixin._wait_for_futures,
+            mock.Mock())
+
+        tmpdir = self.useFixture(fixtures.TempDir()).path
+        self.filename = os.path.join(tmpdir, 'data')
+        self.checkpoint_file = os.path.join(tmpdir, 'checkpoint')
+        with open(self.filename, 'wb') as f:
+            f.write(b'x' * 25)
+        self.source = dict(
+            url=self.ENDPOINT + '/obj', file_size=25, segment_size=10,
+            mtime=os.path.getmtime(self.filename))
+
+        self.proxy.put = mock.Mock(side_effect=self._put)
+        self.proxy.delete = mock.Mock()
+
+    def _put(self, url, **kwargs):
+        response = mock.Mock(status_code=200, ok=True, url=url)
+        response.headers = {'ETag': '"etag-%s"' % url[-10:]}
+        return response
+
+    def _upload(self):
+        self.proxy._upload_large_object(
+            self.ENDPOINT, self.filename, {}, 25, 10, name='obj',
+            checkpoint_file=self.checkpoint_file)
+
+    @mock.patch.object(_obj.Object, 'complete_multipart_upload')
+    @mock.patch.object(_obj.Object, 'get_parts')
+    @mock.patch.object(_obj.Object, 'initiate_multipart_upload')
+    def test_resume(self, mock_initiate, mock_parts, mock_complete):
+        with open(self.checkpoint_file, 'w') as f:
+            json.dump({'source': self.source, 'upload_id': 'UID',
+                       'parts': {'1': 'a'}}, f)
+        mock_parts.return_value = {'Parts': [
+            {'PartNumber': '1', 'ETag': 'a', 'Size': '10'}]}
+        mock_complete.return_value = mock.Mock(status_code=200)
+
+        self._upload()
+
+        mock_initiate.assert_not_called()
+        self.assertEqual(
+            [self.ENDPOINT + '/obj?partNumber=2&uploadId=UID',
+             self.ENDPOINT + '/obj?partNumber=3&uploadId=UID'],
+            sorted(c[0][0] for c in self.proxy.put.call_args_list))
+        # completed from the checkpoint and the responses, not a listing
+        mock_parts.assert_called_once()
+        etag = self._put(self.ENDPOINT + '/obj?uploadId=UID').headers[
+            'ETag'].strip('"')
+        mock_complete.assert_called_once_with(
+            self.proxy, self.ENDPOINT + '/obj', 'UID',
+            [{'PartNumber': '1', 'ETag': 'a'},
+             {'PartNumber': '2', 'ETag': etag},
+             {'PartNumber': '3', 'ETag': etag}],
+            {}, requests_auth=self._ak_auth)
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+    @mock.patch.object(_obj.Object, 'get_parts')
+    def test_parts_paginated(self, mock_parts):
+        mock_parts.side_effect = [
+            {'IsTruncated': 'true', 'NextPartNumberMarker': '1000',
+             'Parts': [{'PartNumber': '1000'}]},
+            {'IsTruncated': 'false', 'Parts': [{'PartNumber': '1001'}]}]
+
+        result = self.proxy.parts(self.ENDPOINT + '/obj', 'UID', None)
+
+        self.assertEqual([{'PartNumber': '1000'}, {'PartNumber': '1001'}],
+                         result['Parts'])
+        self.assertEqual(
+            self.ENDPOINT + '/obj?uploadId=UID&part-number-marker=1000',
+            mock_parts.call_args_list[1][0][1])
+
+    @mock.patch.object(_obj.Object, 'complete_multipart_upload')
+    @mock.patch.object(_obj.Object, 'get_parts')
+    @mock.patch.object(_obj.Object, 'initiate_multipart_upload')
+    def test_failure_keeps_checkpoint(self, mock_initiate, mock_parts,
+                                      mock_complete):
+        mock_initiate.return_value = 'NEW'
+        mock_parts.return_value = {'Parts': []}
+        mock_complete.side_effect = exceptions.HttpException('failed')
+
+        self.assertRaises(exceptions.HttpException, self._upload)
+
+        self.assertEqual(3, self.proxy.put.call_count)
+        self.proxy.delete.assert_not_called()
+        with open(self.checkpoint_file) as f:
+            state = json.load(f)
+        self.assertEqual(self.source, state['source'])
+        self.assertEqual('NEW', state['upload_id'])
+        self.assertEqual(['1', '2', '3'], sorted(state['parts']))
+
+    @mock.patch.object(_obj.Object, 'initiate_multipart_upload')
+    def test_failure_closes_segments(self, mock_initiate):
+        mock_initiate.return_value = 'UID'
+
+        def _put(url, data, **kwargs):
+            data.read()
+            if 'partNumber=2' in url:
+                raise exceptions.HttpException('failed', http_status=503)
+            return self._put(url)
+
+        segments = []
+
+        def _get_file_segments(*args):
+            result = get_file_segments(*args)
+            segments.extend(result.values())
+            return result
+
+        self.proxy.put.side_effect = _put
+        get_file_segments = utils._get_file_segments
+        with mock.patch.object(utils, '_get_file_segments',
+                               side_effect=_get_file_segments):
+            self.assertRaises(
+                exceptions.HttpException,
+                self.proxy._upload_large_object,
+                self.ENDPOINT, self.filename, {}, 25, 10, name='obj')
+
+        self.assertEqual(3, len(segments))
+        self.assertEqual([None] * 3, [s._file for s in segments])
+
+    @mock.patch.object(_obj.Object, 'complete_multipart_upload')
+    @mock.patch.object(_obj.Object, 'get_parts')
+    @mock.patch.object(_obj.Object, 'initiate_multipart_upload')
+    def test_verify(self, mock_initiate, mock_parts, mock_complete):
+        mock_initiate.return_value = 'UID'
+        mock_parts.return_value = {'Parts': []}
+        mock_complete.return_value = mock.Mock(status_code=200)
+
+        def _put(url, data, **kwargs):
+            response = self._put(url)
+            response.headers = {
+                'ETag': '"%s"' % hashlib.md5(data.read()).hexdigest()}
+            return response
+
+        self.proxy.put.side_effect = _put
+        self.proxy._upload_large_object(
+            self.ENDPOINT, self.filename, {}, 25, 10, name='obj',
+            verify=True)
+        mock_complete.assert_called_once()
+
+        def _put(url, data, **kwargs):
+            data.read()
+            return self._put(url)
+
+        self.proxy.put.side_effect = _put
+        self.assertRaises(
+            exceptions.SDKException,
+            self.proxy._upload_large_object,
+            self.ENDPOINT, self.filename, {}, 25, 10, name='obj',
+            verify=True)
+        self.proxy.delete.assert_called_once_with(
+            self.ENDPOINT + '/obj?uploadId=UID',
+            requests_auth=self._ak_auth)
+
+    @mock.patch.object(_obj.Object, 'complete_multipart_upload')
+    @mock.patch.object(_obj.Object, 'get_parts')
+    @mock.patch.object(_obj.Object, 'initiate_multipart_upload')
+    def test_resume_expired_upload(self, mock_initiate, mock_parts,
+                                   mock_complete):
+        with open(self.checkpoint_file, 'w') as f:
+            json.dump({'source': self.source, 'upload_id': 'UID'}, f)
+        mock_initiate.return_value = 'NEW'
+        mock_parts.side_effect = [
+            exceptions.NotFoundException('gone'), {'Parts': []}]
+        mock_complete.return_value = mock.Mock(status_code=200)
+
+        self._upload()
+
+        mock_initiate.assert_called_once()
+        self.assertEqual(3, self.proxy.put.call_count)
+
+
+class TestObsProxyStreamUpload(ObsProxyBase):
+
+    ENDPOINT = 'https://container.obs.regio.otc.t-systems.com'
+
+    def setUp(self):
+        super(TestObsProxyStreamUpload, self).setUp()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.proxy._connection = mock.Mock()
+        self.proxy._connection._pool_executor = executor
+        self.uploaded = {}
+        self.proxy.put = mock.Mock(side_effect=self._put)
+        self.proxy.delete = mock.Mock()
+
+    def _put(self, url, data, **kwargs):
+        # buffers are reused, keep a copy
+        self.uploaded[url] = bytes(data)
+        response = mock.Mock(status_code=200)
+        response.headers = {'ETag': '"etag-%s"' % url.split('=')[1][0]}
+        return response
+
+    def _chunks(self):
+        for i in range(7):
+            yield b''
+            yield bytes([i]) * 5
+
+    @mock.patch.object(_obj.Object, 'complete_multipart_upload')
+    def test_generator(self, mock_complete):
+        self.proxy.post = mock.Mock(return_value=mock.Mock(
+            status_code=200,
+            content=b'<InitiateMultipartUploadResult>'
+                    b'<UploadId>UID</UploadId>'
+                    b'</InitiateMultipartUploadResult>'))
+        mock_complete.return_value = mock.Mock(status_code=200)
+
+        self.proxy.create_object_from_stream(
+            'container', 'obj', self._chunks(), segment_size=10, buffers=2,
+            content_type='text/plain', **{'x-obs-meta-k': 'v'})
+
+        self.proxy.post.assert_called_once_with(
+            url='/obj?uploads', endpoint_override=self.ENDPOINT,
+            headers={'Content-Type': 'text/plain', 'x-obs-meta-k': 'v'},
+            requests_auth=self._ak_auth)
+        url = self.ENDPOINT + '/obj?partNumber=%d&uploadId=UID'
+        self.assertEqual(
+            {url % 1: b'\0' * 5 + b'\1' * 5,
+             url % 2: b'\2' * 5 + b'\3' * 5,
+             url % 3: b'\4' * 5 + b'\5' * 5,
+             url % 4: b'\6' * 5},
+            self.uploaded)
+        mock_complete.assert_called_once_with(
+            self.proxy, self.ENDPOINT + '/obj', 'UID',
+            [{'PartNumber': '1', 'ETag': 'etag-1'},
+             {'PartNumber': '2', 'ETag': 'etag-2'},
+             {'PartNumber': '3', 'ETag': 'etag-3'},
+             {'PartNumber': '4', 'ETag': 'etag-4'}],
+            {}, requests_auth=self._ak_auth)
+
+    @mock.patch('otcextensions.sdk.sdk_proxy.Proxy._create')
+    def test_small_stream(self, mock_create):
+        self.proxy.create_object_from_stream(
+            'container', 'obj', io.BytesIO(b'data'), segment_size=10)
+
+        mock_create.assert_called_once_with(
+            _obj.Object, container='container', name='obj', data=b'data',
+            content_md5='jXd/OF09/siBXSD3SWAm3A==',
+            endpoint_override=self.ENDPOINT,
+            requests_auth=self._ak_auth)
+        self.proxy.put.assert_not_called()
+
+    @mock.patch.object(_obj.Object, 'complete_multipart_upload')
+    @mock.patch.object(_obj.Object, 'initiate_multipart_upload')
+    def test_failure_aborts(self, mock_initiate, mock_complete):
+        mock_initiate.return_value = 'UID'
+        self.proxy.put.side_effect = exceptions.HttpException(
+            'failed', http_status=403)
+
+        self.assertRaises(
+            exceptions.HttpException,
+            self.proxy.create_object_from_stream,
+            'container', 'obj', io.BytesIO(b'x' * 100), segment_size=10,
+            buffers=2)
+
+        mock_complete.assert_not_called()
+        self.proxy.delete.assert_called_once_with(
+            self.ENDPOINT + '/obj?uploadId=UID',
+            requests_auth=self._ak_auth)
+
+
+class TestObsProxyChecksums(ObsProxyBase):
+
+    ENDPOINT = 'https://container.obs.regio.otc.t-systems.com'
+
+    def setUp(self):
+        super(TestObsProxyChecksums, self).setUp()
+        self.filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+        with open(self.filename, 'wb') as f:
+            f.write(b'a' * 10 + b'b' * 10 + b'c' * 5)
+        self.multipart_etag = '%s-3' % hashlib.md5(b''.join(
+            hashlib.md5(part).digest()
+            for part in (b'a' * 10, b'b' * 10, b'c' * 5))).hexdigest()
+
+    def _stale(self, etag, **kwargs):
+        with mock.patch.object(
+                self.proxy, 'get_object_metadata',
+                return_value=_obj.Object(etag='"%s"' % etag)):
+            return self.proxy.is_object_stale(
+                'container', 'obj', self.filename, **kwargs)
+
+    def test_is_object_stale_multipart(self):
+        self.assertFalse(self._stale(self.multipart_etag, segment_size=10))
+        # a plain md5 can not be compared to a multipart ETag
+        self.assertFalse(self._stale(
+            self.multipart_etag, segment_size=10, file_md5='abc'))
+        self.assertTrue(self._stale(self.multipart_etag, segment_size=5))
+        self.assertTrue(self._stale(self.multipart_etag))
+
+    def test_is_object_stale_single(self):
+        md5 = hashlib.md5(b'a' * 10 + b'b' * 10 + b'c' * 5).hexdigest()
+        self.assertFalse(self._stale(md5, segment_size=10))
+        self.assertTrue(self._stale(md5, file_md5='abc'))
+
+    def test_create_object_new_not_hashed(self):
+        with mock.patch.object(
+                self.proxy, 'get_object_metadata',
+                side_effect=exceptions.NotFoundException('404')), \
+                mock.patch.object(
+                    self.proxy, '_upload_object') as mock_upload, \
+                mock.patch('otcextensions.common.utils._get_file_hashes') \
+                as mock_hashes:
+            self.proxy.create_object(
+                'container', 'obj', filename=self.filename,
+                generate_checksums=True)
+
+        mock_hashes.assert_not_called()
+        mock_upload.assert_called_once_with(
+            self.ENDPOINT, self.filename, {}, 'obj', verify=True)
+
+    @mock.patch('otcextensions.sdk.sdk_proxy.Proxy._create')
+    def test_upload_object_verify(self, mock_create):
+        def _create(resource_type, data, **kwargs):
+            body = data.read()
+            return _obj.Object(etag='"%s"' % hashlib.md5(body).hexdigest())
+
+        mock_create.side_effect = _create
+        self.proxy._upload_object(
+            self.ENDPOINT, self.filename, {}, 'obj', verify=True)
+
+        def _create(resource_type, data, **kwargs):
+            data.read()
+            return _obj.Object(etag='"other"')
+
+        mock_create.side_effect = _create
+        self.assertRaises(
+            exceptions.SDKException,
+            self.proxy._upload_object,
+            self.ENDPOINT, self.filename, {}, 'obj', verify=True)
+
+
+class TestObsProxyShardedList(ObsProxyBase):
+
+    KEYS = ['a/1', 'a/2', 'a.txt', 'b', 'b/1', 'c/x/y', 'd']
+
+    def setUp(self):
+        super(TestObsProxyShardedList, self).setUp()
+        self.calls = []
+        self.failing_prefix = None
+
+    def _list_entries(self, session, endpoint_override=None,
+                      requests_auth=None, build=None, prefix=None,
+                      delimiter=None, marker=None):
+        self.calls.append((prefix, delimiter, marker))
+        if prefix is not None and prefix == self.failing_prefix:
+            raise exceptions.HttpException('listing failed')
+        prefix = prefix or ''
+        common_prefixes = set()
+        for key in sorted(self.KEYS):
+            if not key.startswith(prefix) or (marker and key <= marker):
+                continue
+            pos = key.find(delimiter, len(prefix)) if delimiter else -1
+            if pos < 0:
+                yield ('Contents', key, build({'Key': key}) if build
+                       else _obj.Object(name=key))
+            elif key[:pos + 1] not in common_prefixes:
+                common_prefixes.add(key[:pos + 1])
+                yield 'CommonPrefixes', key[:pos + 1], key[:pos + 1]
+
+    def _objects(self, **kwargs):
+        with mock.patch.object(_obj.Object, '_list_entries',
+                               side_effect=self._list_entries):
+            return [o.name for o in self.proxy.objects(
+                'container', parallel=True, **kwargs)]
+
+    def test_delimiter_shards_ordered(self):
+        self.assertEqual(sorted(self.KEYS), self._objects(workers=2))
+        self.assertEqual(
+            [(None, '/', None), ('a/', None, None), ('b/', None, None),
+             ('c/', None, None)],
+            sorted(self.calls, key=lambda c: c[0] or ''))
+
+    def test_delimiter_shards_unordered(self):
+        self.assertEqual(sorted(self.KEYS),
+                         sorted(self._objects(ordered=False)))
+
+    def test_boundaries(self):
+        self.assertEqual(sorted(self.KEYS),
+                         self._objects(boundaries=['a/2', 'b/1']))
+        self.assertEqual(
+            [None, 'a/2', 'b/1'], sorted(
+                (c[2] for c in self.calls), key=lambda m: m or ''))
+        self.assertTrue(all(c[1] is None for c in self.calls))
+
+    def test_shard_error(self):
+        self.failing_prefix = 'b/'
+        for ordered in (True, False):
+            self.assertRaises(exceptions.HttpException, self._objects,
+                              ordered=ordered)
+
+    def test_fields(self):
+        with mock.patch.object(_obj.Object, '_list_entries',
+                               side_effect=self._list_entries):
+            result = list(self.proxy.objects(
+                'container', parallel=True, fields=['name']))
+        self.assertEqual([(key,) for key in sorted(self.KEYS)], result)
+
+    def test_close_early(self):
+        with mock.patch.object(_obj.Object, '_list_entries',
+                               side_effect=self._list_entries):
+            result = self.proxy.objects('container', parallel=True)
+            self.assertEqual('a.txt', next(result).name)
+            result.close()
+
+
+class TestObsProxyDeleteObjects(ObsProxyBase):
+
+    def setUp(self):
+        super(TestObsProxyDeleteObjects, self).setUp()
+        self.batches = []
+
+    def _delete_multiple(self, proxy, endpoint, names, **params):
+        self.batches.append(list(names))
+        return [(name, 'AccessDenied', 'Access Denied')
+                for name in names if name.startswith('locked')]
+
+    @mock.patch.object(_obj.Object, 'delete_multiple')
+    def test_batches(self, mock_delete):
+        mock_delete.side_effect = self._delete_multiple
+        keys = (name for name in ['a', 'locked-b', 'c', 'd', 'e'])
+
+        report = self.proxy.delete_objects(
+            'container', keys, batch_size=2, workers=2)
+
+        self.assertEqual([('locked-b', 'AccessDenied', 'Access Denied')],
+                         report)
+        self.assertEqual([['a', 'locked-b'], ['c', 'd'], ['e']],
+                         sorted(self.batches))
+
+    @mock.patch.object(_obj.Object, 'delete_multiple')
+    def test_objects_input(self, mock_delete):
+        mock_delete.side_effect = self._delete_multiple
+
+        report = self.proxy.delete_objects(
+            'container', [_obj.Object(name='a'), 'b'])
+
+        self.assertEqual([], report)
+        self.assertEqual([['a', 'b']], self.batches)
+
+    @mock.patch.object(_obj.Object, 'delete_multiple')
+    def test_failed_batch(self, mock_delete):
+        mock_delete.side_effect = [
+            exceptions.HttpException('unavailable', http_status=503),
+            [],
+            exceptions.HttpException('forbidden', http_status=403)]
+
+        report = self.proxy.delete_objects(
+            'container', ['a', 'b', 'c'], batch_size=2, workers=1)
+
+        self.assertEqual(3, mock_delete.call_count)
+        self.assertEqual([('c', None, 'forbidden')],
+                         [(n, c, m.split(':')[0]) for n, c, m in report])
+
+    def test_batch_size(self):
+        self.assertRaises(ValueError, self.proxy.delete_objects,
+                          'container', ['a'], batch_size=1001)
+
+
+class TestObsProxySync(ObsProxyBase):
+
+    ENDPOINT = 'https://container.obs.regio.otc.t-systems.com'
+
+    def setUp(self):
+        super(TestObsProxySync, self).setUp()
+        self.local = self.useFixture(fixtures.TempDir()).path
+        self.manifest = os.path.join(self.local, '.manifest')
+        os.makedirs(os.path.join(self.local, 'dir'))
+        self.files = {'same': b'same', 'dir/changed': b'local',
+                      'dir/new': b'new'}
+        for name, data in self.files.items():
+            with open(os.path.join(self.local, name), 'wb') as f:
+                f.write(data)
+        self.remote = [
+            _obj.Object(name='pre/same', content_length=4,
+                        etag='"%s"' % hashlib.md5(b'same').hexdigest()),
+            _obj.Object(name='pre/dir/changed', content_length=6,
+                        etag='"%s"' % hashlib.md5(b'remote').hexdigest()),
+            _obj.Object(name='pre/gone', content_length=1, etag='"x"'),
+            _obj.Object(name='pre/dir/', content_length=0, etag='"x"'),
+        ]
+        self.events = []
+
+    def _sync(self, local_path, container, **kwargs):
+        # patched per call, the tests inherited from TestObsProxy need the
+        # real methods
+        for attr, patch_kwargs in (
+                ('objects', {'return_value': self.remote}),
+                ('_upload_object',
+                 {'return_value': _obj.Object(etag='"e"')}),
+                ('download_object', {'side_effect': self._download}),
+                ('delete_object', {})):
+            if not isinstance(getattr(self.proxy, attr), mock.Mock):
+                patcher = mock.patch.object(
+                    self.proxy, attr, **patch_kwargs)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+        return self.proxy.sync_directory(local_path, container, **kwargs)
+
+    def _download(self, name, container, file, parallel):
+        with open(file, 'wb') as f:
+            f.write(name.encode())
+
+    def _callback(self, action, name, error):
+        self.events.append((action, name, error))
+
+    def test_upload(self):
+        report = self._sync(
+            self.local, 'container', prefix='/pre/', delete=True,
+            manifest_file=self.manifest, callback=self._callback)
+
+        self.proxy.objects.assert_called_once_with(
+            'container', prefix='pre/')
+        self.assertEqual(
+            [('delete', 'pre/gone', None),
+             ('upload', 'pre/dir/changed', None),
+             ('upload', 'pre/dir/new', None)],
+            sorted(report))
+        self.assertIn(('skip', 'pre/same', None), self.events)
+        self.assertEqual(4, len(self.events))
+        self.assertEqual(
+            [mock.call(self.ENDPOINT,
+                       os.path.join(self.local, 'dir', 'changed'), {},
+                       'pre/dir/changed'),
+             mock.call(self.ENDPOINT,
+                       os.path.join(self.local, 'dir', 'new'), {},
+                       'pre/dir/new')],
+            sorted(self.proxy._upload_object.call_args_list))
+        self.proxy.delete_object.assert_called_once_with(
+            'pre/gone', container='container')
+
+        with open(self.manifest) as f:
+            files = json.load(f)['files']
+        self.assertEqual(
+            ['dir/changed', 'dir/new', 'same'], sorted(files))
+        self.assertEqual(
+            hashlib.md5(b'same').hexdigest(), files['same']['etag'])
+
+    def test_upload_cached(self):
+        self._sync(
+            self.local, 'container', prefix='pre',
+            manifest_file=self.manifest)
+        with mock.patch('otcextensions.common.utils._get_file_hashes') \
+                as mock_hashes:
+            self._sync(
+                self.local, 'container', prefix='pre',
+                manifest_file=self.manifest)
+        mock_hashes.assert_not_called()
+
+    def test_upload_large(self):
+        response = mock.Mock(content=(
+            b'<CompleteMultipartUploadResult><Key>pre/dir/changed</Key>'
+            b'<ETag>"abc-2"</ETag></CompleteMultipartUploadResult>'))
+        with mock.patch.object(self.proxy, '_upload_large_object',
+                               return_value=response) as mock_upload:
+            self._sync(
+                self.local, 'container', prefix='pre', segment_size=4,
+                manifest_file=self.manifest)
+
+        mock_upload.assert_called_once_with(
+            self.ENDPOINT, os.path.join(self.local, 'dir', 'changed'), {}, 5,
+            4, name='pre/dir/changed')
+        with open(self.manifest) as f:
+            files = json.load(f)['files']
+        self.assertEqual('abc-2', files['dir/changed']['etag'])
+
+    def test_download(self):
+        report = self._sync(
+            self.local, 'container', prefix='pre', direction='download',
+            delete=True, callback=self._callback)
+
+        self.assertEqual(
+            [('delete', 'pre/dir/new', None),
+             ('download', 'pre/dir/changed', None),
+             ('download', 'pre/gone', None)],
+            sorted(report))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.local, 'dir', 'new')))
+        with open(os.path.join(self.local, 'gone'), 'rb') as f:
+            self.assertEqual(b'pre/gone', f.read())
+
+    def test_download_failure_keeps_file(self):
+        error = exceptions.SDKException('interrupted')
+
+        def _download(name, container, file, parallel):
+            with open(file, 'wb') as f:
+                f.write(b'part')
+            raise error
+
+        self.proxy.download_object = mock.Mock(side_effect=_download)
+        report = self._sync(
+            self.local, 'container', prefix='pre', direction='download')
+
+        self.assertIn(('download', 'pre/dir/changed', error), report)
+        with open(os.path.join(self.local, 'dir', 'changed'), 'rb') as f:
+            self.assertEqual(b'local', f.read())
+        self.assertEqual(
+            ['changed', 'new'],
+            sorted(os.listdir(os.path.join(self.local, 'dir'))))
+
+    def test_failure_reported(self):
+        error = exceptions.HttpException('failed')
+        self.proxy._upload_object = mock.Mock(side_effect=error)
+
+        report = self._sync(
+            self.local, 'container', prefix='pre')
+
+        self.assertEqual(
+            [('upload', 'pre/dir/changed', error),
+             ('upload', 'pre/dir/new', error)],
+            sorted(report, key=lambda r: r[1]))
+
+
 class TestExtractName(TestObsProxy):
 
     def test_extract_name(self):
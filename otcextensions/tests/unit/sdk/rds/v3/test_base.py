@@ -18,6 +18,12 @@ from openstack.tests.unit import base
 from otcextensions.sdk.rds.v3 import _base
 
 
+class Item(_base.Resource):
+    base_path = '/items'
+    resources_key = 'items'
+    allow_list = True
+
+
 class TestBase(base.TestCase):
     def setUp(self):
         super(TestBase, self).setUp()
@@ -43,3 +49,42 @@ class TestBase(base.TestCase):
 
         sot._translate_response.assert_called_with(response, has_body=True)
         self.assertIsInstance(rt, _base.Resource)
+
+    def _get_page(self, uri, params=None, **kwargs):
+        offset = params.get('offset', 0)
+        limit = params.get('limit', 2)
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {
+            'items': [{'id': str(i)}
+                      for i in range(offset, min(offset + limit, 7))],
+            'total_count': 7
+        }
+        return response
+
+    def test_list_prefetch(self):
+        self.sess.get = mock.Mock(side_effect=self._get_page)
+
+        result = list(Item.list(self.sess, prefetch=2))
+
+        self.assertEqual([str(i) for i in range(7)], [r.id for r in result])
+        self.assertEqual(
+            [{}, {'offset': 2, 'limit': 2}, {'offset': 4, 'limit': 2},
+             {'offset': 6, 'limit': 2}],
+            sorted((c[1]['params'] for c in self.sess.get.call_args_list),
+                   key=lambda p: p.get('offset', 0)))
+
+    def test_list_prefetch_limit_marker(self):
+        self.sess.get = mock.Mock(side_effect=self._get_page)
+
+        result = list(Item.list(self.sess, prefetch=3, limit=3, marker=1))
+
+        self.assertEqual([str(i) for i in range(1, 7)],
+                         [r.id for r in result])
+        self.assertEqual(2, self.sess.get.call_count)
+
+    def test_list_fields(self):
+        self.sess.get = mock.Mock(side_effect=self._get_page)
+
+        result = list(Item.list(self.sess, prefetch=2, fields=['id']))
+
+        self.assertEqual([(str(i),) for i in range(7)], result)
@@ -186,6 +186,25 @@ class TestInstance(TestRdsProxy):
         self.verify_delete(self.proxy.delete_instance,
                            instance.Instance, True)
 
+    def test_get_instances(self):
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._get_many',
+            self.proxy.get_instances,
+            method_args=[['i1', 'i2']],
+            expected_args=[instance.Instance, ['i1', 'i2']],
+            expected_kwargs={'workers': 8}
+        )
+
+    def test_delete_instances(self):
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._delete_many',
+            self.proxy.delete_instances,
+            method_args=[['i1', 'i2']],
+            method_kwargs={'ignore_missing': False},
+            expected_args=[instance.Instance, ['i1', 'i2']],
+            expected_kwargs={'ignore_missing': False, 'workers': 8}
+        )
+
     def test_fetch_restore_times(self):
         self._verify(
             'otcextensions.sdk.rds.v3.instance.Instance.fetch_restore_times',
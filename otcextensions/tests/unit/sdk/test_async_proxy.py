@@ -0,0 +1,282 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import json
+from urllib import parse
+
+import mock
+
+from openstack import exceptions
+from openstack import resource
+from openstack.tests.unit import base
+
+from otcextensions.sdk import async_proxy
+from otcextensions.sdk import sdk_proxy
+from otcextensions.sdk import sdk_resource
+
+
+class Item(sdk_resource.Resource):
+
+    base_path = '/items'
+    resources_key = 'items'
+    resource_key = 'item'
+    allow_list = True
+    allow_fetch = True
+    allow_create = True
+
+    _query_mapping = resource.QueryParameters('limit', 'marker')
+
+    size = resource.Body('size', type=int)
+
+
+class FakeResponse(object):
+
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self.body = json.dumps(body).encode()
+        self.headers = dict(headers or {},
+                            **{'Content-Type': 'application/json'})
+        self.reason = 'OK' if status < 400 else 'Error'
+        self.url = 'https://example.com'
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class FakeSession(object):
+    """Answers like aiohttp.ClientSession and tracks concurrency"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def request(self, method, url, headers=None, data=None):
+        self.calls.append((method, url, headers, data))
+        return self._respond(method, url, data)
+
+    def _respond(self, method, url, data):
+        session = self
+
+        class _Context(object):
+            async def __aenter__(self):
+                session.in_flight += 1
+                session.max_in_flight = max(
+                    session.max_in_flight, session.in_flight)
+                await asyncio.sleep(0.001)
+                session.in_flight -= 1
+                return session.handler(method, url, data)
+
+            async def __aexit__(self, *exc_info):
+                pass
+
+        return _Context()
+
+
+class TestAsyncProxy(base.TestCase):
+
+    def setUp(self):
+        super(TestAsyncProxy, self).setUp()
+        self.proxy = mock.Mock(spec=sdk_proxy.Proxy)
+        self.proxy.get_endpoint.return_value = 'https://example.com/v1'
+        self.proxy.session = mock.Mock()
+        self.proxy.session.get_auth_headers.return_value = {
+            'X-Auth-Token': 'token'}
+        self.proxy._get_resource.side_effect = \
+            lambda resource_type, value, **attrs: resource_type.new(
+                id=value, **attrs)
+
+    def _run(self, handler, coroutine_function, **kwargs):
+        session = FakeSession(handler)
+
+        async def _main():
+            async with async_proxy.AsyncProxy(
+                    self.proxy, session=session, **kwargs) as aproxy:
+                return await coroutine_function(aproxy)
+
+        return session, asyncio.run(_main())
+
+    def test_get_concurrency(self):
+        def _handler(method, url, data):
+            return FakeResponse(200, {'item': {
+                'id': url.rsplit('/', 1)[1], 'size': 1}})
+
+        async def _get_many(aproxy):
+            return await asyncio.gather(
+                *(aproxy.get(Item, str(i)) for i in range(20)))
+
+        session, result = self._run(_handler, _get_many, concurrency=5)
+
+        self.assertEqual([str(i) for i in range(20)], [r.id for r in result])
+        self.assertEqual(1, result[0].size)
+        self.assertEqual(5, session.max_in_flight)
+        method, url, headers, data = session.calls[0]
+        self.assertEqual(('GET', 'https://example.com/v1/items/0'),
+                         (method, url))
+        self.assertEqual('token', headers['X-Auth-Token'])
+
+    def test_auth_headers_fetched_once(self):
+        async def _get_many(aproxy):
+            return await asyncio.gather(
+                *(aproxy.get(Item, str(i)) for i in range(10)))
+
+        self._run(lambda method, url, data: FakeResponse(
+            200, {'item': {}}), _get_many)
+
+        self.proxy.session.get_auth_headers.assert_called_once()
+        self.proxy.get_endpoint.assert_called_once_with()
+
+    def test_auth_refreshed(self):
+        self.proxy.session.get_auth_headers.side_effect = [
+            {'X-Auth-Token': 'expired'}, {'X-Auth-Token': 'token'}]
+
+        def _handler(method, url, data):
+            return FakeResponse(200, {'item': {}})
+
+        def _request(method, url, headers=None, data=None):
+            session.calls.append((method, url, headers, data))
+            if headers['X-Auth-Token'] == 'expired':
+                handler = (lambda method, url, data: FakeResponse(401, {}))
+            else:
+                handler = _handler
+            return FakeSession(handler)._respond(method, url, data)
+
+        session = FakeSession(_handler)
+        session.request = _request
+
+        async def _main():
+            async with async_proxy.AsyncProxy(
+                    self.proxy, session=session) as aproxy:
+                return await aproxy.get(Item, 'id')
+
+        asyncio.run(_main())
+
+        self.assertEqual(['expired', 'token'],
+                         [c[2]['X-Auth-Token'] for c in session.calls])
+        self.proxy.session.invalidate.assert_called_once_with(auth=None)
+
+    def test_get_not_found(self):
+        async def _get(aproxy):
+            return await aproxy.get(Item, 'missing')
+
+        self.assertRaises(
+            exceptions.NotFoundException, self._run,
+            lambda method, url, data: FakeResponse(404, {}), _get)
+
+    def test_create(self):
+        def _handler(method, url, data):
+            body = json.loads(data)['item']
+            return FakeResponse(200, {'item': dict(body, id='new')})
+
+        async def _create(aproxy):
+            return await aproxy.create(Item, size=3)
+
+        session, result = self._run(_handler, _create)
+
+        self.assertEqual('new', result.id)
+        self.assertEqual(3, result.size)
+        self.assertEqual('POST', session.calls[0][0])
+        self.assertEqual('application/json',
+                         session.calls[0][2]['Content-Type'])
+
+    def test_create_empty_body(self):
+        class Bare(Item):
+            resource_key = None
+
+        async def _create(aproxy):
+            return await aproxy.create(Bare)
+
+        session, result = self._run(
+            lambda method, url, data: FakeResponse(200, {'id': 'new'}),
+            _create)
+
+        self.assertEqual('new', result.id)
+        self.assertEqual(b'{}', session.calls[0][3])
+        self.assertEqual('application/json',
+                         session.calls[0][2]['Content-Type'])
+
+    def test_report_stats(self):
+        async def _get(aproxy):
+            return await aproxy.get(Item, 'id')
+
+        self._run(lambda method, url, data: FakeResponse(
+            200, {'item': {}}), _get)
+
+        self.proxy._report_stats.assert_called_once()
+        response = self.proxy._report_stats.call_args[0][0]
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('GET', response.request.method)
+        self.assertEqual('https://example.com/v1/items/id',
+                         response.request.url)
+        self.assertGreaterEqual(response.elapsed.total_seconds(), 0)
+
+    def test_report_stats_failure(self):
+        def _handler(method, url, data):
+            raise ConnectionError('reset')
+
+        async def _get(aproxy):
+            return await aproxy.get(Item, 'id')
+
+        self.assertRaises(ConnectionError, self._run, _handler, _get)
+
+        response, url, method, exc = self.proxy._report_stats.call_args[0]
+        self.assertIsNone(response)
+        self.assertEqual(('https://example.com/v1/items/id', 'GET'),
+                         (url, method))
+        self.assertIsInstance(exc, ConnectionError)
+
+    def test_list(self):
+        def _handler(method, url, data):
+            query = parse.parse_qs(parse.urlsplit(url).query)
+            start = int(query.get('marker', ['-1'])[0]) + 1
+            return FakeResponse(200, {'items': [
+                {'id': str(i)} for i in range(start, min(start + 2, 5))]})
+
+        async def _list(aproxy):
+            return [item.id async for item in aproxy.list(Item, limit=2)]
+
+        session, result = self._run(_handler, _list)
+
+        self.assertEqual(['0', '1', '2', '3', '4'], result)
+        url = parse.urlsplit(session.calls[1][1])
+        self.assertEqual('/v1/items', url.path)
+        self.assertEqual({'limit': ['2'], 'marker': ['1']},
+                         parse.parse_qs(url.query))
+
+    def test_requests_auth(self):
+        def _sign(request):
+            request.headers['Authorization'] = 'signed ' + request.url
+            return request
+
+        async def _get(aproxy):
+            return await aproxy.get(Item, 'id', requests_auth=_sign)
+
+        session, _result = self._run(
+            lambda method, url, data: FakeResponse(200, {'item': {}}), _get)
+
+        headers = session.calls[0][2]
+        self.assertEqual('signed https://example.com/v1/items/id',
+                         headers['Authorization'])
+        self.assertNotIn('X-Auth-Token', headers)
+
+    def test_not_open(self):
+        aproxy = async_proxy.AsyncProxy(self.proxy, session=FakeSession(None))
+
+        self.assertRaises(exceptions.SDKException, asyncio.run,
+                          aproxy.get(Item, 'id'))
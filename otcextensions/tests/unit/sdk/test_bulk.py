@@ -0,0 +1,114 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import threading
+import time
+
+import mock
+
+from openstack import exceptions
+from openstack.tests.unit import base
+
+from otcextensions.sdk import bulk
+
+
+class TestRunMany(base.TestCase):
+
+    def test_order_and_errors(self):
+        def _call(item):
+            time.sleep(0.001 * (10 - item))
+            if item % 3 == 0:
+                raise exceptions.NotFoundException('missing %d' % item)
+            return item * 2
+
+        results = bulk.run_many(_call, range(10), workers=4)
+
+        self.assertEqual(list(range(10)), [r[0] for r in results])
+        for item, result, error in results:
+            if item % 3 == 0:
+                self.assertIsNone(result)
+                self.assertIsInstance(error, exceptions.NotFoundException)
+            else:
+                self.assertEqual(item * 2, result)
+                self.assertIsNone(error)
+
+    def test_concurrency(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0}
+
+        def _call(item):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+
+        bulk.run_many(_call, range(20), workers=3)
+
+        self.assertEqual(3, state['max'])
+
+    def test_lazy_items(self):
+        consumed = []
+
+        def _items():
+            for item in range(100):
+                consumed.append(item)
+                yield item
+
+        def _call(item):
+            # the queue of 2 * workers is full before the first finishes
+            time.sleep(0.05 if item == 0 else 0)
+            return len(consumed)
+
+        results = bulk.run_many(_call, _items(), workers=2)
+
+        self.assertLessEqual(results[0][1], 5)
+
+    def test_iter_many(self):
+        results = bulk.iter_many(lambda item: item * 2, iter(range(5)))
+
+        self.assertNotIsInstance(results, list)
+        self.assertEqual([(i, i * 2, None) for i in range(5)], list(results))
+
+
+class TestBulkProxyMixin(base.TestCase):
+
+    def setUp(self):
+        super(TestBulkProxyMixin, self).setUp()
+        self.proxy = bulk.BulkProxyMixin()
+        self.proxy._get = mock.Mock(side_effect=lambda rt, value, **kw: value)
+        self.proxy._delete = mock.Mock()
+        self.proxy._update = mock.Mock()
+        self.resource_type = mock.Mock()
+
+    def test_get_many(self):
+        results = self.proxy._get_many(
+            self.resource_type, ['a', 'b'], parent_id='p')
+
+        self.assertEqual([('a', 'a', None), ('b', 'b', None)], results)
+        self.proxy._get.assert_any_call(
+            self.resource_type, 'a', parent_id='p')
+
+    def test_delete_many(self):
+        self.proxy._delete_many(
+            self.resource_type, ['a'], ignore_missing=False, parent_id='p')
+
+        self.proxy._delete.assert_called_once_with(
+            self.resource_type, 'a', ignore_missing=False, parent_id='p')
+
+    def test_update_many(self):
+        results = self.proxy._update_many(
+            self.resource_type, [('a', {'name': 'x'})], parent_id='p')
+
+        self.proxy._update.assert_called_once_with(
+            self.resource_type, 'a', name='x', parent_id='p')
+        self.assertEqual(('a', {'name': 'x'}), results[0][0])
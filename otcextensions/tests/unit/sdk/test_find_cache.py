@@ -0,0 +1,270 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import fixtures
+import mock
+
+from keystoneauth1 import adapter
+
+from openstack import exceptions
+from openstack.tests.unit import base
+
+from otcextensions.sdk import find_cache
+from otcextensions.sdk import sdk_proxy
+from otcextensions.sdk import sdk_resource
+from otcextensions.sdk.mrs.v1 import datasource
+
+
+class Item(sdk_resource.Resource):
+
+    base_path = '/items'
+    resources_key = 'items'
+    allow_list = True
+    allow_fetch = True
+
+
+class Other(Item):
+    pass
+
+
+class Gettable(sdk_resource.Resource):
+
+    base_path = '/gettables'
+    allow_fetch = True
+    allow_get = True
+
+
+class TestNameCache(base.TestCase):
+
+    def test_ttl(self):
+        cache = find_cache.NameCache(ttl=10)
+        with mock.patch('time.monotonic', return_value=100):
+            cache.set(Item, 'name', 'id', {'zone': 'z'})
+            self.assertEqual('id', cache.get(Item, 'name', {'zone': 'z'}))
+            self.assertIsNone(cache.get(Item, 'name', {}))
+            self.assertIsNone(cache.get(Other, 'name', {'zone': 'z'}))
+        with mock.patch('time.monotonic', return_value=111):
+            self.assertIsNone(cache.get(Item, 'name', {'zone': 'z'}))
+
+    def test_invalidate(self):
+        cache = find_cache.NameCache()
+        cache.set(Item, 'a', '1', {})
+        cache.set(Other, 'a', '2', {})
+
+        cache.invalidate(Item)
+
+        self.assertIsNone(cache.get(Item, 'a', {}))
+        self.assertEqual('2', cache.get(Other, 'a', {}))
+
+    def test_discard(self):
+        cache = find_cache.NameCache()
+        cache.set(Item, 'a', '1', {})
+        cache.set(Item, 'b', '2', {})
+
+        cache.discard(Item, 'a', {})
+
+        self.assertIsNone(cache.get(Item, 'a', {}))
+        self.assertEqual('2', cache.get(Item, 'b', {}))
+
+    def test_disabled(self):
+        cache = find_cache.NameCache(ttl=0)
+        cache.set(Item, 'a', '1', {})
+        self.assertIsNone(cache.get(Item, 'a', {}))
+
+
+class TestFindCache(base.TestCase):
+
+    def setUp(self):
+        super(TestFindCache, self).setUp()
+        self.sess = mock.Mock(spec=adapter.Adapter)
+        self.sess.default_microversion = None
+        self.sess._get_connection = mock.Mock(return_value=self.cloud)
+
+    def _response(self, body):
+        response = mock.Mock(status_code=200, headers={}, links={})
+        response.json.return_value = body
+        return response
+
+    def test_get_cache_per_connection(self):
+        cache = find_cache.get_cache(self.sess)
+
+        self.assertIs(cache, find_cache.get_cache(self.sess))
+        self.assertIs(cache, find_cache.get_cache(self.cloud))
+        self.assertIsNot(
+            cache, find_cache.get_cache(mock.Mock(spec=adapter.Adapter)))
+
+    def test_find(self):
+        finder = mock.Mock(return_value=Item(id='1', name='item'))
+        self.sess.get.return_value = self._response(
+            {'id': '1', 'name': 'item'})
+
+        first = find_cache.find(Item, self.sess, 'item', finder)
+        second = find_cache.find(Item, self.sess, 'item', finder)
+
+        self.assertEqual('1', first.id)
+        self.assertEqual('1', second.id)
+        finder.assert_called_once_with()
+        self.sess.get.assert_called_once()
+        self.assertEqual('items/1', self.sess.get.call_args[0][0])
+
+    def test_find_by_id_not_cached(self):
+        finder = mock.Mock(return_value=Item(id='1', name='item'))
+
+        find_cache.find(Item, self.sess, '1', finder)
+
+        self.assertIsNone(
+            find_cache.get_cache(self.sess).get(Item, '1', {}))
+
+    def test_find_stale(self):
+        find_cache.get_cache(self.sess).set(Item, 'item', '1', {})
+        self.sess.get.return_value = self._response(
+            {'id': '1', 'name': 'renamed'})
+        finder = mock.Mock(return_value=Item(id='2', name='item'))
+
+        result = find_cache.find(Item, self.sess, 'item', finder)
+
+        self.assertEqual('2', result.id)
+        self.assertEqual(
+            '2', find_cache.get_cache(self.sess).get(Item, 'item', {}))
+
+    def test_find_deleted(self):
+        cache = find_cache.get_cache(self.sess)
+        cache.set(Item, 'item', '1', {})
+        cache.set(Item, 'other', '2', {})
+        self.sess.get.side_effect = exceptions.NotFoundException('gone')
+        finder = mock.Mock(return_value=None)
+
+        self.assertIsNone(find_cache.find(Item, self.sess, 'item', finder))
+        self.assertIsNone(cache.get(Item, 'item', {}))
+        self.assertEqual('2', cache.get(Item, 'other', {}))
+
+    def test_find_not_fetchable(self):
+        finder = mock.Mock(
+            return_value=datasource.Datasource(id='1', name='item'))
+
+        find_cache.find(datasource.Datasource, self.sess, 'item', finder)
+        result = find_cache.find(
+            datasource.Datasource, self.sess, 'item', finder)
+
+        self.assertEqual('1', result.id)
+        self.assertEqual(2, finder.call_count)
+        self.sess.get.assert_not_called()
+
+    def test_find_get_path(self):
+        find_cache.get_cache(self.sess).set(Gettable, 'item', '1', {})
+        self.sess.get.return_value = self._response(
+            {'id': '1', 'name': 'item'})
+        finder = mock.Mock()
+
+        with mock.patch.object(Gettable, 'fetch', side_effect=AssertionError):
+            result = find_cache.find(Gettable, self.sess, 'item', finder)
+
+        self.assertEqual('1', result.id)
+        finder.assert_not_called()
+
+    def test_find_error(self):
+        cache = find_cache.get_cache(self.sess)
+        cache.set(Item, 'item', '1', {})
+        cache.set(Item, 'other', '2', {})
+        self.sess.get.return_value = mock.Mock(
+            status_code=503, headers={}, links={},
+            json=mock.Mock(return_value={}))
+        finder = mock.Mock(return_value=Item(id='1', name='item'))
+
+        result = find_cache.find(Item, self.sess, 'item', finder)
+
+        self.assertEqual('1', result.id)
+        finder.assert_called_once_with()
+        self.assertEqual('2', cache.get(Item, 'other', {}))
+
+    def test_resolve(self):
+        find_cache.get_cache(self.sess).set(Item, 'cached', '0', {})
+        self.sess.get.return_value = self._response({'items': [
+            {'id': '1', 'name': 'a'},
+            {'id': '2', 'name': 'b'},
+            {'id': '3', 'name': 'c'}]})
+
+        result = find_cache.resolve(
+            Item, self.sess, ['a', '3', 'cached', 'missing'])
+
+        self.assertEqual({'a': '1', '3': '3', 'cached': '0'}, result)
+        self.sess.get.assert_called_once()
+        self.assertEqual(
+            '1', find_cache.get_cache(self.sess).get(Item, 'a', {}))
+
+    def test_resolve_duplicate(self):
+        self.sess.get.return_value = self._response({'items': [
+            {'id': '1', 'name': 'a'},
+            {'id': '2', 'name': 'a'}]})
+
+        self.assertRaises(exceptions.DuplicateResource,
+                          find_cache.resolve, Item, self.sess, ['a'])
+
+
+class TestFindCacheProxyMixin(base.TestCase):
+
+    class Base:
+        def _get_connection(self):
+            return None
+
+        def _create(self, resource_type, **attrs):
+            return resource_type(**attrs)
+
+        def _delete(self, resource_type, value, ignore_missing=True):
+            raise exceptions.NotFoundException('gone')
+
+    class Proxy(find_cache.FindCacheProxyMixin, Base):
+        pass
+
+    def test_invalidation(self):
+        proxy = self.Proxy()
+        cache = find_cache.get_cache(proxy)
+
+        cache.set(Item, 'a', '1', {})
+        proxy._create(Item, name='a')
+        self.assertIsNone(cache.get(Item, 'a', {}))
+
+        cache.set(Item, 'a', '1', {})
+        self.assertRaises(exceptions.NotFoundException,
+                          proxy._delete, Item, '1')
+        self.assertIsNone(cache.get(Item, 'a', {}))
+
+
+class TestProxyFind(base.TestCase):
+
+    def setUp(self):
+        super(TestProxyFind, self).setUp()
+        self.proxy = sdk_proxy.Proxy(self.cloud.session)
+        self.find = self.useFixture(fixtures.MockPatch(
+            'otcextensions.sdk.find_cache.find')).mock
+        self.resource_find = self.useFixture(fixtures.MockPatchObject(
+            Item, 'find')).mock
+
+    def test_cached(self):
+        self.proxy._find(Item, 'item')
+
+        self.find.assert_called_once()
+        self.resource_find.assert_not_called()
+
+    def test_use_cache(self):
+        self.proxy._find(Item, 'item', use_cache=False)
+
+        self.find.assert_not_called()
+        self.resource_find.assert_called_once()
+
+    def test_use_find_cache(self):
+        self.proxy.use_find_cache = False
+
+        self.proxy._find(Item, 'item')
+        self.find.assert_not_called()
+
+        self.proxy._find(Item, 'item', use_cache=True)
+        self.find.assert_called_once()
@@ -0,0 +1,194 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import datetime
+
+import mock
+import requests
+
+from keystoneauth1 import adapter
+from openstack.tests.unit import base
+
+from otcextensions.sdk import ak_auth
+from otcextensions.sdk import instrumentation
+from otcextensions.sdk import proxy
+from otcextensions.sdk import sdk_resource
+
+
+class Item(sdk_resource.Resource):
+    base_path = '/items'
+    resources_key = 'items'
+    allow_list = True
+
+
+class TestHistogram(base.TestCase):
+
+    def test_percentile(self):
+        histogram = instrumentation.Histogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000.0)
+
+        self.assertEqual(1000, histogram.count)
+        self.assertAlmostEqual(500.5, histogram.sum)
+        self.assertEqual(0.001, histogram.min)
+        self.assertEqual(1.0, histogram.max)
+        for percent, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+            value = histogram.percentile(percent)
+            self.assertLessEqual(expected, value)
+            self.assertLess(value, expected * (1 + 2 ** -6))
+        self.assertEqual(1.0, histogram.percentile(100))
+
+    def test_empty(self):
+        self.assertIsNone(instrumentation.Histogram().percentile(50))
+
+    def test_cumulative(self):
+        histogram = instrumentation.Histogram()
+        for seconds in (0.001, 0.02, 0.02, 3):
+            histogram.record(seconds)
+
+        self.assertEqual([1, 3, 3, 4],
+                         histogram.cumulative((0.005, 0.025, 1.0, 5.0)))
+
+
+class TestRegistry(base.TestCase):
+
+    def setUp(self):
+        super(TestRegistry, self).setUp()
+        self.registry = instrumentation.Registry()
+
+    def test_report_request(self):
+        self.registry.report_request(
+            'dns', 'GET', '/v2/zones/{id}', status_code='200',
+            duration=0.25, bytes_sent=0, bytes_received=120)
+        self.registry.report_request('dns', 'GET', '/v2/zones/{id}')
+
+        labels = dict(service_type='dns', method='GET',
+                      endpoint='/v2/zones/{id}')
+        self.assertEqual(1, self.registry.histogram(
+            'request_duration_seconds', **labels).count)
+        self.assertEqual(1, self.registry.counter(
+            'requests_total', status_code='200', **labels))
+        self.assertEqual(1, self.registry.counter(
+            'requests_total', status_code='error', **labels))
+        self.assertEqual(120, self.registry.counter(
+            'response_bytes_total', service_type='dns'))
+        self.assertEqual([], self.registry.counters('request_bytes_total'))
+
+    def test_snapshot(self):
+        self.registry.observe('request_duration_seconds', 1, endpoint='a')
+        self.registry.observe('request_duration_seconds', 2, endpoint='b')
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual([{'endpoint': 'b'}, {'endpoint': 'a'}],
+                         [entry['labels'] for entry in snapshot])
+        self.assertEqual(2, snapshot[0]['p99'])
+
+    def test_to_prometheus(self):
+        self.registry.observe('signing_duration_seconds', 0.002,
+                              service='s3')
+        self.registry.increment('retries_total', service_type='obs',
+                                operation='say "hi"')
+
+        self.assertEqual(
+            '# HELP otce_signing_duration_seconds Duration of the AK/SK'
+            ' request signing.\n'
+            '# TYPE otce_signing_duration_seconds histogram\n'
+            'otce_signing_duration_seconds_bucket{service="s3",le="0.005"}'
+            ' 1\n'
+            'otce_signing_duration_seconds_bucket{service="s3",le="+Inf"}'
+            ' 1\n'
+            'otce_signing_duration_seconds_sum{service="s3"} 0.002\n'
+            'otce_signing_duration_seconds_count{service="s3"} 1\n'
+            '# HELP otce_retries_total Number of requests repeated by the'
+            ' SDK.\n'
+            '# TYPE otce_retries_total counter\n'
+            'otce_retries_total{operation="say \\"hi\\"",'
+            'service_type="obs"} 1\n',
+            self.registry.to_prometheus(buckets=(0.005,)))
+
+    def test_tracer(self):
+        tracer = mock.Mock()
+        self.registry.tracer = tracer
+
+        self.registry.report_request(
+            'dns', 'GET', '/v2/zones', status_code='200', duration=1.5)
+
+        args, kwargs = tracer.start_span.call_args
+        self.assertEqual(('GET /v2/zones',), args)
+        self.assertEqual(200, kwargs['attributes']['http.status_code'])
+        end = tracer.start_span.return_value.end.call_args[1]['end_time']
+        self.assertEqual(1500000000, end - kwargs['start_time'])
+
+
+class TestInstrumentedCalls(base.TestCase):
+
+    def setUp(self):
+        super(TestInstrumentedCalls, self).setUp()
+        self.registry = instrumentation.enable()
+        self.addCleanup(instrumentation.disable)
+
+    def test_disabled(self):
+        instrumentation.disable()
+        instrumentation.increment('pages_total')
+        instrumentation.observe('signing_duration_seconds', 1)
+
+        self.assertEqual([], self.registry.counters())
+        self.assertEqual([], self.registry.histograms())
+
+    def test_proxy_request(self):
+        sess = mock.Mock()
+        sess.get_project_id.return_value = 'project'
+        sot = proxy.Proxy(session=sess, service_type='compute')
+        response = mock.Mock(status_code=202)
+        response.request.url = (
+            'https://compute/v2/project/servers/'
+            '0d4a8a76-5a96-4c43-9d1e-1ba3d4a4b7f2/action')
+        response.request.method = 'POST'
+        response.request.headers = {'Content-Length': '20'}
+        response.headers = {}
+        response.elapsed = datetime.timedelta(seconds=2)
+
+        sot._report_stats(response)
+
+        labels = dict(service_type='compute', method='POST',
+                      endpoint='/v2/{project_id}/servers/{id}/action')
+        self.assertEqual(2, self.registry.histogram(
+            'request_duration_seconds', **labels).max)
+        self.assertEqual(1, self.registry.counter(
+            'requests_total', status_code='202', **labels))
+        self.assertEqual(20, self.registry.counter(
+            'request_bytes_total', service_type='compute'))
+
+    def test_signing(self):
+        auth = ak_auth.AKRequestsAuth(
+            'ak', 'sk', 'obs.example.com', 'eu-de', 's3')
+        request = requests.Request(
+            'GET', 'https://obs.example.com/bucket').prepare()
+
+        auth(request)
+
+        self.assertEqual(1, self.registry.histogram(
+            'signing_duration_seconds', service='s3').count)
+
+    def test_pages(self):
+        sess = mock.Mock(spec=adapter.Adapter)
+        sess.default_microversion = None
+        sess.service_type = 'dns'
+        sess.get.return_value = mock.Mock(
+            status_code=200, links={}, json=mock.Mock(
+                return_value={'items': [{'id': '1'}]}))
+
+        records = list(sdk_resource.list_records(
+            Item, sess, lambda raw: raw['id']))
+
+        self.assertEqual(['1'], records)
+        self.assertEqual(1, self.registry.counter(
+            'pages_total', service_type='dns', resource='Item'))
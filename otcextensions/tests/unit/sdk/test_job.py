@@ -0,0 +1,135 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import mock
+
+from openstack import exceptions
+from openstack.tests.unit import base
+
+from otcextensions.sdk import job
+
+
+class FakeJob(object):
+
+    def __init__(self, id, statuses):
+        self.id = id
+        self.statuses = list(statuses)
+        self.status = None
+        self.polls = 0
+
+    def fetch(self, session):
+        self.polls += 1
+        self.status = self.statuses.pop(0) if self.statuses \
+            else self.status
+        if isinstance(self.status, Exception):
+            raise self.status
+        return self
+
+
+class TestWaitForJobs(base.TestCase):
+
+    def test_as_completed(self):
+        jobs = [FakeJob('slow', ['RUNNING'] * 3 + ['SUCCESS']),
+                FakeJob('fast', ['SUCCESS']),
+                FakeJob('failed', ['RUNNING', 'FAIL'])]
+        callback = mock.Mock()
+
+        result = list(job.wait_for_jobs(
+            None, jobs, 'success', ['FAIL'], interval=0.01,
+            callback=callback))
+
+        self.assertEqual(['fast', 'failed', 'slow'], [j.id for j in result])
+        self.assertEqual([4, 1, 2], [j.polls for j in jobs])
+        self.assertEqual(result, [c[0][0] for c in callback.call_args_list])
+
+    def test_backoff(self):
+        sleeps = []
+        clock = [0]
+
+        def _sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        with mock.patch('time.monotonic', side_effect=lambda: clock[0]), \
+                mock.patch('time.sleep', side_effect=_sleep), \
+                mock.patch('random.uniform', side_effect=lambda a, b: b):
+            list(job.wait_for_jobs(
+                None, [FakeJob('1', ['RUNNING'] * 5 + ['SUCCESS'])],
+                'success', [], interval=2, max_interval=10))
+
+        self.assertEqual([2, 4, 8, 10, 10], sleeps)
+
+    def test_timeout(self):
+        jobs = [FakeJob('done', ['SUCCESS']), FakeJob('running', [])]
+
+        result = job.wait_for_jobs(
+            None, jobs, 'success', [], interval=0.01, wait=0.05)
+
+        self.assertEqual('done', next(result).id)
+        self.assertRaises(exceptions.ResourceTimeout, next, result)
+
+    def test_transient_errors(self):
+        error = exceptions.HttpException(http_status=503)
+        jobs = [FakeJob('flaky', [error, error, 'SUCCESS']),
+                FakeJob('fine', ['RUNNING', 'SUCCESS'])]
+
+        result = list(job.wait_for_jobs(
+            None, jobs, 'success', [], interval=0.01))
+
+        self.assertEqual(['fine', 'flaky'], [j.id for j in result])
+        self.assertEqual([3, 2], [j.polls for j in jobs])
+
+    def test_repeated_errors(self):
+        error = exceptions.HttpException(http_status=503)
+        flaky = FakeJob('flaky', [error] * 3)
+
+        result = job.wait_for_jobs(
+            None, [flaky, FakeJob('done', ['SUCCESS'])], 'success', [],
+            interval=0.01, retries=2)
+
+        self.assertEqual('done', next(result).id)
+        self.assertRaises(exceptions.HttpException, next, result)
+        self.assertEqual(3, flaky.polls)
+
+    def test_wait_for_job(self):
+        fake = FakeJob('1', ['RUNNING', 'SUCCESS'])
+
+        self.assertIs(fake, job.wait_for_job(
+            None, fake, 'success', ['FAIL'], interval=0.01))
+
+    def test_wait_for_job_failed(self):
+        self.assertRaises(
+            exceptions.ResourceFailure, job.wait_for_job,
+            None, FakeJob('1', ['RUNNING', 'FAIL']), 'success', ['FAIL'],
+            interval=0.01)
+
+    def test_proxy_mixin(self):
+        proxy = job.JobProxyMixin()
+        proxy.service_type = 'rdsv3'
+
+        with mock.patch.object(job, 'wait_for_jobs') as mock_wait:
+            proxy.wait_for_jobs(['1', '2'])
+
+        args = mock_wait.call_args[0]
+        self.assertEqual(['1', '2'], [j.id for j in args[1]])
+        self.assertEqual(('completed', ['failed']), args[2:])
+
+    def test_proxy_mixin_wait_for_job(self):
+        proxy = job.JobProxyMixin()
+        proxy.service_type = 'rdsv3'
+
+        with mock.patch.object(job, 'wait_for_job') as mock_wait:
+            proxy.wait_for_job('1', interval=2)
+
+        args, kwargs = mock_wait.call_args
+        self.assertEqual('1', args[1].id)
+        self.assertEqual(('completed', ['failed']), args[2:])
+        self.assertEqual({'interval': 2, 'wait': 3600}, kwargs)
@@ -0,0 +1,64 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import mock
+
+from openstack.tests.unit import base
+
+from otcextensions import sdk
+
+
+class TestLazyLoad(base.TestCase):
+
+    def setUp(self):
+        super(TestLazyLoad, self).setUp()
+        patcher = mock.patch.object(
+            sdk, '_get_descriptor', wraps=sdk._get_descriptor)
+        self.get_descriptor = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_defers_registration(self):
+        with mock.patch.object(self.cloud, 'authorize') as mock_authorize:
+            sdk.load(self.cloud, lazy=True)
+
+        mock_authorize.assert_not_called()
+        self.get_descriptor.assert_not_called()
+        self.assertTrue(callable(self.cloud.get_ak_sk))
+
+    def test_first_access_registers_service(self):
+        sdk.load_lazy(self.cloud)
+        proxy = mock.Mock()
+        # rts is registered with the orchestration service type
+        self.cloud._proxies['orchestration'] = proxy
+
+        self.assertIs(proxy, self.cloud.rts)
+        self.assertIs(proxy, self.cloud.orchestration)
+        self.assertIs(proxy, self.cloud.rts)
+        self.get_descriptor.assert_called_once_with('rts')
+
+    def test_connection_class_unchanged(self):
+        conn_class = type(self.cloud)
+        attrs = dict(vars(conn_class))
+
+        sdk.load(self.cloud, lazy=True)
+
+        self.assertEqual(attrs, dict(vars(conn_class)))
+
+    def test_all_types_registered(self):
+        sdk.load(self.cloud, lazy=True)
+        lazy_attrs = set().union(*(
+            vars(cls) for cls in type(self.cloud).__mro__
+            if issubclass(cls, sdk._LazyServices)))
+
+        for service_name in sdk.OTC_SERVICES:
+            for attr_name in sdk._get_descriptor(service_name).all_types:
+                self.assertIn(attr_name.replace('-', '_'), lazy_attrs,
+                              service_name)
@@ -0,0 +1,179 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import datetime
+import threading
+
+import mock
+
+from openstack import proxy as os_proxy
+from openstack.tests.unit import base
+
+from otcextensions import sdk
+from otcextensions.sdk import metrics
+from otcextensions.sdk import proxy
+
+
+class TestMetricsBuffer(base.TestCase):
+
+    def test_batches(self):
+        batches = []
+        written = threading.Event()
+
+        def _write(batch):
+            batches.append(batch)
+            if sum(len(b) for b in batches) == 5:
+                written.set()
+
+        buffer = metrics.MetricsBuffer(_write, batch_size=2, interval=0.01)
+        for i in range(5):
+            buffer.put(i)
+
+        self.assertTrue(written.wait(5))
+        self.assertEqual(list(range(5)), sum(batches, []))
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+
+    def test_drops_when_full(self):
+        release = threading.Event()
+        batches = []
+
+        def _write(batch):
+            release.wait(5)
+            batches.append(batch)
+
+        buffer = metrics.MetricsBuffer(_write, max_size=2, batch_size=1)
+        for i in range(10):
+            buffer.put(i)
+        release.set()
+
+        # at most one metric in the thread and two queued
+        self.assertGreaterEqual(buffer.dropped, 7)
+
+    def test_flush(self):
+        write = mock.Mock()
+        buffer = metrics.MetricsBuffer(write, batch_size=2)
+
+        for i in range(3):
+            buffer._queue.put(i)
+        buffer.flush()
+
+        write.assert_has_calls([mock.call([0, 1]), mock.call([2])])
+
+    def test_write_error(self):
+        buffer = metrics.MetricsBuffer(mock.Mock(side_effect=Exception))
+        buffer._queue.put(1)
+
+        buffer.flush()
+
+    def test_get_buffer(self):
+        client = mock.Mock()
+        write = mock.Mock()
+
+        buffer = metrics.get_buffer(client, write)
+        self.assertIs(buffer, metrics.get_buffer(client, write))
+        self.assertIsNot(buffer, metrics.get_buffer(mock.Mock(), write))
+
+        buffer._write(['point'])
+        write.assert_called_once_with(client, ['point'])
+
+
+class TestProxyMetrics(base.TestCase):
+
+    def setUp(self):
+        super(TestProxyMetrics, self).setUp()
+        self.sess = mock.Mock()
+        self.sess.get_project_id.return_value = 'project'
+        proxy._METRIC_NAMES.clear()
+        self.proxy = proxy.Proxy(session=self.sess, service_type='compute')
+        self.response = mock.Mock(status_code=200)
+        self.response.request.url = \
+            'https://compute/v2/project/servers/0123456789abcdef01/action'
+        self.response.request.method = 'POST'
+        self.response.elapsed = datetime.timedelta(seconds=2)
+
+    def _written(self, client, write):
+        buffer = metrics.get_buffer(client, write)
+        buffer.flush()
+        return buffer
+
+    def test_metric_name_cached_per_template(self):
+        with mock.patch.object(
+                proxy.Proxy, '_extract_name',
+                return_value=['server', 'action']) as mock_extract:
+            for server_id in ('0123456789abcdef0123456789abcdef',
+                              '0d4a8a76-5a96-4c43-9d1e-1ba3d4a4b7f2'):
+                self.assertEqual(
+                    'server_action', self.proxy._metric_name(
+                        'https://compute/v2/project/servers/%s/action'
+                        % server_id))
+
+        mock_extract.assert_called_once()
+
+    def test_url_template(self):
+        self.assertEqual(
+            'compute/v2/{project_id}/servers/{id}/action',
+            proxy._url_template(
+                'https://compute/v2/project/servers/12/action?x=1',
+                'project'))
+
+    def test_url_template_ids(self):
+        self.assertEqual(
+            'obs/{id}/{id}/deadbeef-cafe-face-feed/abcdef0123456789',
+            proxy._url_template(
+                'https://obs/0d4a8a76-5a96-4c43-9d1e-1ba3d4a4b7f2/'
+                '0123456789ABCDEF0123456789abcdef/deadbeef-cafe-face-feed/'
+                'abcdef0123456789'))
+
+    def test_statsd(self):
+        self.proxy._statsd_client = client = mock.Mock()
+        self.proxy._statsd_prefix = 'otc'
+        with mock.patch.object(metrics.MetricsBuffer, '_start'):
+            self.proxy._report_stats_statsd(self.response)
+            self._written(client, proxy._send_statsd)
+
+        key = 'otc.compute.POST.server_action'
+        pipeline = client.pipeline.return_value
+        pipeline.timing.assert_called_once_with(key + '.200', 2000)
+        pipeline.incr.assert_has_calls([
+            mock.call(key + '.200'), mock.call(key + '.over_1000'),
+            mock.call(key + '.attempted')])
+        pipeline.send.assert_called_once_with()
+
+    def test_influxdb(self):
+        self.proxy._influxdb_client = client = mock.Mock()
+        self.proxy._influxdb_config = {'measurement': 'api'}
+        with mock.patch.object(metrics.MetricsBuffer, '_start'):
+            self.proxy._report_stats_influxdb(self.response)
+            self.proxy._report_stats_influxdb(
+                None, url=self.response.request.url, method='GET',
+                exc=Exception())
+            self._written(client, proxy._write_influxdb)
+
+        points = client.write_points.call_args[0][0]
+        self.assertEqual(2, len(points))
+        self.assertEqual('api.compute', points[0]['measurement'])
+        self.assertEqual(
+            {'method': 'POST', 'name': 'server_action',
+             'status_code': '200'}, points[0]['tags'])
+        self.assertEqual({'attempted': 1, 'failed': 1}, points[1]['fields'])
+
+    def test_patched_openstack_proxy(self):
+        sdk.patch_openstack_resources()
+        os_client = mock.Mock()
+        os_proxy_ = os_proxy.Proxy(
+            session=self.sess, service_type='compute',
+            influxdb_config={}, influxdb_client=os_client)
+        with mock.patch.object(metrics.MetricsBuffer, '_start'):
+            os_proxy_._report_stats(self.response)
+            self._written(os_client, proxy._write_influxdb)
+
+        point = os_client.write_points.call_args[0][0][0]
+        self.assertEqual('server_action', point['tags']['name'])
@@ -9,6 +9,8 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import threading
+
 from keystoneauth1 import adapter
 
 import mock
@@ -38,12 +40,20 @@ class Res(sdk_resource.Resource):
     allow_list = True
 
 
+class PagedRes(sdk_resource.Resource):
+
+    base_path = '/items'
+    resources_key = 'items'
+    allow_list = True
+
+
 class TestBaseResource(base.TestCase):
 
     def setUp(self):
         super(TestBaseResource, self).setUp()
         self.sess = mock.Mock(spec=adapter.Adapter)
         self.sess.get_project_id = mock.Mock(return_value=PROJECT_ID)
+        self.second_page = threading.Event()
 
         self.sot = Res(**EXAMPLE)
 
@@ -118,3 +128,84 @@ class TestBaseResource(base.TestCase):
         )
 
         self.assertEqual([self.sot], result)
+
+    def _get_page(self, uri, params=None, **kwargs):
+        start = int(params.get('marker', -1)) + 1
+        if start == 2:
+            self.second_page.set()
+        mock_response = mock.Mock(status_code=200, links={})
+        mock_response.json.return_value = {
+            'items': [{'id': str(i)} for i in range(start, min(start + 2, 5))]
+        }
+        return mock_response
+
+    def test_list_read_ahead(self):
+        self.sess.get.side_effect = self._get_page
+
+        result = PagedRes.list(
+            self.sess, paginated=True, read_ahead=1, limit=2)
+
+        self.assertEqual('0', next(result).id)
+        # requested while the first page is still consumed
+        self.assertTrue(self.second_page.wait(5))
+        self.assertEqual(['1', '2', '3', '4'], [r.id for r in result])
+        self.assertEqual(
+            [{'limit': 2}, {'limit': 2, 'marker': '1'},
+             {'limit': 2, 'marker': '3'}, {'limit': 2, 'marker': '4'}],
+            [c[1]['params'] for c in self.sess.get.call_args_list])
+
+    def test_list_ext_read_ahead(self):
+        self.sess.get.side_effect = self._get_page
+
+        result = list(PagedRes.list_ext(
+            self.sess, paginated=True, read_ahead=2, limit=2))
+
+        self.assertEqual(['0', '1', '2', '3', '4'], [r.id for r in result])
+
+    def test_list_read_ahead_error(self):
+        self.sess.get.side_effect = [
+            mock.Mock(status_code=200, links={},
+                      **{'json.return_value': {'items': [{'id': '0'}]}}),
+            Exception('failed')]
+
+        result = PagedRes.list(
+            self.sess, paginated=True, read_ahead=1, limit=1)
+
+        self.assertEqual('0', next(result).id)
+        self.assertRaises(Exception, next, result)
+
+    def test_record_factory(self):
+        self.assertIsNone(sdk_resource.record_factory(PagedRes))
+
+        build = sdk_resource.record_factory(PagedRes, raw=True)
+        record = build({'id': '1', 'name': 'item', 'other': 'x'})
+
+        self.assertEqual('1', record.id)
+        self.assertEqual({'id': '1', 'name': 'item'}, record.to_dict())
+        self.assertEqual(build({'id': '1', 'name': 'item'}), record)
+        self.assertEqual("PagedResRecord(id='1', name='item')", repr(record))
+        self.assertRaises(AttributeError, setattr, record, 'other', 'x')
+        self.assertEqual(
+            ('item', None),
+            sdk_resource.record_factory(PagedRes, fields=['name', 'other'])(
+                {'name': 'item'}))
+
+    def test_list_raw(self):
+        self.sess.get.side_effect = self._get_page
+
+        result = list(PagedRes.list(
+            self.sess, paginated=True, raw=True, limit=2))
+
+        self.assertEqual(['0', '1', '2', '3', '4'], [r.id for r in result])
+        self.assertNotIsInstance(result[0], PagedRes)
+        self.assertEqual(
+            {'limit': 2, 'marker': '1'},
+            self.sess.get.call_args_list[1][1]['params'])
+
+    def test_list_ext_fields(self):
+        self.sess.get.side_effect = self._get_page
+
+        result = list(PagedRes.list_ext(
+            self.sess, paginated=True, fields=['id'], limit=2))
+
+        self.assertEqual([('0',), ('1',), ('2',), ('3',), ('4',)], result)
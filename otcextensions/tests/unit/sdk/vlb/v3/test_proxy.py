@@ -328,6 +328,44 @@ class TestVlbMember(TestVlbProxy):
             }
         )
 
+    def test_members_get(self):
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._get_many',
+            self.proxy.get_members,
+            method_args=[['m1', 'm2'], 'pool'],
+            expected_args=[member.Member, ['m1', 'm2']],
+            expected_kwargs={
+                'pool_id': 'pool',
+                'workers': 8,
+            }
+        )
+
+    def test_members_update(self):
+        updates = [('m1', {'weight': 0}), ('m2', {'weight': 0})]
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._update_many',
+            self.proxy.update_members,
+            method_args=[updates, 'pool'],
+            expected_args=[member.Member, updates],
+            expected_kwargs={
+                'pool_id': 'pool',
+                'workers': 8,
+            }
+        )
+
+    def test_members_delete(self):
+        self._verify(
+            'otcextensions.sdk.bulk.BulkProxyMixin._delete_many',
+            self.proxy.delete_members,
+            method_args=[['m1', 'm2'], 'pool'],
+            expected_args=[member.Member, ['m1', 'm2']],
+            expected_kwargs={
+                'pool_id': 'pool',
+                'ignore_missing': True,
+                'workers': 8,
+            }
+        )
+
 
 class TestVlbHealthMonitor(TestVlbProxy):
     def test_health_monitor_create(self):
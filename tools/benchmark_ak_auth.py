@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""Micro-benchmark of the AK/SK request signing used for OBS.
+
+Signs prepared requests typical for object listing and HEAD calls and
+prints the time spent per request::
+
+    python tools/benchmark_ak_auth.py --requests 20000
+"""
+import argparse
+import timeit
+
+import requests
+
+from otcextensions.sdk import ak_auth
+
+ENDPOINT = 'https://bucket.obs.eu-de.otc.t-systems.com'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=10000,
+                        help='Number of requests signed per round')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    auth = ak_auth.AKRequestsAuth(
+        access_key='AK', secret_access_key='SK', host=ENDPOINT,
+        region='eu-de', service='s3')
+    prepared = [
+        requests.Request(
+            'GET', ENDPOINT + '/?max-keys=1000&marker=key-%06d' % i,
+            headers={'Accept': 'application/xml'}).prepare()
+        for i in range(args.requests // 2)
+    ] + [
+        requests.Request(
+            'HEAD', ENDPOINT + '/dir/key-%06d' % i).prepare()
+        for i in range(args.requests - args.requests // 2)
+    ]
+
+    def sign_all():
+        for request in prepared:
+            auth(request)
+
+    best = min(timeit.repeat(sign_all, number=1, repeat=args.rounds))
+    print('signed %d requests in %.3fs: %.1f us/request'
+          % (len(prepared), best, best / len(prepared) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
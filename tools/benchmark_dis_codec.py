@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""Cost of encoding and archiving DIS records per record versus in bulk.
+
+Encodes synthetic payloads the way ``upload_data`` did, detecting base64
+by decoding every value, and with the bulk codec. Then writes the
+records as CSV after building a Data resource per record, the way
+``download_data`` did, and from the raw records with the codec::
+
+    python tools/benchmark_dis_codec.py --count 1000000
+"""
+import argparse
+import base64
+import binascii
+import csv
+import os
+import time
+
+from otcextensions.sdk.dis.v2 import _codec
+from otcextensions.sdk.dis.v2 import data
+
+
+def encode_data(value):
+    try:
+        base64.b64decode(value, validate=True)
+        return value
+    except binascii.Error:
+        return base64.b64encode(value.encode('ascii')).decode('ascii')
+
+
+def write_resources(records, f):
+    writer = csv.writer(f)
+    writer.writerow(_codec.DEFAULT_COLUMNS)
+    resources = (data.Data.existing(**record) for record in records)
+    writer.writerows(
+        (s.sequence_number, s.data, s.timestamp, s.timestamp_type)
+        for s in resources)
+
+
+def timed(call, *args):
+    start = time.perf_counter()
+    result = call(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--size', type=int, default=100,
+                        help='Bytes of a payload')
+    args = parser.parse_args()
+
+    # half of the values are base64 already
+    values = ['event %d ' % i + 'x' * args.size if i % 2
+              else base64.b64encode(b'%d' % i + b'x' * args.size).decode()
+              for i in range(args.count)]
+    seconds, expected = timed(lambda: [encode_data(v) for v in values])
+    print('encode per record %.3fs' % seconds)
+    seconds, encoded = timed(_codec.encode_text, values)
+    print('encode bulk       %.3fs' % seconds)
+    assert encoded == expected
+
+    records = [{'sequence_number': str(i), 'data': value,
+                'timestamp': 1600000000000 + i,
+                'timestamp_type': 'CreateTime'}
+               for i, value in enumerate(encoded)]
+    with open(os.devnull, 'w', newline='') as f:
+        seconds, _ = timed(write_resources, records, f)
+        print('csv resources     %.3fs' % seconds)
+        seconds, _ = timed(_codec.write_csv, records, f)
+        print('csv bulk          %.3fs' % seconds)
+        seconds, _ = timed(_codec.write_jsonl, records, f)
+        print('jsonl bulk        %.3fs' % seconds)
+        seconds, _ = timed(
+            lambda: _codec.write_csv(records, f, decode_data=True))
+        print('csv bulk decoded  %.3fs' % seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""Cost of building listed resources versus raw records and field tuples.
+
+Lists a synthetic RDS instance listing from an in-memory session, so only
+the client side cost of turning the raw resources into Instance objects,
+records or tuples is measured::
+
+    python tools/benchmark_list_records.py --count 20000
+"""
+import argparse
+import time
+import tracemalloc
+from unittest import mock
+
+from keystoneauth1 import adapter
+
+from otcextensions.sdk.rds.v3 import instance
+
+
+def session(count, page_size):
+    pages = []
+    for offset in range(0, count, page_size):
+        pages.append({
+            'instances': [{
+                'id': 'instance-%d' % i,
+                'name': 'name-%d' % i,
+                'status': 'ACTIVE',
+                'flavor_ref': 'rds.mysql.c2.large',
+                'region': 'eu-de',
+                'port': 3306,
+                'created': '2020-01-01T00:00:00+0000',
+            } for i in range(offset, min(offset + page_size, count))],
+            'total_count': count})
+
+    def get(uri, params=None, **kwargs):
+        response = mock.Mock(status_code=200)
+        index = params.get('offset', 0) // page_size
+        response.json.return_value = pages[index] if index < len(pages) \
+            else {'instances': [], 'total_count': count}
+        return response
+
+    sess = mock.Mock(spec=adapter.Adapter)
+    sess.get.side_effect = get
+    sess.default_microversion = None
+    sess._get_connection = mock.Mock(return_value=None)
+    return sess
+
+
+def measure(count, page_size, **kwargs):
+    sess = session(count, page_size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = list(instance.Instance.list(sess, **kwargs))
+    seconds = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(result) == count
+    return seconds, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--page-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    for label, kwargs in (('resources', {}),
+                          ('raw', {'raw': True}),
+                          ('fields', {'fields': ['id', 'name']})):
+        seconds, memory = measure(args.count, args.page_size, **kwargs)
+        print('%-9s %.3fs, %.1f MiB retained'
+              % (label, seconds, memory / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
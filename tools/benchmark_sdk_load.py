@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""Startup cost of registering the OTC services on a connection.
+
+Every round runs in a fresh interpreter, imports ``otcextensions.sdk`` and
+calls ``load`` eagerly or lazily, then registers the given services the
+way a first proxy access would. Authorization and the catalog lookups are
+replaced by local stubs, so only the import and registration time is
+measured::
+
+    python tools/benchmark_sdk_load.py --touch obs --touch ecs
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+CHILD = '''
+import json
+import sys
+import time
+
+start = time.perf_counter()
+modules = len(sys.modules)
+
+import openstack
+from otcextensions import sdk
+
+conn = openstack.connection.Connection(
+    auth_type='none', endpoint='http://localhost')
+conn.authorize = lambda: None
+conn._get_project_info = lambda: type('Project', (), {{'id': 'project'}})
+conn.endpoint_for = lambda *args, **kwargs: 'http://localhost'
+
+sdk.load(conn, lazy={lazy})
+for name in {touch}:
+    if {lazy}:
+        # what the first access of the proxy attribute triggers
+        sdk.register_single_service(conn, name)
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                  'modules': len(sys.modules) - modules}}))
+'''
+
+
+def measure(lazy, touch, rounds):
+    results = []
+    for _ in range(rounds):
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            CHILD.format(lazy=lazy, touch=touch)])
+        results.append(json.loads(output))
+    return min(results, key=lambda result: result['seconds'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--touch', action='append', default=[],
+                        help='Service registered after load, repeatable')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    for lazy in (False, True):
+        result = measure(lazy, args.touch or ['obs'], args.rounds)
+        print('%-5s load: %.3fs, %d modules imported'
+              % ('lazy' if lazy else 'eager', result['seconds'],
+                 result['modules']))
+
+
+if __name__ == '__main__':
+    main()